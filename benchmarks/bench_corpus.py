@@ -0,0 +1,49 @@
+"""Corpus の一括集計と Morph を使ったループの速度を比較する
+
+Usage:
+    $ pip install .
+    $ python benchmarks/bench_corpus.py 20000
+"""
+
+import sys
+import time
+from collections import Counter
+from typing import Callable
+
+from cucurbita.cab import Sect
+from cucurbita.corpus import Corpus
+
+from synthetic import generate
+
+
+def measure(name: str, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+def main(n_sentences: int) -> None:
+    sentences = generate(n_sentences)
+    sects = [Sect(sentence) for sentence in sentences]
+    corpus = Corpus.from_sentences(sentences)
+
+    def loop() -> Counter:
+        return Counter(
+            t.base for sect in sects for t in sect.tokenize() if t.pos in ["名詞"]
+        )
+
+    def bulk() -> Counter:
+        return corpus.count_by("base", where={"pos": "名詞"})
+
+    assert loop() == bulk()
+    before = measure("Morph loop (count nouns)", loop)
+    after = measure("Corpus.count_by (count nouns)", bulk)
+    print(f"speedup: x{before / after:.1f}")
+    measure("Corpus.filter(pos=名詞)", lambda: corpus.filter(pos="名詞"))
+    measure("Corpus.ngrams(2)", lambda: corpus.ngrams(2))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
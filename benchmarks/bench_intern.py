@@ -0,0 +1,52 @@
+"""MorphTable による Morph の共有の効果を、Zipf 分布の合成コーパスで計測する
+
+Usage:
+    $ pip install .
+    $ python benchmarks/bench_intern.py 20000
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from cucurbita.cab import MorphTable, Sect
+
+from synthetic import generate_zipf
+
+Parser = Callable[[str], Sect]
+
+
+def with_table() -> Parser:
+    table = MorphTable()
+    return lambda sentence: Sect(sentence, table=table)
+
+
+def measure(name: str, make: Callable[[], Parser], sentences: List[str]) -> None:
+    parse = make()
+    start = time.perf_counter()
+    for sentence in sentences:
+        parse(sentence)
+    elapsed = time.perf_counter() - start
+
+    # 解析結果を全て保持した時のメモリ (共有の表も含む)
+    tracemalloc.start()
+    parse = make()
+    sects = [parse(sentence) for sentence in sentences]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_tokens = sum(len(sect.tokenize()) for sect in sects)
+    print(
+        f"{name:<16} {len(sentences) / elapsed:>10,.0f} sentences/sec"
+        f" {memory / n_tokens:>8,.0f} bytes/token"
+    )
+
+
+def main(n_sentences: int) -> None:
+    sentences = generate_zipf(n_sentences)
+    measure("Sect", lambda: Sect, sentences)
+    measure("Sect + table", with_table, sentences)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
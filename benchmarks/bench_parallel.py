@@ -0,0 +1,41 @@
+"""parse_corpus のプロセス数に対するスケーリングを計測する
+
+Usage:
+    $ pip install .
+    $ python benchmarks/bench_parallel.py 200000 8
+"""
+import os
+import sys
+import tempfile
+import time
+
+from cucurbita.parallel import parse_corpus
+
+from synthetic import generate
+
+
+def main(n_sentences: int, max_workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cabocha.out")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(generate(n_sentences))
+
+        base = 0.0
+        workers = 1
+        while workers <= max_workers:
+            start = time.perf_counter()
+            corpus = parse_corpus(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(
+                f"workers={workers:<3} {len(corpus) / elapsed:>12,.0f} sentences/sec"
+                f"  x{base / elapsed:.2f}"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1,
+    )
@@ -0,0 +1,51 @@
+"""パーサーのスループット(文/秒)を計測する
+
+Usage:
+    $ pip install .
+    $ python benchmarks/bench_parser.py 20000
+"""
+
+import sys
+import time
+from typing import Callable, List
+
+from cucurbita.cab import Doc, Sect
+from cucurbita.util import split_chunks
+
+from synthetic import generate
+
+
+def measure(name: str, func: Callable[[str], object], sentences: List[str]) -> None:
+    start = time.perf_counter()
+    for sentence in sentences:
+        func(sentence)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {len(sentences) / elapsed:>12,.0f} sentences/sec")
+
+
+def tokenize_repeatedly(sentence: str) -> None:
+    sect = Sect(sentence)
+    for _ in range(3):
+        sect.tokenize()
+
+
+def surface_and_pos(lazy: bool) -> Callable[[str], object]:
+    return lambda s: [(m.surface, m.pos) for m in Sect(s, lazy=lazy).tokenize()]
+
+
+def main(n_sentences: int) -> None:
+    cabocha = generate(n_sentences, cabocha=True)
+    mecab = generate(n_sentences, cabocha=False)
+
+    measure("split_chunks", lambda s: list(split_chunks(s)), cabocha)
+    measure("Sect", Sect, cabocha)
+    measure("Sect + tokenize x3", tokenize_repeatedly, cabocha)
+    measure("chunks per sentence", lambda s: len(Sect(s).chunks), cabocha)
+    measure("  lazy", lambda s: len(Sect(s, lazy=True).chunks), cabocha)
+    measure("surface + pos", surface_and_pos(False), cabocha)
+    measure("  lazy", surface_and_pos(True), cabocha)
+    measure("Doc + tokenize", lambda s: Doc(s).tokenize(), mecab)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
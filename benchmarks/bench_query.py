@@ -0,0 +1,65 @@
+"""係り受けパターン検索の速度を、手書きのループと比較する
+
+Usage:
+    $ pip install .
+    $ python benchmarks/bench_query.py 50000
+"""
+
+import sys
+import time
+from typing import Callable, List
+
+from cucurbita.cab import Sect
+from cucurbita.corpus import Corpus
+from cucurbita.query import ChunkPattern, MorphPattern, Query, TermIndex
+
+from synthetic import generate
+
+QUERY = Query(
+    ChunkPattern(MorphPattern(base="鶏"), MorphPattern(surface="が")),
+    dst=ChunkPattern(MorphPattern(pos="動詞")),
+)
+
+
+def measure(name: str, func: Callable[[], List]) -> List:
+    start = time.perf_counter()
+    matches = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<36} {elapsed * 1000:>10.1f} ms  {len(matches)} matches")
+    return matches
+
+
+def hand_written(sentences: List[str]) -> List:
+    matches = []
+    for i, sentence in enumerate(sentences):
+        chunks = Sect(sentence).chunks
+        for j, chunk in enumerate(chunks):
+            if chunk.dst == -1:
+                continue
+            bases = [m.base for m in chunk.morphs]
+            surfaces = [m.surface for m in chunk.morphs]
+            if "鶏" in bases and "が" in surfaces:
+                if any(m.pos == "動詞" for m in chunks[chunk.dst].morphs):
+                    matches.append((i, j, chunk.dst))
+    return matches
+
+
+def main(n_sentences: int) -> None:
+    sentences = generate(n_sentences)
+    corpus = Corpus.from_sentences(sentences)
+    index = TermIndex(corpus)
+
+    expect = measure("hand-written loop over Sect", lambda: hand_written(sentences))
+    found = measure(
+        "Query.search (raw prefilter)", lambda: list(QUERY.search(sentences))
+    )
+    assert [tuple(m) for m in found] == expect
+    measure("Query.search_corpus", lambda: list(QUERY.search_corpus(corpus)))
+    measure(
+        "Query.search_corpus + TermIndex",
+        lambda: list(QUERY.search_corpus(corpus, index=index)),
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
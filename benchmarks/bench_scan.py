@@ -0,0 +1,80 @@
+"""バイト列の走査 (Scanner) と文字列へのパースを、メモリマップしたファイルで比べる
+
+Usage:
+    $ pip install .
+    $ python benchmarks/bench_scan.py 200000
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable
+
+from cucurbita.cab import Sect
+from cucurbita.io import iter_sentences
+from cucurbita.scan import Scanner
+
+from synthetic import generate
+
+
+def lengths_str(path: str) -> Any:
+    counts: Counter = Counter()
+    for sentence in iter_sentences(path):
+        sect = Sect(sentence)
+        counts.update(c.dst - c.pos for c in sect.chunks if c.dst >= 0)
+    return counts
+
+
+def lengths_scan(path: str) -> Any:
+    with Scanner.open(path) as scanner:
+        return Counter(scanner.dependency_lengths())
+
+
+def nouns_str(path: str) -> int:
+    return sum(
+        m.pos == "名詞"
+        for s in iter_sentences(path)
+        for m in Sect(s, lazy=True).tokenize()
+    )
+
+
+def nouns_scan(path: str) -> int:
+    with Scanner.open(path) as scanner:
+        return sum(
+            m.pos == "名詞"
+            for start, end in scanner.sentences()
+            for m in scanner.tokens(start, end)
+        )
+
+
+def measure(name: str, func: Callable[[str], Any], path: str) -> Any:
+    start = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<24} {elapsed:>8.2f} sec {peak / 2 ** 20:>8.2f} MiB peak")
+    return result
+
+
+def main(n_sentences: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cabocha.out")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(generate(n_sentences))
+        assert measure("lengths (Sect)", lengths_str, path) == measure(
+            "lengths (Scanner)", lengths_scan, path
+        )
+        assert measure("nouns (lazy Sect)", nouns_str, path) == measure(
+            "nouns (Scanner)", nouns_scan, path
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,73 @@
+"""Counter による数え上げとスケッチ (StreamStats) を、語彙の多い文書で比べる
+
+Counter は語彙と組の数に比例してメモリが増えるが、StreamStats は固定。
+上位の語と組がどれだけ一致するかも表示する。
+
+Usage:
+    $ pip install .
+    $ python benchmarks/bench_sketch.py 50000 200000
+"""
+
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, List, Tuple
+
+from cucurbita.cab import Sect
+from cucurbita.sketch import StreamStats
+
+from synthetic import generate_zipf
+
+TOP = 100
+
+
+def count_counter(sentences: List[str]) -> Tuple[Any, Any]:
+    words: Counter = Counter()
+    pairs: Counter = Counter()
+    for sentence in sentences:
+        sect = Sect(sentence, lazy=True)
+        words.update(m.base for m in sect.tokenize())
+        chunks = sect.chunks
+        pairs.update(
+            (str(c), str(chunks[c.dst])) for c in chunks if c.pos < c.dst < len(chunks)
+        )
+    return words.most_common(TOP), pairs.most_common(TOP)
+
+
+def count_sketch(sentences: List[str]) -> Tuple[Any, Any]:
+    stats = StreamStats(k=TOP, width=2**14)
+    stats.update(sentences)
+    return stats.words.most_common(), stats.pairs.most_common()
+
+
+def measure(name: str, func: Callable[[List[str]], Any], sentences: List[str]) -> Any:
+    start = time.perf_counter()
+    result = func(sentences)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(sentences)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {elapsed:>8.2f} sec {peak / 2 ** 20:>8.2f} MiB peak")
+    return result
+
+
+def recall(expected: List[Tuple[Any, int]], actual: List[Tuple[Any, int]]) -> float:
+    return len({k for k, _ in expected} & {k for k, _ in actual}) / len(expected)
+
+
+def main(n_sentences: int, vocab_size: int) -> None:
+    sentences = generate_zipf(n_sentences, vocab_size=vocab_size)
+    words, pairs = measure("Counter", count_counter, sentences)
+    sketch_words, sketch_pairs = measure("StreamStats", count_sketch, sentences)
+    print(f"top {TOP} words recall {recall(words, sketch_words):.2f}")
+    print(f"top {TOP} pairs recall {recall(pairs, sketch_pairs):.2f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200000,
+    )
@@ -0,0 +1,226 @@
+"""パースの各段階のスループット, ピークメモリ, 単語あたりのメモリを計測する
+
+合成の CaboCha/MeCab 解析結果に対して段階毎に計測し、結果を JSON で
+書き出す。コミット間の比較は compare で行う。
+
+Usage:
+    $ pip install .
+    $ python benchmarks/suite.py run --sentences 20000 --malformed 0.01 -o before.json
+    $ git checkout other-branch && pip install .
+    $ python benchmarks/suite.py run --sentences 20000 --malformed 0.01 -o after.json
+    $ python benchmarks/suite.py compare before.json after.json
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from cucurbita.cab import Chunk, Doc, Morph, Sect
+from cucurbita.corpus import Corpus
+from cucurbita.util import is_morph, split_chunks, split_words
+
+from synthetic import generate
+
+# 段階名 -> (入力の種類, 1件を処理する関数)
+Stage = Tuple[str, Callable[[Any], Any]]
+
+
+def _split_words(line: str) -> Any:
+    try:
+        return split_words(line)
+    except (AssertionError, ValueError):
+        return None
+
+
+def _corpus(sentences: List[str]) -> Corpus:
+    return Corpus.from_sentences(sentences)
+
+
+STAGES: Dict[str, Stage] = {
+    "split_chunks": ("cabocha", lambda s: list(split_chunks(s))),
+    "split_words": ("lines", _split_words),
+    "Morph": ("lines", Morph),
+    "Chunk": ("chunks", lambda chunk: Chunk(chunk[1], header=chunk[0])),
+    "Sect": ("cabocha", Sect),
+    "Sect(lazy)": ("cabocha", lambda s: Sect(s, lazy=True)),
+    "Sect.tokenize": ("cabocha", lambda s: Sect(s).tokenize()),
+    "Doc": ("mecab", Doc),
+    "Corpus": ("batch", _corpus),
+}
+
+
+def _inputs(args: argparse.Namespace) -> Dict[str, List[Any]]:
+    options = dict(
+        n_chunks=(args.min_chunks, args.max_chunks),
+        chunk_length=(1, args.chunk_length),
+        vocab_size=args.vocab_size or None,
+        exponent=args.exponent,
+        malformed=args.malformed,
+        seed=args.seed,
+    )
+    cabocha = generate(args.sentences, cabocha=True, **options)
+    mecab = generate(args.sentences, cabocha=False, **options)
+    chunks = [chunk for s in cabocha for chunk in split_chunks(s)]
+    lines = [line for _, morphs in chunks for line in morphs]
+    return {
+        "cabocha": cabocha,
+        "mecab": mecab,
+        "chunks": chunks,
+        "lines": lines,
+        "batch": [cabocha],
+    }
+
+
+def _count_tokens(sentences: List[str]) -> int:
+    return sum(1 for s in sentences for line in s.splitlines() if is_morph(line))
+
+
+def measure(name: str, inputs: List[Any], n_tokens: int, repeat: int) -> Dict[str, Any]:
+    """1つの段階を計測する
+
+    時間は tracemalloc を止めて repeat 回計測した最小値とし、メモリは
+    結果を全て保持したまま別に1回計測する。
+    """
+    _, func = STAGES[name]
+    seconds = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak() if hasattr(tracemalloc, "reset_peak") else None
+        results = [func(item) for item in inputs]
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+
+    return {
+        "stage": name,
+        "items": len(inputs),
+        "tokens": n_tokens,
+        "seconds": seconds,
+        "items_per_sec": len(inputs) / seconds,
+        "tokens_per_sec": n_tokens / seconds,
+        "peak_bytes": peak - before,
+        "retained_bytes": current - before,
+        "bytes_per_token": (current - before) / max(n_tokens, 1),
+    }
+
+
+def _commit() -> str:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        ).stdout
+        return output.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(args: argparse.Namespace) -> None:
+    # 不正な行の警告は計測の邪魔になるため出さない
+    logging.disable(logging.WARNING)
+    inputs = _inputs(args)
+    n_tokens = {
+        "cabocha": _count_tokens(inputs["cabocha"]),
+        "mecab": _count_tokens(inputs["mecab"]),
+    }
+    n_tokens["chunks"] = n_tokens["lines"] = n_tokens["batch"] = n_tokens["cabocha"]
+
+    results = []
+    for name in args.stages or list(STAGES):
+        kind, _ = STAGES[name]
+        result = measure(name, inputs[kind], n_tokens[kind], args.repeat)
+        results.append(result)
+        print(
+            f"{name:<16} {result['tokens_per_sec']:>12,.0f} tokens/sec"
+            f" {result['peak_bytes'] / 2 ** 20:>8.1f} MiB peak"
+            f" {result['bytes_per_token']:>8.0f} bytes/token",
+            file=sys.stderr,
+        )
+
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            k: v for k, v in vars(args).items() if k not in ("func", "output", "stages")
+        },
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def compare(args: argparse.Namespace) -> None:
+    """2つの結果の段階毎の比 (after / before) を表示する"""
+    with open(args.before, encoding="utf-8") as f:
+        before = {r["stage"]: r for r in json.load(f)["results"]}
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+    print(f"{'stage':<16} {'throughput':>12} {'peak':>8} {'bytes/token':>12}")
+    for result in after:
+        base = before.get(result["stage"])
+        if base is None:
+            continue
+        speed = result["tokens_per_sec"] / base["tokens_per_sec"]
+        peak = result["peak_bytes"] / max(base["peak_bytes"], 1)
+        per_token = result["bytes_per_token"] / max(base["bytes_per_token"], 1)
+        print(
+            f"{result['stage']:<16} {speed:>11.2f}x {peak:>7.2f}x {per_token:>11.2f}x"
+        )
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    p = commands.add_parser("run", help="計測して JSON を書き出す")
+    p.add_argument("--sentences", type=int, default=20000)
+    p.add_argument("--min-chunks", type=int, default=2)
+    p.add_argument("--max-chunks", type=int, default=8)
+    p.add_argument("--chunk-length", type=int, default=3, help="1文節の最大単語数")
+    p.add_argument(
+        "--vocab-size", type=int, default=10000, help="0 なら固定の小さな語彙"
+    )
+    p.add_argument("--exponent", type=float, default=1.1, help="Zipf 分布の指数")
+    p.add_argument("--malformed", type=float, default=0.0, help="不正な行の割合")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--stages", nargs="*", choices=list(STAGES))
+    p.add_argument("-o", "--output", default="-", help="書き出す JSON のパス")
+    p.set_defaults(func=run)
+
+    p = commands.add_parser("compare", help="2つの JSON を比較する")
+    p.add_argument("before")
+    p.add_argument("after")
+    p.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
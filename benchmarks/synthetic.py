@@ -0,0 +1,147 @@
+"""ベンチマーク用の合成CaboCha(MeCab)解析結果を生成する"""
+
+import random
+from itertools import accumulate
+from typing import Any, List, Optional, Sequence, Tuple
+
+# (表層系, 素性) の語彙。素性は ipadic 形式
+VOCAB = [
+    ("隣", "名詞,一般,*,*,*,*,隣,トナリ,トナリ"),
+    ("の", "助詞,連体化,*,*,*,*,の,ノ,ノ"),
+    ("客", "名詞,一般,*,*,*,*,客,キャク,キャク"),
+    ("は", "助詞,係助詞,*,*,*,*,は,ハ,ワ"),
+    ("よく", "副詞,一般,*,*,*,*,よく,ヨク,ヨク"),
+    ("柿", "名詞,一般,*,*,*,*,柿,カキ,カキ"),
+    ("食う", "動詞,自立,*,*,五段・ワ行促音便,基本形,食う,クウ,クウ"),
+    ("だ", "助動詞,*,*,*,特殊・ダ,基本形,だ,ダ,ダ"),
+    ("庭", "名詞,一般,*,*,*,*,庭,ニワ,ニワ"),
+    ("に", "助詞,格助詞,一般,*,*,*,に,ニ,ニ"),
+    ("鶏", "名詞,一般,*,*,*,*,鶏,ニワトリ,ニワトリ"),
+    ("が", "助詞,格助詞,一般,*,*,*,が,ガ,ガ"),
+    ("い", "動詞,自立,*,*,一段,連用形,いる,イ,イ"),
+    ("まし", "助動詞,*,*,*,特殊・マス,連用形,ます,マシ,マシ"),
+    ("た", "助動詞,*,*,*,特殊・タ,基本形,た,タ,タ"),
+    ("かえる", "動詞,自立,*,*,一段,基本形,かえる,カエル,カエル"),
+]
+PERIOD = "。\t記号,句点,*,*,*,*,。,。,。"
+
+# 不正な行の種類 (split_chunks, split_words, split_header が扱う例外的な行)
+MALFORMED = (
+    # 素性の足りない単語行 (split_chunks が読み飛ばす)
+    "壊れ\t名詞,一般",
+    # 素性の多すぎる単語行 (Morph が警告して読み飛ばす)
+    "壊れ\t名詞,一般,*,*,*,*,壊れ,コワレ,コワレ,余分,余分",
+    # 形式の異なるヘッダー行
+    "* x 1D 0/1 score",
+    # 区切りのない行
+    "garbage",
+)
+
+
+def zipf_lines(vocab_size: int) -> List[str]:
+    """語彙数 vocab_size の単語行を、頻度の高いものから順に返す
+
+    VOCAB の素性を使い回し、表層系と基本形を語彙番号で変えて異なる行を作る。
+    """
+    lines = []
+    for i in range(vocab_size):
+        surface, feature = VOCAB[i % len(VOCAB)]
+        if i >= len(VOCAB):
+            surface = f"{surface}{i}"
+            values = feature.split(",")
+            values[6] = surface
+            feature = ",".join(values)
+        lines.append(f"{surface}\t{feature}")
+    return lines
+
+
+class Generator(object):
+    """合成の解析結果を1文ずつ生成する
+
+    Keyword Arguments:
+        cabocha {bool} -- 文節ヘッダーを含めるか (default: {True})
+        n_chunks {Tuple[int, int]} -- 1文の文節数の範囲 (default: {(2, 8)})
+        chunk_length {Tuple[int, int]} -- 1文節の単語数の範囲 (default: {(1, 3)})
+        vocab_size {Optional[int]} -- Zipf 分布の語彙数
+            (default: {None} VOCAB から一様に選ぶ)
+        exponent {float} -- Zipf 分布の指数 (default: {1.1})
+        malformed {float} -- 単語行の代わりに不正な行を混ぜる割合 (default: {0.0})
+        seed {int} -- 乱数の種 (default: {0})
+    """
+
+    def __init__(
+        self,
+        cabocha: bool = True,
+        n_chunks: Tuple[int, int] = (2, 8),
+        chunk_length: Tuple[int, int] = (1, 3),
+        vocab_size: Optional[int] = None,
+        exponent: float = 1.1,
+        malformed: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.cabocha = cabocha
+        self.n_chunks = n_chunks
+        self.chunk_length = chunk_length
+        self.malformed = malformed
+        self.rng = random.Random(seed)
+        self.lines: Sequence[str] = ["\t".join(entry) for entry in VOCAB]
+        self.weights: Optional[List[float]] = None
+        if vocab_size is not None:
+            self.lines = zipf_lines(vocab_size)
+            self.weights = list(
+                accumulate(1 / (rank + 1) ** exponent for rank in range(vocab_size))
+            )
+
+    def words(self, k: int) -> List[str]:
+        rng = self.rng
+        if self.weights is None:
+            words = [rng.choice(self.lines) for _ in range(k)]
+        else:
+            words = rng.choices(self.lines, cum_weights=self.weights, k=k)
+        if self.malformed:
+            words = [
+                rng.choice(MALFORMED) if rng.random() < self.malformed else word
+                for word in words
+            ]
+        return words
+
+    def sentence(self) -> str:
+        rng = self.rng
+        n_chunks = rng.randint(*self.n_chunks)
+        lines: List[str] = []
+        for pos in range(n_chunks):
+            if self.cabocha:
+                dst = -1 if pos == n_chunks - 1 else rng.randint(pos + 1, n_chunks - 1)
+                score = 0.0 if dst == -1 else rng.uniform(-3, 3)
+                lines.append(f"* {pos} {dst}D 0/1 {score:.6f}")
+            lines.extend(self.words(rng.randint(*self.chunk_length)))
+        lines.append(PERIOD)
+        lines.append("EOS")
+        return "\n".join(lines) + "\n"
+
+    def generate(self, n_sentences: int) -> List[str]:
+        return [self.sentence() for _ in range(n_sentences)]
+
+
+def generate(
+    n_sentences: int, cabocha: bool = True, seed: int = 0, **options: Any
+) -> List[str]:
+    """1文ずつの解析結果のリストを返す (options は Generator の引数)"""
+    return Generator(cabocha=cabocha, seed=seed, **options).generate(n_sentences)
+
+
+def generate_zipf(
+    n_sentences: int,
+    vocab_size: int = 10000,
+    exponent: float = 1.1,
+    cabocha: bool = True,
+    seed: int = 0,
+) -> List[str]:
+    """単語の頻度が Zipf 分布に従う1文ずつの解析結果のリストを返す"""
+    return generate(
+        n_sentences,
+        cabocha=cabocha,
+        seed=seed,
+        vocab_size=vocab_size,
+        exponent=exponent,
+    )
@@ -0,0 +1,232 @@
+import asyncio
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
+from cucurbita.cab import Cab, Doc, Sect
+
+Texts = Union[Iterable[str], AsyncIterable[str]]
+
+
+def _parse(result: str, cls: Optional[Type[Cab]]) -> Cab:
+    cls = cls or (Sect if result.startswith("* ") else Doc)
+    return cls(result)
+
+
+async def aiter_sentences(
+    stream: asyncio.StreamReader, eos: str = "EOS", encoding: str = "utf-8"
+) -> AsyncIterator[str]:
+    """非同期のバイトストリームを一行ずつ読み込み、終了文字毎に1文を返す
+
+    io.iter_sentences の非同期版。解析器の出力を待つ間も他のタスクが動ける。
+
+    Arguments:
+        stream {asyncio.StreamReader} -- 解析結果のバイトストリーム
+
+    Keyword Arguments:
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Yields:
+        AsyncIterator[str] -- 終了文字を含む1文の解析結果
+    """
+    while True:
+        result = await _read_sentence(stream, eos.encode(encoding))
+        if result is None:
+            return
+        yield result.decode(encoding)
+
+
+async def aiter_cabs(
+    stream: asyncio.StreamReader,
+    cls: Optional[Type[Cab]] = None,
+    eos: str = "EOS",
+    encoding: str = "utf-8",
+) -> AsyncIterator[Cab]:
+    """非同期のバイトストリームから1文ずつ Sect/Doc を生成する
+
+    Keyword Arguments:
+        cls {Optional[Type[Cab]]} -- 生成するクラス (default: {None}, 文節ヘッダーの有無で判定)
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+    """
+    async for result in aiter_sentences(stream, eos=eos, encoding=encoding):
+        yield _parse(result, cls)
+
+
+async def _read_sentence(stream: asyncio.StreamReader, eos: bytes) -> Optional[bytes]:
+    """終了文字の行までを読む (ストリームの終わりで何もなければ None)"""
+    lines: List[bytes] = []
+    while True:
+        line = await stream.readline()
+        if not line:
+            # 終了文字のない末尾は空行でなければ1文として扱う
+            if any(line.strip() for line in lines):
+                return b"".join(lines)
+            return None
+        lines.append(line)
+        if line.rstrip(b"\r\n") == eos:
+            return b"".join(lines)
+
+
+class AnalyzerPool(object):
+    """MeCab/CaboCha を常駐するサブプロセスとして動かし、非同期に解析する
+
+    入力文を各プロセスへ順番に1行ずつ書き込み、出力を同じ順番で
+    終了文字毎に読み出すため、結果は入力の順に得られる。書き込んだが
+    読み出していない文の数は max_pending までに抑えられ、結果の消費が
+    遅ければ入力の書き込みも待たされる。
+
+    解析器の出力がパイプ先でバッファリングされると結果が届かないため、
+    必要なら ``stdbuf -oL`` などで行毎に出力させること。
+
+    Arguments:
+        command {Sequence[str]} -- 解析器のコマンド (例: ["cabocha", "-f1"])
+
+    Keyword Arguments:
+        processes {int} -- 起動するプロセス数 (default: {1})
+        max_pending {int} -- 解析中の文の数の上限 (default: {64})
+        cls {Optional[Type[Cab]]} -- 生成するクラス (default: {None}, 文節ヘッダーの有無で判定)
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Usage:
+        >>> import asyncio
+        >>> from cucurbita.aio import AnalyzerPool
+        >>> async def main(texts):
+        ...     async with AnalyzerPool(["cabocha", "-f1"], processes=2) as pool:
+        ...         async for sect in pool.analyze(texts):
+        ...             print(sect)
+        >>> asyncio.get_event_loop().run_until_complete(main(["隣の客はよく柿食う客だ。"]))
+        隣の客はよく柿食う客だ。
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        processes: int = 1,
+        max_pending: int = 64,
+        cls: Optional[Type[Cab]] = None,
+        eos: str = "EOS",
+        encoding: str = "utf-8",
+    ) -> None:
+        self.command = list(command)
+        self.n_processes = max(processes, 1)
+        self.max_pending = max(max_pending, 1)
+        self.cls = cls
+        self.eos = eos
+        self.encoding = encoding
+        self.processes: List[asyncio.subprocess.Process] = []
+        self._lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return f"<AnalyzerPool: {self.command}, {self.n_processes} processes>"
+
+    async def __aenter__(self) -> "AnalyzerPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:  # type: ignore
+        await self.close()
+
+    async def start(self) -> None:
+        """解析器のプロセスを起動する"""
+        while len(self.processes) < self.n_processes:
+            process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+            )
+            self.processes.append(process)
+
+    async def close(self) -> None:
+        """入力を閉じ、解析器のプロセスの終了を待つ"""
+        processes, self.processes = self.processes, []
+        for process in processes:
+            if process.stdin is not None and not process.stdin.is_closing():
+                process.stdin.close()
+        for process in processes:
+            await process.wait()
+
+    async def _kill(self) -> None:
+        processes, self.processes = self.processes, []
+        for process in processes:
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+
+    async def analyze(self, texts: Texts) -> AsyncIterator[Cab]:
+        """1行1文のテキストを解析し、入力の順に Sect/Doc を返す
+
+        1度に1つの analyze だけがプロセスを使う。途中で止めた場合は
+        読み残した出力を捨てるためにプロセスを起動し直す。
+
+        Arguments:
+            texts {Texts} -- 解析する文 (同期・非同期どちらの反復子でもよい)
+
+        Yields:
+            AsyncIterator[Cab] -- 入力の文毎の Sect/Doc
+        """
+        async for result in self.analyze_raw(texts):
+            yield _parse(result, self.cls)
+
+    async def analyze_raw(self, texts: Texts) -> AsyncIterator[str]:
+        """analyze と同じだが、パースせずに解析結果の文字列を返す"""
+        async with self._lock:
+            await self.start()
+            # 入力を書き込んだプロセスの番号を、書き込んだ順に積む
+            order: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+            feeder = asyncio.ensure_future(self._feed(texts, order))
+            eos = self.eos.encode(self.encoding)
+            completed = False
+            try:
+                while True:
+                    k = await order.get()
+                    if k is None:
+                        break
+                    stdout = self.processes[k].stdout
+                    result = await _read_sentence(stdout, eos)  # type: ignore
+                    if result is None:
+                        raise Exception("Analyzer exited unexpectedly")
+                    yield result.decode(self.encoding)
+                await feeder
+                completed = True
+            finally:
+                if not feeder.done():
+                    feeder.cancel()
+                if not completed:
+                    # 読み残した出力が次の解析に混ざらないよう、プロセスを止める
+                    await self._kill()
+
+    async def _feed(self, texts: Texts, order: asyncio.Queue) -> None:
+        k = 0
+        try:
+            async for text in _aiter(texts):
+                stdin = self.processes[k].stdin
+                # 改行は文の区切りになるため空白に置き換える
+                line = " ".join(text.splitlines()) + "\n"
+                stdin.write(line.encode(self.encoding))  # type: ignore
+                await stdin.drain()  # type: ignore
+                await order.put(k)
+                k = (k + 1) % len(self.processes)
+        except Exception:
+            # 読み出し側が待ち続けないよう終わりを伝えてから例外を伝える
+            await order.put(None)
+            raise
+        await order.put(None)
+
+
+async def _aiter(texts: Texts) -> AsyncIterator[str]:
+    if hasattr(texts, "__aiter__"):
+        async for text in texts:  # type: ignore
+            yield text
+    else:
+        for text in texts:  # type: ignore
+            yield text
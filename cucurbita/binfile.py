@@ -0,0 +1,168 @@
+import json
+import mmap as _mmap
+import os
+import sys
+from array import array
+from itertools import accumulate
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+# 形式: 先頭に MAGIC (8バイト), ヘッダーの位置と長さ (各8バイト) を置き、
+# 8バイト境界に揃えた各セクションの後ろに JSON のヘッダーを書く
+_PREAMBLE = 8 + 16
+
+Buffer = Union[array, memoryview, bytes]
+Section = Callable[[str], Union[array, memoryview]]
+
+
+class FormatError(Exception):
+    """ファイル形式が異なる (版が違う, 途中で切れている, 壊れている)"""
+
+
+class StringTable(Sequence):
+    """バッファ上の文字列表を、アクセスされた要素だけ復号して返す
+
+    ID 0 は None として扱う。
+
+    Arguments:
+        offsets {Sequence[int]} -- 文字列毎の開始位置 (末尾に全体の長さを持つ)
+        blob {memoryview} -- UTF-8 で連結した文字列
+    """
+
+    def __init__(self, offsets: Sequence[int], blob: memoryview) -> None:
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, id: int) -> Optional[str]:  # type: ignore
+        if id == 0:
+            return None
+        return self.encoded(id).decode()
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        for id in range(len(self)):
+            yield self[id]
+
+    def encoded(self, id: int) -> bytes:
+        """復号せずにバイト列のまま返す"""
+        return bytes(self.blob[self.offsets[id] : self.offsets[id + 1]])
+
+
+def encode_strings(strings: Iterable[Optional[str]]) -> Tuple[array, bytes]:
+    """文字列のリストを StringTable 用の開始位置の配列と連結したバイト列にする"""
+    encoded = [(s or "").encode() for s in strings]
+    offsets = array("q", accumulate([0] + [len(e) for e in encoded]))
+    return offsets, b"".join(encoded)
+
+
+def write_sections(
+    path: str,
+    magic: bytes,
+    header: Dict[str, Any],
+    sections: Iterable[Tuple[str, Buffer]],
+) -> None:
+    """名前付きのバイト列・配列をまとめて1つのファイルに書き込む
+
+    Arguments:
+        path {str} -- 保存先のパス
+        magic {bytes} -- ファイル形式を表す8バイトの識別子
+        header {Dict[str, Any]} -- ヘッダーに書き込む値 (JSONで表せるもの)
+        sections {Iterable[Tuple[str, Buffer]]} -- (名前, データ) の組
+    """
+    assert len(magic) == 8
+    header = dict(header, byteorder=sys.byteorder, sections={})
+    # 既存のファイルをメモリマップしたまま使っているものがあっても壊さない
+    # よう、別のファイルに書き終えてから置き換える
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(bytes(_PREAMBLE))
+        for name, data in sections:
+            f.write(bytes(-f.tell() % 8))
+            view = memoryview(data)
+            header["sections"][name] = [f.tell(), view.nbytes, view.format]
+            f.write(view)
+        position = f.tell()
+        encoded_header = json.dumps(header).encode()
+        f.write(encoded_header)
+        f.seek(0)
+        f.write(magic)
+        f.write(position.to_bytes(8, "little"))
+        f.write(len(encoded_header).to_bytes(8, "little"))
+    os.replace(temporary, path)
+
+
+def read_sections(
+    path: str, magic: bytes, mmap: bool = True
+) -> Tuple[Dict[str, Any], Section]:
+    """write_sections で書き込んだファイルを開く
+
+    mmap が真の場合はファイルをメモリマップし、各セクションはマップされた
+    領域をそのまま参照する memoryview として返す (読み込み専用)。
+
+    Arguments:
+        path {str} -- ファイルのパス
+        magic {bytes} -- ファイル形式を表す8バイトの識別子
+
+    Keyword Arguments:
+        mmap {bool} -- メモリマップで開くか (default: {True})
+
+    Raises:
+        FormatError -- ファイル形式が異なるか、途中で切れている・壊れている場合
+
+    Returns:
+        Tuple[Dict[str, Any], Section] -- ヘッダーと、名前からセクションを返す関数
+    """
+    with open(path, "rb") as f:
+        if mmap and os.fstat(f.fileno()).st_size >= _PREAMBLE:
+            buffer: Union[bytes, _mmap.mmap] = _mmap.mmap(
+                f.fileno(), 0, access=_mmap.ACCESS_READ
+            )
+        else:
+            # 空のファイルはメモリマップできないため、短いものはそのまま読む
+            buffer = f.read()
+
+    view = memoryview(buffer)
+    if len(view) < _PREAMBLE or bytes(view[:8]) != magic:
+        raise FormatError("Undefined format")
+    position = int.from_bytes(view[8:16], "little")
+    length = int.from_bytes(view[16:_PREAMBLE], "little")
+    if position + length != len(view):
+        # 先頭は最後に書き込むため、書き込みの途中で終わったファイルもここで分かる
+        raise FormatError(f"Truncated file: {path}")
+    try:
+        header = json.loads(bytes(view[position:]).decode())
+        sections = header["sections"]
+        for offset, nbytes, typecode in sections.values():
+            if offset + nbytes > position or nbytes % array(typecode).itemsize:
+                raise FormatError(f"Broken section in {path}")
+        byteorder = header["byteorder"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise FormatError(f"Broken header in {path}") from e
+    if byteorder != sys.byteorder:
+        raise FormatError("Undefined format")
+
+    def section(name: str) -> Union[array, memoryview]:
+        if name not in sections:
+            raise FormatError(f"Undefined section: {name}")
+        offset, nbytes, typecode = sections[name]
+        data = view[offset : offset + nbytes]
+        if typecode == "B":
+            return data
+        if mmap:
+            return data.cast(typecode)
+        values = array(typecode)
+        values.frombytes(data)
+        return values
+
+    return header, section
@@ -1,11 +1,53 @@
-import itertools
+from array import array
 from logging import getLogger
-from typing import Iterator, List, Tuple, Union
-
-from cucurbita.util import split_chunks, split_words
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from cucurbita.diagnostics import INVALID_MORPH, ParseStats
+from cucurbita.graph import DepGraph
+from cucurbita.util import split_chunks, split_header, split_sentences, split_words
+
+if TYPE_CHECKING:
+    from cucurbita.cache import ParseCache
+    from cucurbita.schema import Schema
 
 logger = getLogger(__name__)
 
+# Morph のフィールド名 (split_words の返す順)
+MORPH_FIELDS = (
+    "surface",
+    "pos",
+    "pos1",
+    "pos2",
+    "pos3",
+    "conj_form",
+    "conj",
+    "base",
+    "yomi",
+    "pron",
+)
+
+# 本文から表層系を探す時に、直前の単語の後ろで読み飛ばす文字数の上限
+# (MeCab が出力しない空白や記号の分)
+_SPAN_WINDOW = 4
+
+# 品詞・活用情報の文字列を共有するための表
+_FEATURES: Dict[Optional[str], Optional[str]] = {}
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return _FEATURES.setdefault(value, value)
+
 
 class Morph(object):
     """CaboCha(MeCab)による形態素解析結果を受け取り、オブジェクトを返す
@@ -13,6 +55,9 @@ class Morph(object):
     Arguments:
         line {str} -- 形態素解析結果の1行 (ipadic 辞書を想定)
 
+    Keyword Arguments:
+        stats {Optional[ParseStats]} -- 不正な行を警告せずに記録する集計 (default: {None})
+
     Attributes:
         surface {str} -- 表層系
         pos {str} -- 品詞
@@ -24,6 +69,7 @@ class Morph(object):
         base {str} -- 基本形
         yomi {str} -- 読み
         pron {str} -- 発音
+            (分割できない行の場合は全て None)
 
     Usage:
         >>> from cucurbita.cab import Morph
@@ -34,23 +80,50 @@ class Morph(object):
         >>> m.surface
     """
 
-    def __init__(self, line: str) -> None:
-        try:
-            self.values = split_words(line)
-        except AssertionError:
-            logger.warn(f"InvalidLinePattern: {repr(line)}")
-            return
+    __slots__ = MORPH_FIELDS
 
-        self.surface = self.values[0]
-        self.pos = self.values[1]
-        self.pos1 = self.values[2]
-        self.pos2 = self.values[3]
-        self.pos3 = self.values[4]
-        self.conj_form = self.values[5]
-        self.conj = self.values[6]
-        self.base = self.values[7]
-        self.yomi = self.values[8]
-        self.pron = self.values[9]
+    def __init__(self, line: str, stats: Optional[ParseStats] = None) -> None:
+        try:
+            values = split_words(line)
+        except (AssertionError, ValueError):
+            if stats is None:
+                logger.warning("InvalidLinePattern: %r", line)
+            else:
+                stats.add_malformed(INVALID_MORPH, line)
+            values = [None] * len(MORPH_FIELDS)
+
+        (
+            self.surface,
+            pos,
+            pos1,
+            pos2,
+            pos3,
+            conj_form,
+            conj,
+            self.base,
+            self.yomi,
+            self.pron,
+        ) = values
+        # 種類の少ない品詞・活用情報は同一の文字列オブジェクトを共有する
+        self.pos = _intern(pos)
+        self.pos1 = _intern(pos1)
+        self.pos2 = _intern(pos2)
+        self.pos3 = _intern(pos3)
+        self.conj_form = _intern(conj_form)
+        self.conj = _intern(conj)
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "Morph":
+        """分割済みの値(MORPH_FIELDS の順)から行を解析せずにMorphを生成する"""
+        morph = cls.__new__(cls)
+        for field, value in zip(MORPH_FIELDS, values):
+            setattr(morph, field, value)
+        return morph
+
+    @property
+    def values(self) -> List[Optional[str]]:
+        """各フィールドの値を MORPH_FIELDS の順に返す"""
+        return [getattr(self, field) for field in MORPH_FIELDS]
 
     def __str__(self) -> str:
         return str(self.surface)
@@ -65,6 +138,10 @@ class Chunk(object):
     Arguments:
         header {str} -- 文節解析結果のヘッダー
         morphs {List[str]} -- 文節解析結果の単語の配列
+        table {Optional[MorphTable]} -- 同じ行の Morph を共有する表 (default: {None})
+        stats {Optional[ParseStats]} -- 不正な行を記録する集計 (default: {None})
+        schema {Optional[Schema]} -- 単語を schema.morph_class() で作る
+            (default: {None} Morph, table より優先する)
 
     Attributes:
         pos {int} -- 文節内での位置(文節番号)
@@ -84,12 +161,35 @@ class Chunk(object):
         0
     """
 
-    def __init__(self, morphs: List[str], header: str = "") -> None:
+    def __init__(
+        self,
+        morphs: List[str],
+        header: str = "",
+        table: Optional["MorphTable"] = None,
+        stats: Optional[ParseStats] = None,
+        schema: Optional["Schema"] = None,
+    ) -> None:
         if header:
-            self.pos, self.dst, self.score = self.__parse_header(line=header)
+            self.pos, self.dst, self.score = split_header(header)
         else:
             self.pos = self.dst = self.score = 0
-        self.morphs = [Morph(line=morph) for morph in morphs]
+        if schema is not None:
+            morph_cls = schema.morph_class()
+            self.morphs = [morph_cls(morph) for morph in morphs]
+        elif table is None:
+            self.morphs = [Morph(morph, stats) for morph in morphs]
+        else:
+            self.morphs = [table.get(morph, stats) for morph in morphs]
+
+    @classmethod
+    def from_morphs(
+        cls, morphs: List[Morph], pos: int = 0, dst: int = 0, score: float = 0
+    ) -> "Chunk":
+        """作成済みの単語と文節の情報から行を解析せずに Chunk を生成する"""
+        chunk = cls.__new__(cls)
+        chunk.pos, chunk.dst, chunk.score = pos, dst, score
+        chunk.morphs = morphs
+        return chunk
 
     def __str__(self) -> str:
         return "".join(map(str, self.morphs))
@@ -97,12 +197,123 @@ class Chunk(object):
     def __repr__(self) -> str:
         return "<Chunk: {}>".format(" ".join(map(str, self.morphs)))
 
-    def __parse_header(self, line: str) -> Tuple[int, int, float]:
-        _, pos, dst, _, score, *_ = line.split()
-        if not dst.endswith("D"):
-            raise Exception("Undefined format")
-        dst = dst.rstrip("D")
-        return int(pos), int(dst), float(score)
+    def surfaces(self) -> List[str]:
+        """単語の表層系の一覧 (不正な行の単語は空文字列)"""
+        return [morph.surface or "" for morph in self.morphs]
+
+
+def _morph_surface(line: str) -> Optional[str]:
+    """単語行の表層系 (split_words で分割できない行は None)
+
+    タブが1つで素性が9個以下かを、行を分割せずに数えて調べる。
+    """
+    tab = line.find("\t")
+    if (
+        tab == -1
+        or line.count("\t", tab + 1)
+        or line.count(",", tab) >= len(MORPH_FIELDS) - 1
+    ):
+        return None
+    return line[:tab]
+
+
+class LazyMorph(Morph):
+    """表層系以外のフィールドを、初めて参照された時に分割する Morph
+
+    行を保持しておき、surface 以外のフィールドが参照されると行全体を
+    分割して全フィールドを設定する (以降は Morph と同じ速さで参照できる)。
+    pos だけは行全体を分割せずに切り出す。分割できない行は作る時に
+    Morph と同じく全てのフィールドを None とする。
+
+    Keyword Arguments:
+        stats {Optional[ParseStats]} -- 不正な行を警告せずに記録する集計 (default: {None})
+
+    Usage:
+        >>> from cucurbita.cab import LazyMorph
+        >>> m = LazyMorph("客\t名詞,一般,*,*,*,*,客,キャク,キャク")
+        >>> m.surface, m.pos
+        ('客', '名詞')
+    """
+
+    __slots__ = ("_line",)
+
+    def __init__(self, line: str, stats: Optional[ParseStats] = None) -> None:
+        surface = _morph_surface(line)
+        if surface is None:
+            self._line: Optional[str] = None
+            Morph.__init__(self, line, stats)
+            return
+        self._line = line
+        self.surface = surface
+
+    def __getattr__(self, name: str) -> Any:
+        # 未設定のスロットを参照した時だけ呼ばれる
+        if name not in MORPH_FIELDS:
+            raise AttributeError(name)
+        line = self._line
+        if line is None:
+            raise AttributeError(name)
+        if name == "pos":
+            # 品詞だけなら最初の素性を切り出すだけで済ませる
+            start = line.find("\t") + 1
+            end = line.find(",", start)
+            self.pos = _intern(line[start:end] if end != -1 else line[start:])
+            return self.pos
+        self._line = None
+        Morph.__init__(self, line)
+        return getattr(self, name)
+
+
+class LazyChunk(Chunk):
+    """単語の行を保持し、morphs が初めて参照された時に Morph を作る Chunk
+
+    Morph は LazyMorph (table を指定した場合は共有の FrozenMorph,
+    schema を指定した場合は schema.morph_class()) とする。
+    LazyMorph の不正な行は LazyMorph を作る時に stats に記録する。
+    """
+
+    def __init__(
+        self,
+        morphs: List[str],
+        header: str = "",
+        table: Optional["MorphTable"] = None,
+        stats: Optional[ParseStats] = None,
+        schema: Optional["Schema"] = None,
+    ) -> None:
+        if header:
+            self.pos, self.dst, self.score = split_header(header)
+        else:
+            self.pos = self.dst = self.score = 0
+        self._lines: Optional[List[str]] = morphs
+        self._table = table
+        self._stats = stats
+        self._schema = schema
+        self._morphs: List[Morph] = []
+
+    @property  # type: ignore
+    def morphs(self) -> List[Morph]:
+        if self._lines is not None:
+            lines, self._lines = self._lines, None
+            if self._schema is not None:
+                morph_cls = self._schema.morph_class()
+                self._morphs = [morph_cls(line) for line in lines]  # type: ignore
+            elif self._table is None:
+                stats = self._stats
+                self._morphs = [LazyMorph(line, stats) for line in lines]
+            else:
+                stats = self._stats
+                self._morphs = [self._table.get(line, stats) for line in lines]
+        return self._morphs
+
+    @morphs.setter
+    def morphs(self, morphs: List[Morph]) -> None:
+        self._lines = None
+        self._morphs = morphs
+
+    def surfaces(self) -> List[str]:
+        if self._lines is not None:
+            return [_morph_surface(line) or "" for line in self._lines]
+        return super().surfaces()
 
 
 class Cab(object):
@@ -112,31 +323,202 @@ class Cab(object):
         result {str} -- CaboCha, MeCab解析結果
         text {str} -- CaboCha, MeCab解析元本文
 
+    Keyword Arguments:
+        table {Optional[MorphTable]} -- 同じ行の Morph を共有する表 (default: {None})
+        lazy {bool} -- 単語を参照された時に作るか (LazyChunk, LazyMorph) (default: {False})
+        stats {Optional[ParseStats]} -- 件数, 不正な行, 段階毎の時間の集計
+            (default: {None})
+        schema {Optional[Schema]} -- 辞書の素性の並び (unidic など)。単語は
+            schema.morph_class() になる (default: {None} ipadic の Morph)
+
     Attributes:
         result {str} -- CaboCha, MeCab解析結果
-        text {str} -- CaboCha, MeCab解析元本文
+        text {str} -- CaboCha, MeCab解析元本文 (省略時は表層系をつなげたもの)
+        token_starts, token_ends {array} -- 単語毎の text 内での開始・終了位置
+        chunk_starts, chunk_ends {array} -- 文節毎の text 内での開始・終了位置
 
+    Usage:
+        >>> from cucurbita.cab import Sect
+        >>> from cucurbita.dataset import DOC_CABOCHA
+        >>> sect = Sect(DOC_CABOCHA)
+        >>> start, end = sect.chunk_span(1)
+        >>> sect.text[start:end]
+        '客は'
     """
 
-    def __init__(self, result: str, text: str = "") -> None:
+    # result を文節から作る時に文節ヘッダーを書くか
+    _headed = False
+
+    def __init__(
+        self,
+        result: str,
+        text: str = "",
+        table: Optional["MorphTable"] = None,
+        lazy: bool = False,
+        stats: Optional[ParseStats] = None,
+        schema: Optional["Schema"] = None,
+    ) -> None:
+        if table is not None and schema is not None:
+            raise Exception("MorphTable cannot be used with schema")
+        self._result: Optional[str] = None
         self.result = result
-        self.text = text if text else self.__get_surface(result)
-
-    def __get_surface(self, text: str) -> str:
-        """形態素解析結果から表層系だけを抜き出す"""
-        surface = ""
-        for line in text.splitlines():
-            line = line.split("\t")
-            if len(line) == 2:
-                surface += line[0]
-        return surface
+        # 解析結果は一度だけパースし、tokenize などで使い回す
+        chunk_cls = LazyChunk if lazy else Chunk
+        pattern_morph = None if schema is None else schema.pattern_morph
+        if stats is None:
+            self._chunks = [
+                chunk_cls(morphs=morphs, header=header, table=table, schema=schema)
+                for header, morphs in split_chunks(result, pattern_morph=pattern_morph)
+            ]
+            # 本文が与えられなければパース済みの表層系をつなげる
+            self.text = text if text else "".join(self.__surfaces())
+        else:
+            start = perf_counter()
+            pairs = list(split_chunks(result, pattern_morph=pattern_morph, stats=stats))
+            split = perf_counter()
+            self._chunks = [
+                chunk_cls(morphs, header, table=table, stats=stats, schema=schema)
+                for header, morphs in pairs
+            ]
+            built = perf_counter()
+            self.text = text if text else "".join(self.__surfaces())
+            stats.add_time("split", split - start)
+            stats.add_time("chunks", built - split)
+            stats.add_time("text", perf_counter() - built)
+        self._spans: Optional[Tuple[array, array, array, array]] = None
+
+    @classmethod
+    def from_chunks(cls, chunks: List[Chunk], text: str = "") -> "Cab":
+        """作成済みの文節から解析結果をパースせずに生成する
+
+        result は初めて参照された時に文節から作る (文節ヘッダーの
+        主辞/機能語の位置は "0/0" とする)。
+
+        Arguments:
+            chunks {List[Chunk]} -- 文節
+
+        Keyword Arguments:
+            text {str} -- 解析元本文 (default: {""} 表層系をつなげたもの)
+        """
+        cab = cls.__new__(cls)
+        cab._result = None
+        cab._chunks = chunks
+        cab.text = text if text else "".join(cab.__surfaces())
+        cab._spans = None
+        return cab
+
+    @property
+    def result(self) -> str:
+        """CaboCha, MeCab解析結果"""
+        if self._result is None:
+            # 変更できないサブクラスでも保持できるよう __setattr__ を通さない
+            object.__setattr__(self, "_result", self._render())
+        return self._result  # type: ignore
+
+    @result.setter
+    def result(self, result: str) -> None:
+        object.__setattr__(self, "_result", result)
+
+    def _render(self) -> str:
+        lines = []
+        for chunk in self._chunks:
+            if self._headed:
+                lines.append(f"* {chunk.pos} {chunk.dst}D 0/0 {chunk.score:.6f}")
+            for morph in chunk.morphs:
+                values = [v for v in morph.values if v is not None]
+                surface = values[0] if values else ""
+                lines.append(surface + "\t" + ",".join(values[1:]))
+        lines.append("EOS")
+        return "\n".join(lines) + "\n"
+
+    def __surfaces(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            yield from chunk.surfaces()
+
+    def __build_spans(self) -> Tuple[array, array, array, array]:
+        """単語と文節の text 内での開始・終了位置を求める
+
+        本文を与えた場合は表層系を先頭から順に探し、見つからない単語の
+        位置は -1 とする。探すのは直前の単語の後ろ _SPAN_WINDOW 文字までで、
+        見つからなければ続く単語も同じ位置から探す。
+        """
+        text = self.text
+        token_starts, token_ends = array("i"), array("i")
+        chunk_starts, chunk_ends = array("i"), array("i")
+        cursor = 0
+        for chunk in self._chunks:
+            chunk_start = chunk_end = -1
+            for surface in chunk.surfaces():
+                if text.startswith(surface, cursor):
+                    start = cursor
+                else:
+                    start = text.find(
+                        surface, cursor, cursor + len(surface) + _SPAN_WINDOW
+                    )
+                if start == -1:
+                    token_starts.append(-1)
+                    token_ends.append(-1)
+                    continue
+                cursor = start + len(surface)
+                token_starts.append(start)
+                token_ends.append(cursor)
+                if chunk_start == -1:
+                    chunk_start = start
+                chunk_end = cursor
+            chunk_starts.append(chunk_start)
+            chunk_ends.append(chunk_end)
+        spans = (token_starts, token_ends, chunk_starts, chunk_ends)
+        # 変更できないサブクラスでも保持できるよう __setattr__ を通さない
+        object.__setattr__(self, "_spans", spans)
+        return spans
+
+    @property
+    def token_starts(self) -> array:
+        """tokenize() の単語毎の text 内での開始位置 (初回アクセス時に作成)"""
+        return (self._spans or self.__build_spans())[0]
+
+    @property
+    def token_ends(self) -> array:
+        """tokenize() の単語毎の text 内での終了位置 (初回アクセス時に作成)"""
+        return (self._spans or self.__build_spans())[1]
+
+    @property
+    def chunk_starts(self) -> array:
+        """文節毎の text 内での開始位置 (初回アクセス時に作成)"""
+        return (self._spans or self.__build_spans())[2]
+
+    @property
+    def chunk_ends(self) -> array:
+        """文節毎の text 内での終了位置 (初回アクセス時に作成)"""
+        return (self._spans or self.__build_spans())[3]
+
+    def token_span(self, i: int) -> Tuple[int, int]:
+        """i 番目の単語の text 内での (開始位置, 終了位置)"""
+        spans = self._spans or self.__build_spans()
+        return spans[0][i], spans[1][i]
+
+    def chunk_span(self, i: int) -> Tuple[int, int]:
+        """i 番目の文節の text 内での (開始位置, 終了位置)"""
+        spans = self._spans or self.__build_spans()
+        return spans[2][i], spans[3][i]
+
+    @classmethod
+    def from_result(cls, result: str, cache: Optional["ParseCache"] = None) -> "Cab":
+        """解析結果からオブジェクトを生成する
+
+        cache を指定すると、同じ解析結果に対しては1度だけパースし、
+        変更できない共有のオブジェクト (FrozenSect, FrozenDoc) を返す。
+
+        Keyword Arguments:
+            cache {Optional[ParseCache]} -- パース結果のキャッシュ (default: {None})
+        """
+        if cache is None:
+            return cls(result)
+        return cache.parse(result, cls)
 
     def tokenize(self) -> List[Morph]:
         """形態素解析結果からmorphsの配列を生成する"""
-        tokens = []
-        for _, morphs in split_chunks(self.result):
-            tokens += morphs
-        return [Morph(token) for token in tokens]
+        return [morph for chunk in self._chunks for morph in chunk.morphs]
 
 
 class Sect(Cab):
@@ -150,18 +532,47 @@ class Sect(Cab):
         result {str} -- CaboCha解析結果
         text {str} -- CaboCha解析元本文
         chunks {List[Chunk]} -- 文節集合
+        graph {DepGraph} -- 文節の係り受けの索引 (初回アクセス時に作成)
 
     Usage:
         >>> from cucurbita.cab import Chunk
 
     """
 
-    def __init__(self, result: str, text: str = "") -> None:
-        super().__init__(result=result, text=text)
-        self.chunks = [
-            Chunk(morphs=morphs, header=header)
-            for header, morphs in split_chunks(result)
-        ]
+    _headed = True
+
+    def __init__(
+        self,
+        result: str,
+        text: str = "",
+        table: Optional["MorphTable"] = None,
+        lazy: bool = False,
+        stats: Optional[ParseStats] = None,
+        schema: Optional["Schema"] = None,
+    ) -> None:
+        super().__init__(
+            result=result,
+            text=text,
+            table=table,
+            lazy=lazy,
+            stats=stats,
+            schema=schema,
+        )
+        self.chunks = self._chunks
+        self._graph: Optional[DepGraph] = None
+
+    @classmethod
+    def from_chunks(cls, chunks: List[Chunk], text: str = "") -> "Sect":
+        sect = super().from_chunks(chunks, text)
+        sect.chunks = sect._chunks
+        sect._graph = None
+        return sect  # type: ignore
+
+    @property
+    def graph(self) -> DepGraph:
+        if self._graph is None:
+            self._graph = DepGraph([chunk.dst for chunk in self.chunks])
+        return self._graph
 
     def __str__(self) -> str:
         return "".join(map(str, self.chunks))
@@ -191,3 +602,289 @@ class Doc(Cab):
 
     def __repr__(self) -> str:
         return f"<Doc: {self.text}>"
+
+
+class _Frozen(object):
+    """属性の変更を禁止する"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _init(self, **values: Any) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __reduce__(self) -> Any:
+        names = [n for c in type(self).__mro__ for n in getattr(c, "__slots__", ())]
+        state = {name: getattr(self, name) for name in names if hasattr(self, name)}
+        state.update(getattr(self, "__dict__", {}))
+        return _restore_frozen, (type(self), state)
+
+
+def _restore_frozen(cls: Type[_Frozen], state: Dict[str, Any]) -> _Frozen:
+    frozen = cls.__new__(cls)
+    frozen._init(**state)
+    return frozen
+
+
+class FrozenMorph(Morph, _Frozen):
+    """変更できない Morph (複数の文から共有してよい)"""
+
+    __slots__ = ()
+
+    def __init__(self, line: str, stats: Optional[ParseStats] = None) -> None:
+        self._init(**dict(zip(MORPH_FIELDS, Morph(line, stats).values)))
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "FrozenMorph":
+        morph = cls.__new__(cls)
+        morph._init(**dict(zip(MORPH_FIELDS, values)))
+        return morph
+
+
+class MorphTable(object):
+    """同じ形態素解析結果の行に対して、共有の FrozenMorph を返す表
+
+    助詞や句読点のように何度も現れる行は、分割もオブジェクトの生成も
+    1度で済む。表が maxsize に達したら空にして作り直す (re モジュールの
+    キャッシュと同じ方式)。既に返した Morph はそのまま使える。
+
+    Keyword Arguments:
+        maxsize {int} -- 保持する行の数の上限 (default: {65536})
+
+    Usage:
+        >>> from cucurbita.cab import MorphTable, Sect
+        >>> from cucurbita.dataset import DOC_CABOCHA
+        >>> table = MorphTable()
+        >>> a, b = Sect(DOC_CABOCHA, table=table), Sect(DOC_CABOCHA, table=table)
+        >>> a.tokenize()[0] is b.tokenize()[0]
+        True
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = maxsize
+        self._morphs: Dict[str, FrozenMorph] = {}
+
+    def __len__(self) -> int:
+        return len(self._morphs)
+
+    def __repr__(self) -> str:
+        return f"<MorphTable: {len(self)}/{self.maxsize} lines>"
+
+    def get(self, line: str, stats: Optional[ParseStats] = None) -> Morph:
+        """行に対応する FrozenMorph を返す (なければ作成して保持する)
+
+        stats を指定すると、保持している不正な行の Morph を返す時も記録する。
+        """
+        morph = self._morphs.get(line)
+        if morph is None:
+            morph = FrozenMorph(line, stats)
+            if len(self._morphs) >= self.maxsize:
+                self._morphs.clear()
+            self._morphs[line] = morph
+        elif stats is not None and morph.surface is None:
+            stats.add_malformed(INVALID_MORPH, line)
+        return morph
+
+    def clear(self) -> None:
+        self._morphs.clear()
+
+
+def _freeze_morph(morph: Morph) -> Morph:
+    if isinstance(morph, _Frozen):
+        return morph
+    if isinstance(morph, Morph):
+        return FrozenMorph.from_values(morph.values)
+    # schema の単語は同じ列を持つ変更できないクラスに移す
+    return morph.schema.morph_class(frozen=True).from_values(morph.values)
+
+
+class FrozenChunk(Chunk, _Frozen):
+    """変更できない Chunk (morphs はタプル)
+
+    ipadic の Morph は FrozenMorph に、schema の単語 (SchemaMorph) は
+    schema.morph_class(frozen=True) の単語にする。
+    """
+
+    def __init__(self, morphs: List[str], header: str = "") -> None:
+        self.__freeze(Chunk(morphs, header=header))
+
+    def __freeze(self, chunk: Chunk) -> None:
+        self._init(
+            pos=chunk.pos,
+            dst=chunk.dst,
+            score=chunk.score,
+            morphs=tuple(_freeze_morph(m) for m in chunk.morphs),
+        )
+
+    @classmethod
+    def from_chunk(cls, chunk: Chunk) -> "FrozenChunk":
+        frozen = cls.__new__(cls)
+        frozen.__freeze(chunk)
+        return frozen
+
+
+class FrozenSect(Sect, _Frozen):
+    """変更できない Sect (chunks はタプル)
+
+    graph は初回アクセス時に作成する。
+    """
+
+    def __init__(self, result: str, text: str = "") -> None:
+        self.__freeze(Sect(result, text=text))
+
+    def __freeze(self, sect: Sect) -> None:
+        chunks = tuple(FrozenChunk.from_chunk(chunk) for chunk in sect.chunks)
+        self._init(
+            result=sect.result,
+            text=sect.text,
+            _chunks=chunks,
+            chunks=chunks,
+            _graph=None,
+            _spans=sect._spans,
+        )
+
+    @classmethod
+    def from_sect(cls, sect: Sect) -> "FrozenSect":
+        frozen = cls.__new__(cls)
+        frozen.__freeze(sect)
+        return frozen
+
+    @property
+    def graph(self) -> DepGraph:
+        if self._graph is None:
+            self._init(_graph=DepGraph([chunk.dst for chunk in self.chunks]))
+        return self._graph
+
+
+class FrozenDoc(Doc, _Frozen):
+    """変更できない Doc"""
+
+    def __init__(self, result: str, text: str = "") -> None:
+        self.__freeze(Doc(result, text=text))
+
+    def __freeze(self, doc: Doc) -> None:
+        chunks = tuple(FrozenChunk.from_chunk(chunk) for chunk in doc._chunks)
+        self._init(result=doc.result, text=doc.text, _chunks=chunks, _spans=doc._spans)
+
+    @classmethod
+    def from_doc(cls, doc: Doc) -> "FrozenDoc":
+        frozen = cls.__new__(cls)
+        frozen.__freeze(doc)
+        return frozen
+
+
+def freeze(cab: Cab) -> Cab:
+    """Sect, Doc を変更できないオブジェクトに変換する (変換済みならそのまま返す)"""
+    if isinstance(cab, _Frozen):
+        return cab
+    if isinstance(cab, Sect):
+        return FrozenSect.from_sect(cab)
+    if isinstance(cab, Doc):
+        return FrozenDoc.from_doc(cab)
+    raise TypeError(f"cannot freeze {type(cab).__name__}")
+
+
+class Sentences(Sequence):
+    """文毎の解析結果を、アクセスされた時にパースして保持するシーケンス
+
+    Arguments:
+        results {List[str]} -- 1文毎の解析結果
+        cls {Optional[Type[Cab]]} -- 文のクラス (default: {None} ヘッダーの有無で選ぶ)
+    """
+
+    def __init__(self, results: List[str], cls: Optional[Type[Cab]] = None) -> None:
+        self.results = results
+        self.cls = cls
+        self._parsed: List[Optional[Cab]] = [None] * len(results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, i):  # type: ignore
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        parsed = self._parsed[i]
+        if parsed is None:
+            parsed = self._parsed[i] = self.parse(i)
+        return parsed
+
+    def __repr__(self) -> str:
+        parsed = sum(1 for s in self._parsed if s is not None)
+        return f"<Sentences: {parsed}/{len(self)} parsed>"
+
+    def parse(self, i: int) -> Cab:
+        """i 番目の文をパースする (結果は保持しない)"""
+        result = self.results[i]
+        cls = self.cls or (Sect if result.startswith("* ") else Doc)
+        return cls(result)
+
+    def is_parsed(self, i: int) -> bool:
+        return self._parsed[i] is not None
+
+
+class Article(object):
+    """複数の文を含む解析結果用インターフェイス
+
+    Sect, Doc は最初の EOS までしか扱わないため、複数文の解析結果は
+    このクラスで文毎に分割する。各文は sentences からアクセスされた時に
+    初めてパースされる。
+
+    Arguments:
+        result {str} -- CaboCha, MeCab解析結果 (複数文)
+
+    Keyword Arguments:
+        cls {Optional[Type[Cab]]} -- 文のクラス (default: {None} ヘッダーの有無で選ぶ)
+        eos {str} -- 終了文字 (default: {"EOS\\n"})
+
+    Attributes:
+        result {str} -- CaboCha, MeCab解析結果
+        sentences {Sentences} -- 文集合
+
+    Usage:
+        >>> from cucurbita.cab import Article
+        >>> from cucurbita.dataset import DOC_MECAB
+        >>> article = Article(DOC_MECAB)
+        >>> len(article.sentences)
+        3
+        >>> article.sentences[1]
+        <Doc: 庭には鶏が二羽いました。>
+        >>> [m.surface for m in article.tokenize() if m.pos == "名詞"][:3]
+        ['隣', '客', '柿']
+    """
+
+    def __init__(
+        self, result: str, cls: Optional[Type[Cab]] = None, eos: str = "EOS\n"
+    ) -> None:
+        self.result = result
+        self.sentences = Sentences(list(split_sentences(result, eos=eos)), cls=cls)
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def __iter__(self) -> Iterator[Cab]:
+        return iter(self.sentences)
+
+    def __str__(self) -> str:
+        return "".join(map(str, self.sentences))
+
+    def __repr__(self) -> str:
+        return f"<Article: {len(self)} sentences>"
+
+    def tokenize(self) -> Iterator[Morph]:
+        """全文の morphs を順に返す
+
+        パース済みでない文は一時的にパースし、sentences には保持しない。
+        """
+        sentences = self.sentences
+        for i in range(len(sentences)):
+            if sentences.is_parsed(i):
+                sentence = sentences[i]
+            else:
+                sentence = sentences.parse(i)
+            yield from sentence.tokenize()
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Tuple, Type
+
+from cucurbita.cab import Cab, Doc, Sect, freeze
+
+
+class CacheStats(NamedTuple):
+    """キャッシュの統計
+
+    Attributes:
+        hits {int} -- キャッシュから返した回数
+        misses {int} -- パースした回数
+        evictions {int} -- 上限を超えて捨てた数
+        size {int} -- 保持している数
+        maxsize {int} -- 保持する数の上限
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ParseCache(object):
+    """解析結果の文字列をキーに、パース済みのオブジェクトを保持する LRU キャッシュ
+
+    定型文や見出しなど同じ文が何度も現れる場合に、パースを1度で済ませる。
+    返すオブジェクトは複数の呼び出し元で共有されるため、変更できない
+    FrozenSect, FrozenDoc とする。キーは解析結果の文字列そのもので、
+    辞書のハッシュで引いた後に文字列の一致も確かめるため衝突の心配はない。
+    キーの文字列はキャッシュしたオブジェクトの result と同じものを使うので、
+    余分に保持するのは辞書の要素だけで済む。
+
+    Keyword Arguments:
+        maxsize {int} -- 保持する文の数の上限 (default: {4096})
+
+    Usage:
+        >>> from cucurbita.cab import Sect
+        >>> from cucurbita.cache import ParseCache
+        >>> from cucurbita.dataset import DOC_CABOCHA
+        >>> cache = ParseCache(maxsize=1000)
+        >>> a = Sect.from_result(DOC_CABOCHA, cache=cache)
+        >>> b = Sect.from_result(DOC_CABOCHA, cache=cache)
+        >>> a is b
+        True
+        >>> cache.stats
+        CacheStats(hits=1, misses=1, evictions=0, size=1, maxsize=1000)
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = max(maxsize, 0)
+        self._items: "OrderedDict[Tuple[type, str], Cab]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"<ParseCache: {len(self)}/{self.maxsize} sentences>"
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.hits, self.misses, self.evictions, len(self._items), self.maxsize
+        )
+
+    def clear(self) -> None:
+        """保持しているオブジェクトと統計を消去する"""
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def parse(self, result: str, cls: Type[Cab] = Sect) -> Cab:
+        """解析結果をパースする (同じ解析結果なら保持しているオブジェクトを返す)
+
+        Arguments:
+            result {str} -- 1文の解析結果
+
+        Keyword Arguments:
+            cls {Type[Cab]} -- 文のクラス (default: {Sect})
+
+        Returns:
+            Cab -- 変更できない Sect, Doc
+        """
+        key = (cls, result)
+        with self._lock:
+            cab = self._items.get(key)
+            if cab is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return cab
+            self.misses += 1
+
+        # パースはロックの外で行う (同時に同じ文をパースした場合は後者を保持する)
+        cab = freeze(cls(result))
+        if self.maxsize == 0:
+            return cab
+        with self._lock:
+            self._items[key] = cab
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        return cab
+
+    def sect(self, result: str) -> Sect:
+        return self.parse(result, Sect)  # type: ignore
+
+    def doc(self, result: str) -> Doc:
+        return self.parse(result, Doc)  # type: ignore
@@ -0,0 +1,571 @@
+import hashlib
+import os
+from array import array
+from collections import Counter
+from itertools import compress
+from logging import getLogger
+from time import perf_counter
+from typing import Counter as TypingCounter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from cucurbita.binfile import (
+    Buffer,
+    FormatError,
+    StringTable,
+    encode_strings,
+    read_sections,
+    write_sections,
+)
+from cucurbita.cab import MORPH_FIELDS, Chunk, Doc, Morph, Sect
+from cucurbita.diagnostics import INVALID_MORPH, ParseStats
+from cucurbita.graph import DepGraph
+from cucurbita.io import Source, iter_sentences
+from cucurbita.util import (
+    split_chunks,
+    split_header,
+    split_sentences,
+    split_words,
+)
+
+logger = getLogger(__name__)
+
+# 保存形式の識別子 (形式は cucurbita.binfile を参照)
+MAGIC = b"CUCURBIT"
+FORMAT_VERSION = 1
+_ARRAYS = ("chunk_offsets", "sent_offsets", "dst", "score", "headed")
+
+
+class StaleCacheError(Exception):
+    """保存済みのコーパスが元の解析結果ファイルと一致しない"""
+
+
+class Vocab(object):
+    """文字列と整数IDの対応表
+
+    ID 0 は None (値なし) に予約している。
+
+    Arguments:
+        strings {Iterable[str]} -- 登録済みの文字列 (ID 1 から順に割り当てる)
+
+    Usage:
+        >>> from cucurbita.corpus import Vocab
+        >>> vocab = Vocab()
+        >>> vocab.add("名詞")
+        1
+        >>> vocab[1]
+        '名詞'
+    """
+
+    def __init__(self, strings: Iterable[str] = ()) -> None:
+        self.strings: List[Optional[str]] = [None]
+        self.ids: Dict[Optional[str], int] = {None: 0}
+        for string in strings:
+            self.add(string)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __getitem__(self, id: int) -> Optional[str]:
+        return self.strings[id]
+
+    def __contains__(self, string: object) -> bool:
+        return string in self.ids
+
+    def __getstate__(self) -> List[Optional[str]]:
+        # 逆引きの辞書は文字列のリストから復元できるので送らない
+        return self.strings
+
+    def __setstate__(self, strings: List[Optional[str]]) -> None:
+        self.strings = strings
+        self.ids = {string: id for id, string in enumerate(strings)}
+
+    def add(self, string: Optional[str]) -> int:
+        """文字列を登録してIDを返す (登録済みならそのIDを返す)"""
+        id = self.ids.get(string)
+        if id is None:
+            id = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return id
+
+    def get(self, string: Optional[str], default: int = -1) -> int:
+        """文字列のIDを返す (未登録なら default を返す)"""
+        return self.ids.get(string, default)
+
+
+class MappedVocab(Vocab):
+    """保存済みコーパスの読み込み専用の Vocab
+
+    文字列から ID への辞書は get などで初めて必要になった時に作成する。
+    """
+
+    def __init__(self, strings: StringTable) -> None:
+        self.strings = strings  # type: ignore
+        self._ids: Optional[Dict[Optional[str], int]] = None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return Vocab, (list(self.strings)[1:],)
+
+    @property  # type: ignore
+    def ids(self) -> Dict[Optional[str], int]:
+        if self._ids is None:
+            self._ids = {string: id for id, string in enumerate(self.strings)}
+        return self._ids
+
+    def add(self, string: Optional[str]) -> int:
+        id = self.ids.get(string)
+        if id is None:
+            raise TypeError("MappedVocab is read-only")
+        return id
+
+
+class Corpus(object):
+    """解析結果を列指向の整数配列で保持するコーパス
+
+    単語の各フィールドは Vocab で整数化して MORPH_FIELDS 毎の配列に、
+    文節・文は先頭位置の配列 (CSR形式) で保持する。Sect, Morph は
+    アクセスされた時に配列から生成する。
+
+    Attributes:
+        vocab {Vocab} -- 全フィールド共通の文字列表
+        columns {Dict[str, array]} -- フィールド名毎の単語の文字列ID
+        chunk_offsets {array} -- 文節毎の先頭の単語番号 (末尾に単語数を持つ)
+        sent_offsets {array} -- 文毎の先頭の文節番号 (末尾に文節数を持つ)
+        dst {array} -- 文節毎のかかり先の文節番号 (文内での番号)
+        score {array} -- 文節毎の係り度合い
+        headed {array} -- 文毎の文節ヘッダーの有無 (CaboChaなら1, MeCabなら0)
+
+    Usage:
+        >>> from cucurbita.corpus import Corpus
+        >>> from cucurbita.dataset import DOC_CABOCHA
+        >>> corpus = Corpus.from_text(DOC_CABOCHA)
+        >>> len(corpus), corpus.n_chunks, corpus.n_tokens
+        (3, 16, 32)
+        >>> corpus[1]
+        <Sect: 庭には / 鶏が / 二羽 / いました。>
+    """
+
+    def __init__(self) -> None:
+        self.vocab = Vocab()
+        self.columns: Dict[str, array] = {field: array("i") for field in MORPH_FIELDS}
+        self.chunk_offsets = array("q", [0])
+        self.sent_offsets = array("q", [0])
+        self.dst = array("i")
+        self.score = array("d")
+        self.headed = array("b")
+
+    @classmethod
+    def from_sentences(
+        cls, sentences: Iterable[str], stats: Optional[ParseStats] = None
+    ) -> "Corpus":
+        """1文毎の解析結果からコーパスを作成する"""
+        corpus = cls()
+        corpus.extend(sentences, stats=stats)
+        return corpus
+
+    @classmethod
+    def from_text(cls, text: str, stats: Optional[ParseStats] = None) -> "Corpus":
+        """複数文を含む解析結果からコーパスを作成する"""
+        return cls.from_sentences(split_sentences(text), stats=stats)
+
+    @classmethod
+    def from_file(
+        cls,
+        source: Source,
+        encoding: str = "utf-8",
+        stats: Optional[ParseStats] = None,
+    ) -> "Corpus":
+        """解析結果ファイルを一行ずつ読み込みコーパスを作成する"""
+        return cls.from_sentences(
+            iter_sentences(source, encoding=encoding), stats=stats
+        )
+
+    def save(self, path: str, source_digest: str = "", source_stamp: str = "") -> None:
+        """コーパスを文字列表と整数配列からなるバイナリ形式で保存する
+
+        Arguments:
+            path {str} -- 保存先のパス
+
+        Keyword Arguments:
+            source_digest {str} -- 元の解析結果ファイルのハッシュ値 (default: {""})
+            source_stamp {str} -- 元の解析結果ファイルの file_stamp (default: {""})
+        """
+        string_offsets, string_blob = encode_strings(self.vocab.strings)
+        sections: List[Tuple[str, Buffer]] = [
+            ("string_offsets", string_offsets),
+            ("string_blob", string_blob),
+        ]
+        sections += [("column." + f, c) for f, c in self.columns.items()]
+        sections += [(name, getattr(self, name)) for name in _ARRAYS]
+        header = {
+            "version": FORMAT_VERSION,
+            "source": source_digest,
+            "stamp": source_stamp,
+        }
+        write_sections(path, MAGIC, header, sections)
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        mmap: bool = True,
+        source: Optional[str] = None,
+        source_digest: Optional[str] = None,
+    ) -> "Corpus":
+        """save で保存したコーパスを開く
+
+        mmap が真の場合はファイルをメモリマップし、配列はマップされた
+        領域をそのまま参照する (読み込み専用)。文 i を取り出す時に
+        読まれるのはその文の範囲だけとなる。
+
+        Arguments:
+            path {str} -- 保存したファイルのパス
+
+        Keyword Arguments:
+            mmap {bool} -- メモリマップで開くか (default: {True})
+            source {Optional[str]} -- 照合する元の解析結果ファイル。大きさと
+                更新時刻を保存時と比べる (default: {None})
+            source_digest {Optional[str]} -- 照合する元の解析結果ファイルの
+                file_digest (default: {None} 内容は比べない)
+
+        Raises:
+            StaleCacheError -- 元の解析結果ファイルが保存時と異なる場合
+            FormatError -- ファイル形式や版が異なるか、壊れている場合
+
+        Returns:
+            Corpus -- コーパス
+        """
+        header, section = read_sections(path, MAGIC, mmap=mmap)
+        if header.get("version") != FORMAT_VERSION:
+            raise FormatError("Undefined format")
+        if source is not None and header.get("stamp") != file_stamp(source):
+            raise StaleCacheError(f"{path} is not built from {source}")
+        if source_digest is not None and header.get("source") != source_digest:
+            raise StaleCacheError(f"{path} is not built from the same content")
+
+        corpus = cls.__new__(cls)
+        table = StringTable(section("string_offsets"), section("string_blob"))
+        if mmap:
+            corpus.vocab = MappedVocab(table)
+        else:
+            corpus.vocab = Vocab.__new__(Vocab)
+            corpus.vocab.__setstate__(list(table))
+        corpus.columns = {f: section("column." + f) for f in MORPH_FIELDS}
+        for name in _ARRAYS:
+            setattr(corpus, name, section(name))
+        return corpus
+
+    def __len__(self) -> int:
+        return len(self.sent_offsets) - 1
+
+    def __getitem__(self, i: int) -> Union[Sect, Doc]:
+        return self.sentence(i)
+
+    def __iter__(self) -> Iterator[Union[Sect, Doc]]:
+        for i in range(len(self)):
+            yield self.sentence(i)
+
+    def __repr__(self) -> str:
+        return f"<Corpus: {len(self)} sentences, {self.n_tokens} tokens>"
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self.chunk_offsets) - 1
+
+    @property
+    def n_tokens(self) -> int:
+        return self.chunk_offsets[-1]
+
+    def add(self, result: str, stats: Optional[ParseStats] = None) -> int:
+        """1文の解析結果を追加し、その文番号を返す
+
+        stats を指定すると、不正な行を警告せずに記録し、行の分類 (split) と
+        列への追加 (encode) の時間を加える。
+        """
+        columns = [self.columns[field] for field in MORPH_FIELDS]
+        add = self.vocab.add
+        headed = 0
+
+        chunks: Iterable[Tuple[str, List[str]]] = split_chunks(result, stats=stats)
+        if stats is not None:
+            start = perf_counter()
+            chunks = list(chunks)
+            split = perf_counter()
+
+        for header, morphs in chunks:
+            if header:
+                headed = 1
+                _, dst, score = split_header(header)
+            else:
+                dst, score = 0, 0.0
+
+            for line in morphs:
+                try:
+                    values = split_words(line)
+                except (AssertionError, ValueError):
+                    if stats is None:
+                        logger.warning("InvalidLinePattern: %r", line)
+                    else:
+                        stats.add_malformed(INVALID_MORPH, line)
+                    continue
+                for column, value in zip(columns, values):
+                    column.append(add(value))
+
+            self.dst.append(dst)
+            self.score.append(score)
+            self.chunk_offsets.append(len(columns[0]))
+
+        self.sent_offsets.append(len(self.dst))
+        self.headed.append(headed)
+        if stats is not None:
+            stats.add_time("split", split - start)
+            stats.add_time("encode", perf_counter() - split)
+        return len(self) - 1
+
+    def extend(
+        self, sentences: Iterable[str], stats: Optional[ParseStats] = None
+    ) -> None:
+        """1文毎の解析結果をまとめて追加する"""
+        for sentence in sentences:
+            self.add(sentence, stats=stats)
+
+    def merge(self, other: "Corpus") -> None:
+        """別のコーパスの文を末尾に追加する
+
+        other の文字列IDはこのコーパスの Vocab のIDに付け替える。
+        """
+        mapping = array("i", map(self.vocab.add, other.vocab.strings))
+        for field, column in self.columns.items():
+            column.extend(map(mapping.__getitem__, other.columns[field]))
+
+        n_tokens, n_chunks = self.n_tokens, self.n_chunks
+        self.chunk_offsets.extend(x + n_tokens for x in other.chunk_offsets[1:])
+        self.sent_offsets.extend(x + n_chunks for x in other.sent_offsets[1:])
+        self.dst.extend(other.dst)
+        self.score.extend(other.score)
+        self.headed.extend(other.headed)
+
+    def chunk_range(self, i: int) -> range:
+        """文 i を構成する文節番号の範囲"""
+        return range(self.sent_offsets[i], self.sent_offsets[i + 1])
+
+    def token_range(self, i: int) -> range:
+        """文 i を構成する単語番号の範囲"""
+        chunks = self.chunk_range(i)
+        return range(self.chunk_offsets[chunks.start], self.chunk_offsets[chunks.stop])
+
+    def graph(self, i: int) -> DepGraph:
+        """文 i の係り受けの索引を dst 配列から作成する"""
+        chunks = self.chunk_range(i)
+        return DepGraph(self.dst[chunks.start : chunks.stop])
+
+    def values(self, token: int) -> List[Optional[str]]:
+        """単語番号 token の各フィールドの値を MORPH_FIELDS の順に返す"""
+        strings = self.vocab.strings
+        return [strings[self.columns[field][token]] for field in MORPH_FIELDS]
+
+    def morph(self, token: int) -> Morph:
+        """単語番号 token の Morph を生成する"""
+        return Morph.from_values(self.values(token))
+
+    def result(self, i: int) -> str:
+        """文 i の解析結果の文字列を配列から再構成する
+
+        文節ヘッダーの主辞/機能語の位置は保持していないため "0/0" とする。
+        """
+        lines = []
+        start = self.sent_offsets[i]
+        for chunk in self.chunk_range(i):
+            if self.headed[i]:
+                dst, score = self.dst[chunk], self.score[chunk]
+                lines.append(f"* {chunk - start} {dst}D 0/0 {score:.6f}")
+            stop = self.chunk_offsets[chunk + 1]
+            for token in range(self.chunk_offsets[chunk], stop):
+                values = [v for v in self.values(token) if v is not None]
+                lines.append(values[0] + "\t" + ",".join(values[1:]))
+        lines.append("EOS")
+        return "\n".join(lines) + "\n"
+
+    def sentence(self, i: int) -> Union[Sect, Doc]:
+        """文 i の Sect (文節ヘッダーがなければ Doc) を生成する"""
+        if not -len(self) <= i < len(self):
+            raise IndexError("sentence index out of range")
+        i %= len(self)
+        strings = self.vocab.strings
+        columns = [self.columns[field] for field in MORPH_FIELDS]
+        offsets = self.chunk_offsets
+        start = self.sent_offsets[i]
+        chunks = []
+        # 解析結果の文字列を経由せず、配列から Morph と Chunk を直接作る
+        for chunk in self.chunk_range(i):
+            morphs = [
+                Morph.from_values([strings[column[token]] for column in columns])
+                for token in range(offsets[chunk], offsets[chunk + 1])
+            ]
+            chunks.append(
+                Chunk.from_morphs(
+                    morphs,
+                    pos=chunk - start,
+                    dst=self.dst[chunk],
+                    score=self.score[chunk],
+                )
+            )
+        cls = Sect if self.headed[i] else Doc
+        return cls.from_chunks(chunks)  # type: ignore
+
+    def mask(self, **conditions: Union[str, Iterable[str]]) -> Iterator[bool]:
+        """条件に合う単語なら True を返すイテレーターを生成する
+
+        条件はフィールド名をキーに、文字列もしくは文字列の集合を値に指定する。
+        比較は文字列IDの配列に対して map でまとめて行い、単語毎の
+        Python オブジェクトは生成しない。
+
+        Usage:
+            >>> from cucurbita.corpus import Corpus
+            >>> from cucurbita.dataset import DOC_CABOCHA
+            >>> corpus = Corpus.from_text(DOC_CABOCHA)
+            >>> list(corpus.mask(pos="名詞"))[:4]
+            [True, False, True, False]
+        """
+        masks = []
+        for field, value in conditions.items():
+            values = [value] if isinstance(value, str) or value is None else value
+            codes = frozenset(self.vocab.get(v) for v in values)
+            masks.append(map(codes.__contains__, self.columns[field]))
+
+        if not masks:
+            return iter([True] * self.n_tokens)
+        if len(masks) == 1:
+            return masks[0]
+        return map(all, zip(*masks))
+
+    def filter(self, **conditions: Union[str, Iterable[str]]) -> array:
+        """条件に合う単語の単語番号を返す
+
+        Usage:
+            >>> from cucurbita.corpus import Corpus
+            >>> from cucurbita.dataset import DOC_CABOCHA
+            >>> corpus = Corpus.from_text(DOC_CABOCHA)
+            >>> list(corpus.filter(pos="名詞", pos1="数"))
+            [15, 23, 29]
+        """
+        return array("q", compress(range(self.n_tokens), self.mask(**conditions)))
+
+    def count_by(
+        self, field: str, where: Optional[Dict[str, Union[str, Iterable[str]]]] = None
+    ) -> TypingCounter[Optional[str]]:
+        """フィールドの値毎の出現数を数える
+
+        Arguments:
+            field {str} -- 数えるフィールド名
+
+        Keyword Arguments:
+            where {Optional[Dict]} -- 数える単語の条件 (mask の引数と同じ) (default: {None})
+
+        Returns:
+            Counter[Optional[str]] -- 値毎の出現数
+
+        Usage:
+            >>> from cucurbita.corpus import Corpus
+            >>> from cucurbita.dataset import DOC_CABOCHA
+            >>> corpus = Corpus.from_text(DOC_CABOCHA)
+            >>> corpus.count_by("base", where={"pos": "名詞"}).most_common(2)
+            [('客', 2), ('隣', 1)]
+        """
+        column = self.columns[field]
+        codes = compress(column, self.mask(**where)) if where else column
+        strings = self.vocab.strings
+        return Counter({strings[code]: n for code, n in Counter(codes).items()})
+
+    def ngrams(self, n: int, field: str = "surface") -> TypingCounter[Tuple]:
+        """文をまたがない n-gram の出現数を数える
+
+        Usage:
+            >>> from cucurbita.corpus import Corpus
+            >>> from cucurbita.dataset import DOC_CABOCHA
+            >>> corpus = Corpus.from_text(DOC_CABOCHA)
+            >>> corpus.ngrams(2)[("ぴょこぴょこ", "、")]
+            1
+        """
+        column = self.columns[field]
+        codes = Counter(zip(*(column[k:] for k in range(n))))
+
+        # 文の境界をまたぐ n-gram (1文あたり高々 n-1 個) を取り除く
+        crossing = set()
+        for sent in self.sent_offsets[1:-1]:
+            start = self.chunk_offsets[sent]
+            crossing.update(range(max(start - n + 1, 0), start))
+        for i in crossing:
+            gram = tuple(column[i : i + n])
+            if len(gram) == n:
+                codes[gram] -= 1
+
+        strings = self.vocab.strings
+        return Counter(
+            {tuple(strings[c] for c in gram): k for gram, k in codes.items() if k > 0}
+        )
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """解析結果ファイルの内容のハッシュ値を返す"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_stamp(path: str) -> str:
+    """解析結果ファイルの大きさと更新時刻 (内容は読まない)"""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_corpus(
+    source: str, cache: str, mmap: bool = True, digest: bool = False
+) -> Corpus:
+    """保存済みのコーパスがあれば開き、なければ解析結果をパースして保存する
+
+    保存済みのものが元の解析結果ファイルと一致しない場合や、版が異なる・
+    壊れている場合は作り直す。一致するかは元ファイルの大きさと更新時刻で
+    判断するため、開く時間は元ファイルの大きさに依らない。
+
+    Arguments:
+        source {str} -- 解析結果ファイルのパス
+        cache {str} -- 保存先のパス
+
+    Keyword Arguments:
+        mmap {bool} -- メモリマップで開くか (default: {True})
+        digest {bool} -- 元ファイルの内容のハッシュ値も比べるか
+            (呼び出し毎に元ファイル全体を1度読む) (default: {False})
+
+    Returns:
+        Corpus -- コーパス
+
+    Usage:
+        >>> from cucurbita.corpus import load_corpus
+        >>> corpus = load_corpus("cabocha.out", "cabocha.out.cucurbita")
+    """
+    # パースの前に求めておき、パース中に元ファイルが変わったら次回作り直す
+    stamp = file_stamp(source)
+    expected = file_digest(source) if digest else None
+    if os.path.exists(cache):
+        try:
+            return Corpus.open(cache, mmap=mmap, source=source, source_digest=expected)
+        except StaleCacheError:
+            logger.info("rebuild stale cache: %s", cache)
+        except FormatError as e:
+            logger.warning("rebuild broken cache: %s (%s)", cache, e)
+
+    Corpus.from_file(source).save(
+        cache, source_digest=expected or "", source_stamp=stamp
+    )
+    return Corpus.open(cache, mmap=mmap)
@@ -0,0 +1,119 @@
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+# 不正な行の種類
+# ヘッダー行の形式に合わない "* " で始まる行
+INVALID_HEADER = "invalid_header"
+# ヘッダー行でも単語行でもない行
+UNDEFINED_LINE = "undefined_line"
+# 単語行と判定されたが分割できない行 (素性が多すぎる, タブが複数あるなど)
+INVALID_MORPH = "invalid_morph"
+
+
+class ParseStats(object):
+    """パースの件数, 不正な行, 段階毎の時間を集計する
+
+    split_chunks, Sect, Doc, Chunk, Morph, Corpus.add などに stats として
+    渡すと、不正な行を1行ずつ警告する代わりに種類毎に数え、先頭から
+    max_samples 行だけを保持する。渡さない場合は従来どおり警告する。
+    不正な行の文字列を作るのは on_malformed を指定した時だけで、行は
+    整形せずにそのまま渡す。
+
+    スレッド間で共有するとロックしないため数がずれる。スレッドや
+    プロセス毎に作り、merge でまとめる。
+
+    Keyword Arguments:
+        max_samples {int} -- 種類毎に保持する不正な行の数 (default: {10})
+        on_malformed {Optional[Callable[[str, str], Any]]} -- 不正な行毎に
+            (種類, 行) を受け取る関数 (default: {None})
+
+    Attributes:
+        sentences {int} -- 文の数
+        chunks {int} -- 文節の数
+        tokens {int} -- 単語行の数 (分割できなかった行を含む)
+        malformed {Counter} -- 種類毎の不正な行の数
+        samples {Dict[str, List[str]]} -- 種類毎の不正な行の例
+        times {Dict[str, float]} -- 段階毎の累積時間 (秒)
+            split (行の分類), chunks (Chunk, Morph の作成), text (本文の作成),
+            encode (Corpus の列への追加)
+
+    Usage:
+        >>> from cucurbita.cab import Sect
+        >>> from cucurbita.diagnostics import ParseStats
+        >>> stats = ParseStats()
+        >>> sect = Sect("* 0 -1D 0/0 0.000000\\n壊れた行\\nEOS\\n", stats=stats)
+        >>> stats.sentences, stats.malformed
+        (1, Counter({'undefined_line': 1}))
+        >>> stats.samples
+        {'undefined_line': ['壊れた行']}
+    """
+
+    def __init__(
+        self,
+        max_samples: int = 10,
+        on_malformed: Optional[Callable[[str, str], Any]] = None,
+    ) -> None:
+        self.max_samples = max_samples
+        self.on_malformed = on_malformed
+        self.sentences = self.chunks = self.tokens = 0
+        self.malformed: "Counter[str]" = Counter()
+        self.samples: Dict[str, List[str]] = {}
+        self.times: Dict[str, float] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<ParseStats: {self.sentences} sentences, {self.tokens} tokens,"
+            f" {sum(self.malformed.values())} malformed>"
+        )
+
+    def add_malformed(self, category: str, line: str) -> None:
+        """不正な行を記録する"""
+        self.malformed[category] += 1
+        samples = self.samples.setdefault(category, [])
+        if len(samples) < self.max_samples:
+            samples.append(line)
+        if self.on_malformed is not None:
+            self.on_malformed(category, line)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        self.times[stage] = self.times.get(stage, 0.0) + seconds
+
+    def merge(self, other: "ParseStats") -> None:
+        """別の集計を加える (例は max_samples まで)"""
+        self.sentences += other.sentences
+        self.chunks += other.chunks
+        self.tokens += other.tokens
+        self.malformed.update(other.malformed)
+        for category, lines in other.samples.items():
+            samples = self.samples.setdefault(category, [])
+            samples.extend(lines[: max(self.max_samples - len(samples), 0)])
+        for stage, seconds in other.times.items():
+            self.add_time(stage, seconds)
+
+    def clear(self) -> None:
+        self.sentences = self.chunks = self.tokens = 0
+        self.malformed.clear()
+        self.samples.clear()
+        self.times.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON などに書き出せる辞書を返す"""
+        return {
+            "sentences": self.sentences,
+            "chunks": self.chunks,
+            "tokens": self.tokens,
+            "malformed": dict(self.malformed),
+            "samples": {k: list(v) for k, v in self.samples.items()},
+            "times": dict(self.times),
+        }
+
+    def summary(self) -> str:
+        """ログに1度だけ出すための要約"""
+        text = f"{self.sentences} sentences, {self.chunks} chunks, {self.tokens} tokens"
+        if self.malformed:
+            counts = ", ".join(f"{k}={v}" for k, v in sorted(self.malformed.items()))
+            text += f"; malformed: {counts}"
+        if self.times:
+            times = ", ".join(f"{k}={v:.3f}s" for k, v in self.times.items())
+            text += f"; time: {times}"
+        return text
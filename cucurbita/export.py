@@ -0,0 +1,316 @@
+import importlib.util
+import json
+import os
+import sys
+from array import array
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from cucurbita.cab import MORPH_FIELDS
+from cucurbita.corpus import Corpus, Vocab
+
+# 1単語1行で書き出す列 (Morph のフィールドは文字列, それ以外は数値)
+COLUMNS = ("sentence", "chunk", "dst", "score") + MORPH_FIELDS
+_TYPECODES = {"sentence": "q", "chunk": "i", "dst": "i", "score": "d"}
+
+RowGroup = Dict[str, array]
+
+# .npy のヘッダーは書き終えてから形状を書き直すため固定長にする
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NPY_HEADER_SIZE = 128
+_NPY_DESCR = {"b": "i1", "i": "i4", "q": "i8", "d": "f8"}
+
+
+def has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _slice(values: Any, start: int, stop: int, typecode: str) -> array:
+    # array でもメモリマップした memoryview でも同じようにコピーする
+    sliced = array(typecode)
+    sliced.frombytes(memoryview(values)[start:stop].cast("B"))
+    return sliced
+
+
+def _row_group(corpus: Corpus, start: int, stop: int, base: int) -> RowGroup:
+    """コーパスの文 [start, stop) を1単語1行の列にする
+
+    文字列の列は corpus.vocab の文字列IDのまま返す。
+    """
+    chunk_start, chunk_stop = corpus.sent_offsets[start], corpus.sent_offsets[stop]
+    offsets = corpus.chunk_offsets
+    token_start, token_stop = offsets[chunk_start], offsets[chunk_stop]
+
+    group = {name: array(typecode) for name, typecode in _TYPECODES.items()}
+    for sentence in range(start, stop):
+        headed = corpus.headed[sentence]
+        first = corpus.sent_offsets[sentence]
+        for chunk in range(first, corpus.sent_offsets[sentence + 1]):
+            n = offsets[chunk + 1] - offsets[chunk]
+            group["sentence"].extend([base + sentence] * n)
+            group["chunk"].extend([chunk - first] * n)
+            # MeCab の解析結果には係り受けがないため -1 とする
+            group["dst"].extend([corpus.dst[chunk] if headed else -1] * n)
+            group["score"].extend([corpus.score[chunk]] * n)
+    for field in MORPH_FIELDS:
+        group[field] = _slice(corpus.columns[field], token_start, token_stop, "i")
+    return group
+
+
+def iter_row_groups(
+    source: Union[Corpus, Iterable[str]], row_group_size: int = 65536
+) -> Iterator[Tuple[RowGroup, Vocab]]:
+    """コーパスもしくは1文毎の解析結果を、およそ row_group_size 行ずつの列にする
+
+    解析結果の反復子を渡した場合は行グループ分の文だけを Corpus にするため、
+    全体をメモリに載せない。文が行グループをまたぐことはない。
+
+    Yields:
+        Iterator[Tuple[RowGroup, Vocab]] -- 列名毎の配列と、文字列の列の ID の文字列表
+    """
+    if isinstance(source, Corpus):
+        offsets, sent_offsets = source.chunk_offsets, source.sent_offsets
+        start = 0
+        while start < len(source):
+            # 単語数が row_group_size に達するまで文を加える
+            limit = offsets[sent_offsets[start]] + row_group_size
+            stop = start + 1
+            while stop < len(source) and offsets[sent_offsets[stop + 1]] <= limit:
+                stop += 1
+            yield _row_group(source, start, stop, 0), source.vocab
+            start = stop
+        return
+
+    base = 0
+    batch = Corpus()
+    for result in source:
+        batch.add(result)
+        if batch.n_tokens >= row_group_size:
+            yield _row_group(batch, 0, len(batch), base), batch.vocab
+            base += len(batch)
+            batch = Corpus()
+    if len(batch):
+        yield _row_group(batch, 0, len(batch), base), batch.vocab
+
+
+class NpyWriter(object):
+    """列毎の .npy ファイルに書き出す (NumPy がなくても書ける)
+
+    文字列の列は全体で共通の文字列表 (vocab.json) の ID を int32 で書く。
+    ID 0 は None を表すので、pandas では
+    ``pd.Categorical.from_codes(np.load("base.npy") - 1, vocab[1:])``
+    で欠損値を含むカテゴリ型として読める。
+
+    Arguments:
+        directory {str} -- 書き出すディレクトリ
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vocab = Vocab()
+        self.n_rows = 0
+        # 直前の行グループの文字列表と、その ID から全体の ID への対応
+        self._source: Optional[Vocab] = None
+        self._mapping = array("i")
+        self._files: Dict[str, IO[bytes]] = {}
+        for name in COLUMNS:
+            f = open(os.path.join(directory, name + ".npy"), "wb")
+            f.write(bytes(_NPY_HEADER_SIZE))
+            self._files[name] = f
+
+    def __enter__(self) -> "NpyWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:  # type: ignore
+        self.close()
+
+    def _map(self, vocab: Vocab) -> array:
+        """vocab の ID から全体の文字列表の ID への対応を返す
+
+        Corpus から書き出す場合は全ての行グループが同じ vocab を持つため、
+        対応は1度だけ作り、vocab に追加された文字列の分だけ伸ばす。
+        """
+        if vocab is not self._source:
+            self._source = vocab
+            self._mapping = array("i")
+        strings, mapping = vocab.strings, self._mapping
+        if len(mapping) < len(strings):
+            add = self.vocab.add
+            mapping.extend(add(strings[i]) for i in range(len(mapping), len(strings)))
+        return mapping
+
+    def write(self, group: RowGroup, vocab: Vocab) -> None:
+        # 行グループの文字列IDを全体の文字列表の ID に付け替える
+        mapping = self._map(vocab)
+        for name in COLUMNS:
+            values = group[name]
+            if name in MORPH_FIELDS:
+                values = array("i", map(mapping.__getitem__, values))
+            values.tofile(self._files[name])  # type: ignore
+        self.n_rows += len(group["sentence"])
+
+    def close(self) -> None:
+        """ヘッダーに行数を書き込み、文字列表を保存する"""
+        for name, f in self._files.items():
+            f.seek(0)
+            f.write(_npy_header(_TYPECODES.get(name, "i"), self.n_rows))
+            f.close()
+        self._files = {}
+        with open(
+            os.path.join(self.directory, "vocab.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(self.vocab.strings, f, ensure_ascii=False)
+
+
+def _npy_header(typecode: str, n_rows: int) -> bytes:
+    order = "<" if sys.byteorder == "little" else ">"
+    descr = order + _NPY_DESCR[typecode]
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({n_rows},), }}"
+    size = _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2
+    return (
+        _NPY_MAGIC
+        + size.to_bytes(2, "little")
+        + header.ljust(size - 1).encode("latin1")
+        + b"\n"
+    )
+
+
+def read_npy(path: str) -> array:
+    """NpyWriter で書いた .npy ファイルを array として読む"""
+    typecodes = {v: k for k, v in _NPY_DESCR.items()}
+    with open(path, "rb") as f:
+        if f.read(len(_NPY_MAGIC)) != _NPY_MAGIC:
+            raise Exception("Undefined format")
+        size = int.from_bytes(f.read(2), "little")
+        header = f.read(size).decode("latin1")
+        descr = header.split("'descr': '")[1][:3]
+        values = array(typecodes[descr[1:]])
+        values.frombytes(f.read())
+    if (descr[0] == "<") != (sys.byteorder == "little"):
+        values.byteswap()
+    return values
+
+
+class ArrowWriter(object):
+    """Parquet もしくは Arrow IPC ファイルに行グループ毎に書き出す (pyarrow が必要)
+
+    Arguments:
+        path {str} -- 書き出すファイルのパス
+
+    Keyword Arguments:
+        format {str} -- "parquet" もしくは "arrow" (default: {"parquet"})
+    """
+
+    def __init__(self, path: str, format: str = "parquet") -> None:
+        import pyarrow as pa
+
+        self.pa = pa
+        self.n_rows = 0
+        # 直前の行グループの文字列表と、それから作った pyarrow の配列
+        self._source: Optional[Vocab] = None
+        self._dictionary: Any = None
+        numeric = {"q": pa.int64(), "i": pa.int32(), "d": pa.float64()}
+        self.schema = pa.schema(
+            [(name, numeric[code]) for name, code in _TYPECODES.items()]
+            + [(field, pa.string()) for field in MORPH_FIELDS]
+        )
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(path, self.schema)
+        elif format == "arrow":
+            self._writer = pa.ipc.new_file(path, self.schema)
+        else:
+            raise Exception(f"Undefined format: {format}")
+
+    def __enter__(self) -> "ArrowWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:  # type: ignore
+        self.close()
+
+    def _dictionary_of(self, vocab: Vocab) -> Any:
+        """vocab の文字列を ID の順に並べた配列 (同じ vocab なら作り直さない)"""
+        strings = vocab.strings
+        if vocab is not self._source or len(self._dictionary) != len(strings):
+            self._source = vocab
+            self._dictionary = self.pa.array(list(strings), type=self.pa.string())
+        return self._dictionary
+
+    def write(self, group: RowGroup, vocab: Vocab) -> None:
+        pa = self.pa
+        # 行グループ内の文字列表から ID で値を引く (ID 0 の None は null になる)
+        dictionary = self._dictionary_of(vocab)
+        arrays = []
+        for field in self.schema:
+            values = group[field.name]
+            if field.name in MORPH_FIELDS:
+                arrays.append(dictionary.take(pa.array(values, type=pa.int32())))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        table = pa.Table.from_arrays(arrays, schema=self.schema)
+        self._writer.write_table(table)
+        self.n_rows += table.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def export(
+    source: Union[Corpus, Iterable[str]],
+    path: str,
+    format: Optional[str] = None,
+    row_group_size: int = 65536,
+) -> int:
+    """コーパスを1単語1行の列指向形式で書き出す
+
+    列は sentence (文番号), chunk (文内の文節番号), dst, score と
+    MORPH_FIELDS の各フィールド。行グループ毎に書き出すため、解析結果の
+    反復子を渡せば全体をメモリに載せずに済む。
+
+    Arguments:
+        source {Union[Corpus, Iterable[str]]} -- コーパスもしくは1文毎の解析結果
+        path {str} -- 書き出し先 ("npy" ではディレクトリ)
+
+    Keyword Arguments:
+        format {Optional[str]} -- "parquet", "arrow", "npy" のいずれか
+            (default: {None} pyarrow があれば "parquet", なければ "npy")
+        row_group_size {int} -- 行グループの行数の目安 (default: {65536})
+
+    Returns:
+        int -- 書き出した行数
+
+    Usage:
+        >>> from cucurbita.export import export
+        >>> from cucurbita.io import iter_sentences
+        >>> export(iter_sentences("cabocha.out.gz"), "tokens.parquet")
+        >>> import pandas as pd
+        >>> df = pd.read_parquet("tokens.parquet")
+    """
+    if format is None:
+        format = "parquet" if has_pyarrow() else "npy"
+    if format not in ("parquet", "arrow", "npy"):
+        raise Exception(f"Undefined format: {format}")
+    writer: Union[NpyWriter, ArrowWriter]
+    if format == "npy":
+        writer = NpyWriter(path)
+    else:
+        writer = ArrowWriter(path, format=format)
+    with writer:
+        for group, vocab in iter_row_groups(source, row_group_size=row_group_size):
+            writer.write(group, vocab)
+    return writer.n_rows
+
+
+def load_npy(directory: str) -> Dict[str, List[Any]]:
+    """NpyWriter で書いたディレクトリを列名毎のリストとして読む (文字列は復号する)"""
+    with open(os.path.join(directory, "vocab.json"), encoding="utf-8") as f:
+        strings = json.load(f)
+    columns: Dict[str, List[Any]] = {}
+    for name in COLUMNS:
+        values = read_npy(os.path.join(directory, name + ".npy"))
+        if name in MORPH_FIELDS:
+            columns[name] = [strings[code] for code in values]
+        else:
+            columns[name] = values.tolist()
+    return columns
@@ -0,0 +1,286 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from cucurbita.binfile import (
+    FormatError,
+    StringTable,
+    encode_strings,
+    read_sections,
+    write_sections,
+)
+from cucurbita.corpus import Corpus
+
+MAGIC = b"CUCINDEX"
+FORMAT_VERSION = 1
+
+Term = Tuple[str, str]
+Posting = Tuple[int, int]
+
+# 索引のキーはフィールド名と値をこの文字でつないだもの
+_SEPARATOR = "\x1f"
+
+
+def encode_varint(values: Iterable[int], out: bytearray) -> None:
+    """非負整数を7ビットずつの可変長バイト列にして out に追加する"""
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def decode_varint(data: Sequence[int]) -> List[int]:
+    """encode_varint で符号化したバイト列を整数のリストに戻す"""
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def encode_postings(postings: Sequence[int]) -> bytearray:
+    """(文番号, 単語位置) を平坦に並べた昇順の配列を差分の可変長符号にする
+
+    文番号は直前との差分を、単語位置は同じ文の中なら直前との差分を、
+    文が変わったらそのままの値を書く。
+    """
+    out = bytearray()
+    values = []
+    last_sentence = last_offset = 0
+    for k in range(0, len(postings), 2):
+        sentence, offset = postings[k], postings[k + 1]
+        if sentence != last_sentence:
+            last_offset = 0
+        values.append(sentence - last_sentence)
+        values.append(offset - last_offset)
+        last_sentence, last_offset = sentence, offset
+    encode_varint(values, out)
+    return out
+
+
+def decode_postings(data: Sequence[int]) -> List[Posting]:
+    """encode_postings で符号化したバイト列を (文番号, 単語位置) のリストに戻す"""
+    values = decode_varint(data)
+    postings = []
+    sentence = offset = 0
+    for k in range(0, len(values), 2):
+        if values[k]:
+            sentence += values[k]
+            offset = 0
+        offset += values[k + 1]
+        postings.append((sentence, offset))
+    return postings
+
+
+class InvertedIndex(object):
+    """(フィールド, 値) から出現位置 (文番号, 文内の単語位置) への転置索引
+
+    build で作成してファイルに保存し、open でメモリマップして開く。
+    キーは昇順に並べて保存するため、検索はキーの二分探索と該当する
+    出現位置の復号だけで済み、コーパスの大きさには依存しない。
+
+    Usage:
+        >>> from cucurbita.corpus import Corpus
+        >>> from cucurbita.dataset import DOC_CABOCHA
+        >>> from cucurbita.index import InvertedIndex
+        >>> InvertedIndex.build(Corpus.from_text(DOC_CABOCHA), "corpus.idx")
+        >>> index = InvertedIndex.open("corpus.idx")
+        >>> index.postings("base", "客")
+        [(0, 2), (0, 7)]
+        >>> index.all_of(("pos", "名詞"), ("pos", "副詞"))
+        [0, 2]
+        >>> index.phrase([("surface", "柿"), ("pos", "動詞")])
+        [(0, 5)]
+    """
+
+    def __init__(
+        self,
+        keys: StringTable,
+        postings_offsets: Sequence[int],
+        postings_blob: Sequence[int],
+        fields: Sequence[str],
+        n_sentences: int,
+    ) -> None:
+        self.keys = keys
+        self.postings_offsets = postings_offsets
+        self.postings_blob = postings_blob
+        self.fields = tuple(fields)
+        self.n_sentences = n_sentences
+
+    def __len__(self) -> int:
+        # キーの ID 0 は None
+        return len(self.keys) - 1
+
+    def __repr__(self) -> str:
+        return f"<InvertedIndex: {len(self)} terms, {self.n_sentences} sentences>"
+
+    @staticmethod
+    def collect(
+        corpus: Corpus, fields: Sequence[str], base: int = 0
+    ) -> Dict[Term, array]:
+        """コーパスを一度走査して (フィールド, 値) 毎の出現位置を集める
+
+        Keyword Arguments:
+            base {int} -- 文番号に加える値 (default: {0})
+        """
+        strings = corpus.vocab.strings
+        by_code: Dict[Tuple[str, int], array] = {}
+        for sentence in range(len(corpus)):
+            tokens = corpus.token_range(sentence)
+            for field in fields:
+                column = corpus.columns[field]
+                for offset, token in enumerate(tokens):
+                    key = (field, column[token])
+                    postings = by_code.get(key)
+                    if postings is None:
+                        postings = by_code[key] = array("q")
+                    postings.append(base + sentence)
+                    postings.append(offset)
+        return {
+            (field, strings[code]): postings
+            for (field, code), postings in by_code.items()
+            if code != 0
+        }
+
+    @classmethod
+    def build(
+        cls,
+        corpus: Corpus,
+        path: str,
+        fields: Sequence[str] = ("surface", "base", "pos"),
+    ) -> None:
+        """コーパスから転置索引を作成して path に保存する
+
+        Arguments:
+            corpus {Corpus} -- 索引を作るコーパス
+            path {str} -- 保存先のパス
+
+        Keyword Arguments:
+            fields {Sequence[str]} -- 索引を作るフィールド (default: {surface, base, pos})
+        """
+        cls.write(path, cls.collect(corpus, fields), fields, len(corpus))
+
+    @staticmethod
+    def write(
+        path: str,
+        postings: Dict[Term, array],
+        fields: Sequence[str],
+        n_sentences: int,
+    ) -> None:
+        """(フィールド, 値) 毎の出現位置を転置索引のファイルに書き込む"""
+        encoded = sorted(
+            ((field + _SEPARATOR + value).encode(), values)
+            for (field, value), values in postings.items()
+        )
+        key_offsets, key_blob = encode_strings(
+            [None] + [key.decode() for key, _ in encoded]
+        )
+        blob = bytearray()
+        offsets = array("q", [0])
+        for _, values in encoded:
+            blob += encode_postings(values)
+            offsets.append(len(blob))
+
+        header = {
+            "version": FORMAT_VERSION,
+            "fields": list(fields),
+            "n_sentences": n_sentences,
+        }
+        sections = [
+            ("key_offsets", key_offsets),
+            ("key_blob", key_blob),
+            ("postings_offsets", offsets),
+            ("postings_blob", bytes(blob)),
+        ]
+        write_sections(path, MAGIC, header, sections)
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True) -> "InvertedIndex":
+        """build で保存した転置索引を開く"""
+        header, section = read_sections(path, MAGIC, mmap=mmap)
+        if header.get("version") != FORMAT_VERSION:
+            raise FormatError("Undefined format")
+        return cls(
+            StringTable(section("key_offsets"), section("key_blob")),
+            section("postings_offsets"),
+            section("postings_blob"),
+            header["fields"],
+            header["n_sentences"],
+        )
+
+    def find(self, field: str, value: str) -> int:
+        """キーの番号を二分探索で求める (なければ -1)"""
+        target = (field + _SEPARATOR + value).encode()
+        # ID 0 は None のため 1 から探す
+        low, high = 1, len(self.keys)
+        while low < high:
+            middle = (low + high) // 2
+            if self.keys.encoded(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.keys) and self.keys.encoded(low) == target:
+            return low - 1
+        return -1
+
+    def postings(self, field: str, value: str) -> List[Posting]:
+        """(フィールド, 値) の出現位置 (文番号, 文内の単語位置) を昇順に返す"""
+        k = self.find(field, value)
+        if k == -1:
+            return []
+        start, end = self.postings_offsets[k], self.postings_offsets[k + 1]
+        return decode_postings(self.postings_blob[start:end])
+
+    def sentences(self, field: str, value: str) -> List[int]:
+        """(フィールド, 値) を含む文番号を昇順に返す"""
+        return sorted({sentence for sentence, _ in self.postings(field, value)})
+
+    def all_of(self, *terms: Term) -> List[int]:
+        """全ての (フィールド, 値) を含む文番号 (AND検索)"""
+        result: Optional[Set[int]] = None
+        for field, value in terms:
+            found = set(self.sentences(field, value))
+            result = found if result is None else result & found
+            if not result:
+                return []
+        return sorted(result or ())
+
+    def any_of(self, *terms: Term) -> List[int]:
+        """いずれかの (フィールド, 値) を含む文番号 (OR検索)"""
+        result: Set[int] = set()
+        for field, value in terms:
+            result.update(self.sentences(field, value))
+        return sorted(result)
+
+    def phrase(self, terms: Sequence[Term]) -> List[Posting]:
+        """連続する単語の並びに一致する箇所の (文番号, 先頭の単語位置) を返す"""
+        result: Optional[Set[Posting]] = None
+        for k, (field, value) in enumerate(terms):
+            found = {(s, offset - k) for s, offset in self.postings(field, value)}
+            result = found if result is None else result & found
+            if not result:
+                return []
+        return sorted(result or ())
+
+    def candidates(self, terms: List[Set[Term]]) -> List[int]:
+        """全ての候補集合についていずれかの値を含む文番号を昇順に返す
+
+        query.TermIndex と同じく Query.search_corpus の絞り込みに使える。
+        索引を作っていないフィールドの条件は絞り込みに使わない。
+        """
+        result: Optional[Set[int]] = None
+        for group in terms:
+            if any(field not in self.fields for field, _ in group):
+                continue
+            found = set(self.any_of(*group))
+            result = found if result is None else result & found
+            if not result:
+                return []
+        if result is None:
+            return list(range(self.n_sentences))
+        return sorted(result)
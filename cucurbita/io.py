@@ -0,0 +1,302 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from typing import IO, Any, Iterable, Iterator, Optional, Sequence, Union
+
+from cucurbita.cab import Doc, Sect
+
+# 圧縮形式の判定に用いるマジックナンバー
+_MAGIC = (
+    (b"\x1f\x8b", lambda raw: gzip.GzipFile(fileobj=raw)),
+    (b"BZh", bz2.BZ2File),
+    (b"\xfd7zXZ\x00", lzma.LZMAFile),
+)
+_MAGIC_SIZE = max(len(magic) for magic, _ in _MAGIC)
+
+Source = Union[str, IO[Any]]
+
+
+def _decompress(raw: IO[bytes]) -> IO[bytes]:
+    """先頭バイトから圧縮形式を判定し、必要なら展開ストリームで包む"""
+    if not hasattr(raw, "peek"):
+        raw = io.BufferedReader(raw)  # type: ignore
+    head = raw.peek(_MAGIC_SIZE)[:_MAGIC_SIZE]  # type: ignore
+    for magic, opener in _MAGIC:
+        if head.startswith(magic):
+            return opener(raw)  # type: ignore
+    return raw
+
+
+@contextmanager
+def open_analysis(source: Source, encoding: str = "utf-8") -> Iterator[IO[str]]:
+    """CaboCha(MeCab)解析結果を行単位で読めるテキストストリームとして開く
+
+    gzip, bz2, xz で圧縮されたファイルはマジックナンバーから判定して展開する。
+    自身で開いたストリームのみを閉じ、呼び出し側から渡されたストリームは閉じない。
+
+    Arguments:
+        source {Source} -- ファイルパス, "-"(標準入力) もしくはファイルオブジェクト
+
+    Keyword Arguments:
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Yields:
+        Iterator[IO[str]] -- テキストストリーム
+    """
+    if isinstance(source, str):
+        if source == "-":
+            stream = _decompress(sys.stdin.buffer)
+            text = io.TextIOWrapper(stream, encoding=encoding)  # type: ignore
+            try:
+                yield text
+            finally:
+                # 標準入力そのものは閉じない
+                text.detach()
+            return
+
+        with open(source, "rb") as raw:
+            stream = _decompress(raw)
+            with io.TextIOWrapper(stream, encoding=encoding) as text:  # type: ignore
+                yield text
+        return
+
+    if isinstance(source, io.TextIOBase):
+        yield source  # type: ignore
+        return
+
+    text = io.TextIOWrapper(_decompress(source), encoding=encoding)  # type: ignore
+    try:
+        yield text
+    finally:
+        text.detach()
+
+
+def iter_sentences(
+    source: Source, eos: str = "EOS", encoding: str = "utf-8"
+) -> Iterator[str]:
+    """解析結果を一行ずつ読み込み、終了文字毎に1文を返す
+
+    split_sentences と異なり全文をメモリに載せないため、巨大なファイルや
+    パイプからの入力でも一定のメモリで処理できる。
+
+    Arguments:
+        source {Source} -- ファイルパス, "-"(標準入力) もしくはファイルオブジェクト
+
+    Keyword Arguments:
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Yields:
+        Iterator[str] -- 終了文字を含む1文の解析結果
+
+    Usage:
+        >>> import io
+        >>> from cucurbita.io import iter_sentences
+        >>> f = io.StringIO("隣\\t名詞,一般,*,*,*,*,隣,トナリ,トナリ\\nEOS\\n")
+        >>> list(iter_sentences(f))
+        ['隣\\t名詞,一般,*,*,*,*,隣,トナリ,トナリ\\nEOS\\n']
+    """
+    with open_analysis(source, encoding=encoding) as stream:
+        lines = []
+        for line in stream:
+            lines.append(line)
+            if line.rstrip("\r\n") == eos:
+                yield "".join(lines)
+                lines = []
+
+        # 終了文字のない末尾は空行でなければ1文として扱う
+        if any(line.strip() for line in lines):
+            yield "".join(lines)
+
+
+def iter_sects(
+    source: Source, eos: str = "EOS", encoding: str = "utf-8"
+) -> Iterator[Sect]:
+    """CaboCha解析結果から1文ずつSectオブジェクトを生成する
+
+    Arguments:
+        source {Source} -- ファイルパス, "-"(標準入力) もしくはファイルオブジェクト
+
+    Keyword Arguments:
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Yields:
+        Iterator[Sect] -- 1文毎のSectオブジェクト
+
+    Usage:
+        $ cabocha -f1 < input.txt | python -c "
+        from cucurbita.io import iter_sects
+        for sect in iter_sects('-'):
+            print(sect)
+        "
+    """
+    for sentence in iter_sentences(source, eos=eos, encoding=encoding):
+        yield Sect(sentence)
+
+
+def iter_docs(
+    source: Source, eos: str = "EOS", encoding: str = "utf-8"
+) -> Iterator[Doc]:
+    """MeCab解析結果から1文ずつDocオブジェクトを生成する
+
+    Arguments:
+        source {Source} -- ファイルパス, "-"(標準入力) もしくはファイルオブジェクト
+
+    Keyword Arguments:
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Yields:
+        Iterator[Doc] -- 1文毎のDocオブジェクト
+    """
+    for sentence in iter_sentences(source, eos=eos, encoding=encoding):
+        yield Doc(sentence)
+
+
+class SentenceIndex(object):
+    """解析結果ファイル中の各文の開始位置を保持し、任意の文を読み込む
+
+    索引はファイル名に ".idx" を付けたファイルに保存し、次回以降は
+    メモリマップで開く。元ファイルの大きさと更新時刻、終了文字が保存時と
+    異なる場合や、索引ファイルが途中で切れている場合は索引を作り直す。
+    シークが必要なため圧縮ファイルには対応しない。
+
+    Arguments:
+        path {str} -- 解析結果ファイルのパス
+
+    Keyword Arguments:
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+        index_path {Optional[str]} -- 索引ファイルのパス (default: {None} path + ".idx")
+
+    Usage:
+        >>> from cucurbita.io import SentenceIndex
+        >>> with SentenceIndex("cabocha.out") as index:
+        ...     sect = index.sect(5000000)
+    """
+
+    MAGIC = b"CUCIDX02"
+
+    def __init__(
+        self,
+        path: str,
+        eos: str = "EOS",
+        encoding: str = "utf-8",
+        index_path: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.eos = eos
+        self.encoding = encoding
+        self.index_path = index_path or path + ".idx"
+        self.offsets = self._load() or self._build()
+        self._file = open(path, "rb")
+
+    def __enter__(self) -> "SentenceIndex":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.read(i)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _header(self) -> bytes:
+        """索引ファイルの先頭: MAGIC, 元ファイルの大きさと更新時刻, 終了文字
+
+        終了文字の後ろは開始位置の配列が8バイト境界から始まるように埋める。
+        """
+        stat = os.stat(self.path)
+        eos = self.eos.encode(self.encoding)
+        header = self.MAGIC + struct.pack(
+            "<qqq", stat.st_size, stat.st_mtime_ns, len(eos)
+        )
+        header += eos
+        return header + bytes(-len(header) % 8)
+
+    def _load(self) -> Optional[Sequence[int]]:
+        """保存済みの索引が元ファイルと対応していればメモリマップで開く
+
+        索引ファイルが空・途中で切れている・元ファイルと対応しない場合は
+        None を返して作り直させる。
+        """
+        if not os.path.exists(self.index_path):
+            return None
+        header = self._header()
+        with open(self.index_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # 開始位置は少なくとも先頭の 0 を持つ
+            if size < len(header) + 8 or (size - len(header)) % 8:
+                return None
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[: len(header)] != header:
+            return None
+        offsets: Sequence[int] = memoryview(buffer)[len(header) :].cast("q")
+        if sys.byteorder != "little":
+            swapped = array("q", offsets)
+            swapped.byteswap()
+            offsets = swapped
+        # 最後の開始位置は元ファイルの大きさになる
+        if offsets[0] != 0 or offsets[-1] != os.stat(self.path).st_size:
+            return None
+        return offsets
+
+    def _build(self) -> Sequence[int]:
+        """ファイルを一度走査して各文の開始位置を求め、索引ファイルに保存する"""
+        eos = self.eos.encode(self.encoding)
+        offsets = array("q", [0])
+        position = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                position += len(line)
+                if line.rstrip(b"\r\n") == eos:
+                    offsets.append(position)
+        if offsets[-1] != position:
+            # 終了文字のない末尾も1文として扱う
+            offsets.append(position)
+
+        stored = array("q", offsets)
+        if sys.byteorder != "little":
+            stored.byteswap()
+        # 書き込み途中の索引ファイルを残さないよう、書き終えてから置き換える
+        temporary = self.index_path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(self._header())
+            stored.tofile(f)
+        os.replace(temporary, self.index_path)
+        return offsets
+
+    def read(self, i: int) -> str:
+        """i 番目の文の解析結果を読み込む"""
+        if not -len(self) <= i < len(self):
+            raise IndexError("sentence index out of range")
+        i %= len(self)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        self._file.seek(start)
+        return self._file.read(end - start).decode(self.encoding)
+
+    def sect(self, i: int) -> Sect:
+        """i 番目の文を Sect として読み込む"""
+        return Sect(self.read(i))
+
+    def doc(self, i: int) -> Doc:
+        """i 番目の文を Doc として読み込む"""
+        return Doc(self.read(i))
+
+    def sects(self, ids: Iterable[int]) -> Iterator[Sect]:
+        """指定した文を順に Sect として読み込む"""
+        for i in ids:
+            yield self.sect(i)
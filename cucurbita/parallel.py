@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from cucurbita.corpus import Corpus
+
+Range = Tuple[int, int]
+
+
+def split_ranges(path: str, n_ranges: int, eos: bytes = b"EOS") -> List[Range]:
+    """ファイルを終了文字の行の直後で区切り、おおよそ等しい大きさのバイト範囲に分割する
+
+    Arguments:
+        path {str} -- 解析結果ファイルのパス (非圧縮)
+        n_ranges {int} -- 分割数の目安
+
+    Keyword Arguments:
+        eos {bytes} -- 終了文字 (default: {b"EOS"})
+
+    Returns:
+        List[Range] -- (開始位置, 終了位置) のリスト (空の範囲は含まない)
+    """
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for k in range(1, n_ranges):
+            target = max(size * k // n_ranges, bounds[-1])
+            # 行の途中から読み始めた場合に備えて、直前の文字から行末まで読み飛ばす
+            f.seek(max(target - 1, 0))
+            if target > 0:
+                f.readline()
+            for line in iter(f.readline, b""):
+                if line.rstrip(b"\r\n") == eos:
+                    break
+            bounds.append(f.tell())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def parse_range(path: str, start: int, end: int, encoding: str = "utf-8") -> Corpus:
+    """ファイルのバイト範囲 [start, end) をパースしてコーパスを作成する"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    return Corpus.from_text(text)
+
+
+def _parse_range(args: Tuple[str, int, int, str]) -> Corpus:
+    return parse_range(*args)
+
+
+def parse_corpus(
+    path: str,
+    workers: Optional[int] = None,
+    ranges_per_worker: int = 4,
+    encoding: str = "utf-8",
+) -> Corpus:
+    """解析結果ファイルを複数プロセスでパースし、1つのコーパスにまとめる
+
+    ファイルを終了文字の位置でバイト範囲に分割し、ProcessPoolExecutor で
+    範囲毎に Corpus を作成する。プロセス間では文字列表と整数配列だけを
+    送り、結果はファイル内の順序どおりに結合する。
+
+    Arguments:
+        path {str} -- 解析結果ファイルのパス (シークが必要なため非圧縮のもの)
+
+    Keyword Arguments:
+        workers {Optional[int]} -- プロセス数 (default: {None} CPU数)
+        ranges_per_worker {int} -- 1プロセスあたりの分割数 (default: {4})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Returns:
+        Corpus -- ファイル全体のコーパス
+
+    Usage:
+        >>> from cucurbita.parallel import parse_corpus
+        >>> corpus = parse_corpus("cabocha.out", workers=4)
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(path, workers * ranges_per_worker)
+    tasks = [(path, start, end, encoding) for start, end in ranges]
+
+    corpus = Corpus()
+    if workers == 1:
+        for task in tasks:
+            corpus.merge(_parse_range(task))
+        return corpus
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(_parse_range, tasks):
+            corpus.merge(part)
+    return corpus
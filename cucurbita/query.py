@@ -0,0 +1,270 @@
+from array import array
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from cucurbita.cab import MORPH_FIELDS, Cab, Chunk, Morph, Sect
+from cucurbita.corpus import Corpus
+
+Values = Union[str, Iterable[str]]
+Term = Tuple[str, str]
+
+
+class Match(NamedTuple):
+    """パターンに一致した箇所
+
+    Attributes:
+        sentence {int} -- 文番号
+        src {int} -- かかり元(もしくは単独の文節パターンに一致した)文節番号 (文内での番号)
+        dst {int} -- かかり先の文節番号 (単独の文節パターンの場合は -1)
+    """
+
+    sentence: int
+    src: int
+    dst: int
+
+
+class MorphPattern(object):
+    """単語の条件
+
+    フィールド名をキーに、文字列もしくは文字列の集合を値に指定する。
+
+    Usage:
+        >>> from cucurbita.query import MorphPattern
+        >>> MorphPattern(pos="名詞", pos1=["一般", "固有名詞"])
+        <MorphPattern: pos=['名詞'] pos1=['一般', '固有名詞']>
+    """
+
+    def __init__(self, **conditions: Values) -> None:
+        for field in conditions:
+            if field not in MORPH_FIELDS:
+                raise Exception(f"Undefined field: {field}")
+        self.conditions: Dict[str, FrozenSet[str]] = {
+            field: frozenset([value] if isinstance(value, str) else value)
+            for field, value in conditions.items()
+        }
+
+    def __repr__(self) -> str:
+        conditions = " ".join(
+            f"{field}={sorted(values)}" for field, values in self.conditions.items()
+        )
+        return f"<MorphPattern: {conditions}>"
+
+    def match(self, morph: Morph) -> bool:
+        return all(
+            getattr(morph, field) in values for field, values in self.conditions.items()
+        )
+
+    def compile(self, corpus: Corpus) -> Optional[Callable[[int], bool]]:
+        """コーパスの文字列IDで単語番号を判定する関数を返す
+
+        コーパスに現れない値しか持たない条件があれば None を返す。
+        """
+        tests = []
+        for field, values in self.conditions.items():
+            codes = frozenset(corpus.vocab.get(v) for v in values) - {-1}
+            if not codes:
+                return None
+            tests.append((corpus.columns[field], codes))
+        return lambda token: all(column[token] in codes for column, codes in tests)
+
+
+class ChunkPattern(object):
+    """文節の条件
+
+    指定した全ての MorphPattern について、一致する単語を含む文節に一致する。
+
+    Arguments:
+        *morphs {MorphPattern} -- 文節が含むべき単語の条件
+
+    Usage:
+        >>> from cucurbita.query import ChunkPattern, MorphPattern
+        >>> ChunkPattern(MorphPattern(pos="名詞"), MorphPattern(surface="が"))
+        <ChunkPattern: 2 morphs>
+    """
+
+    def __init__(self, *morphs: MorphPattern) -> None:
+        self.morphs = morphs
+
+    def __repr__(self) -> str:
+        return f"<ChunkPattern: {len(self.morphs)} morphs>"
+
+    def match(self, chunk: Chunk) -> bool:
+        return all(any(p.match(m) for m in chunk.morphs) for p in self.morphs)
+
+    def compile(self, corpus: Corpus) -> Optional[Callable[[int], bool]]:
+        """コーパスの文節番号を判定する関数を返す (一致しえない場合は None)"""
+        tests = [p.compile(corpus) for p in self.morphs]
+        if any(test is None for test in tests):
+            return None
+        offsets = corpus.chunk_offsets
+
+        def match(chunk: int) -> bool:
+            tokens = range(offsets[chunk], offsets[chunk + 1])
+            return all(any(map(test, tokens)) for test in tests)  # type: ignore
+
+        return match
+
+    def terms(self) -> List[Set[Term]]:
+        """一致する文が必ず含む (フィールド, 値) の候補の集合のリスト"""
+        return [
+            {(field, value) for value in values}
+            for p in self.morphs
+            for field, values in p.conditions.items()
+        ]
+
+
+class Query(object):
+    """係り受けのパターン
+
+    src だけを指定すると src に一致する文節を、dst も指定すると
+    src に一致する文節が dst に一致する文節にかかる箇所を探す。
+    パターンに含まれる値を持たない文は、パースや照合の前に読み飛ばす。
+
+    Arguments:
+        src {ChunkPattern} -- (かかり元の) 文節の条件
+
+    Keyword Arguments:
+        dst {Optional[ChunkPattern]} -- かかり先の文節の条件 (default: {None})
+
+    Usage:
+        >>> from cucurbita.corpus import Corpus
+        >>> from cucurbita.dataset import DOC_CABOCHA
+        >>> from cucurbita.query import ChunkPattern, MorphPattern, Query
+        >>> query = Query(
+        ...     ChunkPattern(MorphPattern(pos="名詞"), MorphPattern(surface="が")),
+        ...     dst=ChunkPattern(MorphPattern(pos="動詞")),
+        ... )
+        >>> list(query.search_corpus(Corpus.from_text(DOC_CABOCHA)))
+        [Match(sentence=1, src=1, dst=3)]
+    """
+
+    def __init__(self, src: ChunkPattern, dst: Optional[ChunkPattern] = None) -> None:
+        self.src = src
+        self.dst = dst
+        self.terms = src.terms() + (dst.terms() if dst else [])
+
+    def __repr__(self) -> str:
+        return f"<Query: {self.src} -> {self.dst}>"
+
+    def match(self, sect: Sect, sentence: int = 0) -> List[Match]:
+        """Sect の中で一致する箇所を返す"""
+        chunks = sect.chunks
+        matches = []
+        for i, chunk in enumerate(chunks):
+            if self.dst is None:
+                if self.src.match(chunk):
+                    matches.append(Match(sentence, i, -1))
+            elif 0 <= chunk.dst < len(chunks):
+                if self.src.match(chunk) and self.dst.match(chunks[chunk.dst]):
+                    matches.append(Match(sentence, i, chunk.dst))
+        return matches
+
+    def may_match(self, result: str) -> bool:
+        """解析結果の文字列にパターンの値が現れるかを、パースせずに判定する"""
+        return all(any(value in result for _, value in terms) for terms in self.terms)
+
+    def search(self, results: Iterable[str], cls: Type[Cab] = Sect) -> Iterator[Match]:
+        """1文毎の解析結果から一致する箇所を探す
+
+        パターンの値が文字列として現れない文はパースしない。
+        """
+        for sentence, result in enumerate(results):
+            if self.may_match(result):
+                yield from self.match(cls(result), sentence)  # type: ignore
+
+    def search_corpus(
+        self, corpus: Corpus, index: Optional["TermIndex"] = None
+    ) -> Iterator[Match]:
+        """コーパスの整数配列を直接照合して一致する箇所を探す
+
+        Keyword Arguments:
+            index {Optional[TermIndex]} -- 候補の文を絞り込む索引 (default: {None})
+        """
+        src = self.src.compile(corpus)
+        dst = self.dst.compile(corpus) if self.dst else None
+        if src is None or (self.dst and dst is None):
+            return
+
+        if index is not None:
+            candidates: Iterable[int] = index.candidates(self.terms)
+        else:
+            candidates = range(len(corpus))
+
+        offsets, dsts = corpus.sent_offsets, corpus.dst
+        for sentence in candidates:
+            start, stop = offsets[sentence], offsets[sentence + 1]
+            for chunk in range(start, stop):
+                if dst is None:
+                    if src(chunk):
+                        yield Match(sentence, chunk - start, -1)
+                    continue
+                head = dsts[chunk]
+                if 0 <= head < stop - start and src(chunk) and dst(start + head):
+                    yield Match(sentence, chunk - start, head)
+
+
+class TermIndex(object):
+    """(フィールド, 値) から、それを含む文番号の昇順の配列への索引
+
+    Arguments:
+        corpus {Corpus} -- 索引を作るコーパス
+
+    Keyword Arguments:
+        fields {Sequence[str]} -- 索引を作るフィールド (default: {surface, base, pos})
+    """
+
+    def __init__(
+        self, corpus: Corpus, fields: Sequence[str] = ("surface", "base", "pos")
+    ) -> None:
+        self.fields = tuple(fields)
+        self.n_sentences = len(corpus)
+        self.postings: Dict[Term, array] = {}
+
+        strings = corpus.vocab.strings
+        for sentence in range(len(corpus)):
+            tokens = corpus.token_range(sentence)
+            for field in self.fields:
+                column = corpus.columns[field]
+                for code in set(column[tokens.start : tokens.stop]):
+                    term = (field, strings[code])
+                    postings = self.postings.get(term)
+                    if postings is None:
+                        postings = self.postings[term] = array("i")
+                    postings.append(sentence)
+
+    def lookup(self, terms: Iterable[Term]) -> Set[int]:
+        """いずれかの (フィールド, 値) を含む文番号"""
+        sentences: Set[int] = set()
+        for term in terms:
+            sentences.update(self.postings.get(term, ()))
+        return sentences
+
+    def candidates(self, terms: List[Set[Term]]) -> List[int]:
+        """全ての候補集合についていずれかの値を含む文番号を昇順に返す
+
+        索引を作っていないフィールドの条件は絞り込みに使わない。
+        """
+        result: Optional[Set[int]] = None
+        for group in terms:
+            if any(field not in self.fields for field, _ in group):
+                continue
+            found = self.lookup(group)
+            result = found if result is None else result & found
+            if not result:
+                return []
+        if result is None:
+            return list(range(self.n_sentences))
+        return sorted(result)
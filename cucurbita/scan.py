@@ -0,0 +1,366 @@
+import mmap
+import re
+from typing import Any, Iterator, List, Optional, Pattern, Tuple, Union
+
+from cucurbita.cab import MORPH_FIELDS, Morph
+from cucurbita.diagnostics import INVALID_HEADER, UNDEFINED_LINE, ParseStats
+from cucurbita.util import split_words
+
+# find を持つバイト列 (memoryview は元のオブジェクトに戻して使う)
+ByteBuffer = Union[bytes, bytearray, mmap.mmap]
+
+# ヘッダー行 (PATTERN_HEADER のバイト列版, 改行の直前まで)
+HEADER = re.compile(rb"^\* (\d+) (-1|\d+)D \d+/\d+ (-?\d+\.\d+)\r?$", re.MULTILINE)
+
+_NON_SPACE = re.compile(rb"\S")
+
+
+def _unwrap(buffer: Union[ByteBuffer, memoryview]) -> ByteBuffer:
+    """memoryview を find の使えるオブジェクトに戻す
+
+    元のオブジェクト全体を指す memoryview はコピーせずに元のオブジェクトを使い、
+    一部分を指す場合だけコピーする。
+    """
+    if not isinstance(buffer, memoryview):
+        return buffer
+    obj = buffer.obj
+    if isinstance(obj, (bytes, bytearray, mmap.mmap)) and buffer.nbytes == len(obj):
+        return obj
+    return buffer.tobytes()
+
+
+class MorphView(object):
+    """バッファ上の単語行を位置だけで保持し、参照されたフィールドだけを復号する
+
+    フィールドは MORPH_FIELDS の名前で参照できる。値のないフィールドは None。
+    Morph と同じく、分割できない行 (素性が多すぎる, タブが複数ある) は
+    surface も含め全て None とする。
+
+    Arguments:
+        buffer {ByteBuffer} -- 解析結果のバイト列
+        start {int} -- 行の開始位置
+        tab {int} -- 表層系と素性を区切るタブの位置
+        end {int} -- 行の終了位置 (改行を含まない)
+
+    Keyword Arguments:
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Usage:
+        >>> from cucurbita.scan import MorphView
+        >>> line = "客\\t名詞,一般,*,*,*,*,客,キャク,キャク".encode()
+        >>> m = MorphView(line, 0, line.find(b"\\t"), len(line))
+        >>> m.surface, m.pos, m.yomi
+        ('客', '名詞', 'キャク')
+    """
+
+    __slots__ = ("buffer", "start", "tab", "end", "encoding", "_valid")
+
+    def __init__(
+        self,
+        buffer: ByteBuffer,
+        start: int,
+        tab: int,
+        end: int,
+        encoding: str = "utf-8",
+    ) -> None:
+        self.buffer = buffer
+        self.start = start
+        self.tab = tab
+        self.end = end
+        self.encoding = encoding
+        self._valid: Optional[bool] = None
+
+    def __repr__(self) -> str:
+        return f"<MorphView: {self.surface}>"
+
+    def __str__(self) -> str:
+        return str(self.surface)
+
+    @property
+    def surface(self) -> Optional[str]:
+        return self.field(0)
+
+    def is_valid(self) -> bool:
+        """split_words で分割できる行か (結果は保持する)
+
+        タブが1つで、素性が MORPH_FIELDS の数を超えない (カンマが8個以下)。
+        カンマは9個目が見つかるまでしか探さない。
+        """
+        if self._valid is None:
+            find, end = self.buffer.find, self.end
+            valid = find(b"\t", self.tab + 1, end) == -1
+            position = self.tab
+            for _ in range(len(MORPH_FIELDS) - 1):
+                if not valid:
+                    break
+                position = find(b",", position + 1, end)
+                if position == -1:
+                    break
+            else:
+                valid = False
+            self._valid = valid
+        return self._valid
+
+    def span(self, i: int) -> Optional[Tuple[int, int]]:
+        """i 番目のフィールド (MORPH_FIELDS の順) のバッファ内の位置
+
+        分割できない行は None を返す。
+        """
+        if not self.is_valid():
+            return None
+        if i == 0:
+            return self.start, self.tab
+        find = self.buffer.find
+        end = self.end
+        start = self.tab + 1
+        for _ in range(i - 1):
+            start = find(b",", start, end) + 1
+            if start == 0:
+                return None
+        stop = find(b",", start, end)
+        return start, (end if stop == -1 else stop)
+
+    def encoded(self, i: int) -> Optional[bytes]:
+        """i 番目のフィールドを復号せずに返す"""
+        span = self.span(i)
+        return None if span is None else bytes(self.buffer[span[0] : span[1]])
+
+    def field(self, i: int) -> Optional[str]:
+        """i 番目のフィールドを復号して返す"""
+        span = self.span(i)
+        if span is None:
+            return None
+        return str(self.buffer[span[0] : span[1]], self.encoding)
+
+    @property
+    def values(self) -> List[Optional[str]]:
+        """各フィールドの値を MORPH_FIELDS の順に返す
+
+        Morph と同じく、分割できない行は全て None とする。
+        """
+        try:
+            return split_words(self.text)
+        except (AssertionError, ValueError):
+            return [None] * len(MORPH_FIELDS)
+
+    @property
+    def text(self) -> str:
+        """行全体を復号する"""
+        return str(self.buffer[self.start : self.end], self.encoding)
+
+    def to_morph(self) -> Morph:
+        return Morph.from_values(self.values)
+
+
+def _field(i: int) -> property:
+    return property(lambda self: self.field(i))
+
+
+# surface 以外の MORPH_FIELDS は参照される度に復号する
+for _i, _name in enumerate(MORPH_FIELDS[1:], 1):
+    setattr(MorphView, _name, _field(_i))
+del _i, _name
+
+
+class ChunkView(object):
+    """バッファ上の文節 (ヘッダーの値と単語の位置)
+
+    Attributes:
+        pos {int} -- 文節番号 (ヘッダーがなければ 0)
+        dst {int} -- かかる対象の文節番号 (ヘッダーがなければ 0)
+        score {float} -- 係度合い (ヘッダーがなければ 0)
+        morphs {List[MorphView]} -- 構成する単語
+    """
+
+    __slots__ = ("pos", "dst", "score", "morphs")
+
+    def __init__(
+        self, pos: int, dst: int, score: float, morphs: List[MorphView]
+    ) -> None:
+        self.pos = pos
+        self.dst = dst
+        self.score = score
+        self.morphs = morphs
+
+    def __repr__(self) -> str:
+        return "<ChunkView: {}>".format(" ".join(self.surfaces()))
+
+    def surfaces(self) -> List[str]:
+        return [morph.surface or "" for morph in self.morphs]
+
+
+class Scanner(object):
+    """CaboCha(MeCab)の解析結果のバイト列を、文字列に復号せずに走査する
+
+    改行, タブ, カンマの位置だけを求め、単語は MorphView としてバッファ上の
+    位置で保持する。文節数や係り受けの距離を数えるだけなら、ヘッダー行の
+    数値の他は文字列を作らない。行の判定は split_chunks と同じだが、
+    不正な行は警告せずに読み飛ばす (stats を渡せば記録する)。
+
+    Arguments:
+        buffer {Union[ByteBuffer, memoryview]} -- 解析結果 (bytes, bytearray, mmap など)
+
+    Keyword Arguments:
+        eos {str} -- 終了文字 (default: {"EOS"})
+        encoding {str} -- 文字コード (default: {"utf-8"})
+
+    Usage:
+        >>> from collections import Counter
+        >>> from cucurbita.scan import Scanner
+        >>> with Scanner.open("cabocha.out") as scanner:
+        ...     distances = Counter(scanner.dependency_lengths())
+        ...     nouns = sum(
+        ...         m.pos == "名詞"
+        ...         for start, end in scanner.sentences()
+        ...         for m in scanner.tokens(start, end)
+        ...     )
+    """
+
+    def __init__(
+        self,
+        buffer: Union[ByteBuffer, memoryview],
+        eos: str = "EOS",
+        encoding: str = "utf-8",
+    ) -> None:
+        self.buffer = _unwrap(buffer)
+        self.eos = eos.encode(encoding)
+        self.encoding = encoding
+        eos_line = re.escape(self.eos)
+        self._pattern_eos: Pattern[bytes] = re.compile(
+            b"^" + eos_line + rb"\r?$", re.MULTILINE
+        )
+        # 単語行 (行, 表層系), 終了文字, ヘッダー行 (文節番号, かかり先, 係り度合い),
+        # その他の行の順に判定する
+        self._pattern_line: Pattern[bytes] = re.compile(
+            rb"^(?:(([^\t\r\n]*)\t[^,\r\n]*(?:,[^,\r\n]*){6,})|("
+            + eos_line
+            + rb")|\* (\d+) (-1|\d+)D \d+/\d+ (-?\d+\.\d+)|[^\r\n]*)\r?$",
+            re.MULTILINE,
+        )
+        self._closer: Any = None
+
+    @classmethod
+    def open(cls, path: str, eos: str = "EOS", encoding: str = "utf-8") -> "Scanner":
+        """ファイルをメモリマップして走査する (close で閉じる)"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        scanner = cls(buffer, eos=eos, encoding=encoding)
+        scanner._closer = buffer
+        return scanner
+
+    def __enter__(self) -> "Scanner":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._closer is not None:
+            self._closer.close()
+            self._closer = None
+
+    def sentences(self) -> Iterator[Tuple[int, int]]:
+        """各文の (開始位置, 終了文字の行の直後の位置) を返す
+
+        終了文字のない末尾も空白だけでなければ1文として扱う。
+        """
+        buffer = self.buffer
+        start = 0
+        for match in self._pattern_eos.finditer(buffer):  # type: ignore
+            end = min(match.end() + 1, len(buffer))
+            yield start, end
+            start = end
+        if _NON_SPACE.search(buffer, start) is not None:  # type: ignore
+            yield start, len(buffer)
+
+    def count_sentences(self) -> int:
+        return sum(1 for _ in self.sentences())
+
+    def text(self, start: int, end: int) -> str:
+        """[start, end) を復号する (Sect, Doc に渡す場合など)"""
+        return str(self.buffer[start:end], self.encoding)
+
+    def headers(
+        self, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[Tuple[int, int, float]]:
+        """[start, end) のヘッダー行の (文節番号, かかり先, 係り度合い) を返す"""
+        end = len(self.buffer) if end is None else end
+        for match in HEADER.finditer(self.buffer, start, end):  # type: ignore
+            pos, dst, score = match.groups()
+            yield int(pos), int(dst), float(score)
+
+    def count_chunks(self, start: int = 0, end: Optional[int] = None) -> int:
+        """[start, end) のヘッダー行の数 (MeCab の解析結果では 0)"""
+        end = len(self.buffer) if end is None else end
+        return sum(1 for _ in HEADER.finditer(self.buffer, start, end))  # type: ignore
+
+    def dependency_lengths(
+        self, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[int]:
+        """かかり先のある文節毎に、かかり先までの文節数 (dst - pos) を返す"""
+        end = len(self.buffer) if end is None else end
+        for match in HEADER.finditer(self.buffer, start, end):  # type: ignore
+            dst = int(match.group(2))
+            if dst >= 0:
+                yield dst - int(match.group(1))
+
+    def chunks(
+        self,
+        start: int = 0,
+        end: Optional[int] = None,
+        stats: Optional[ParseStats] = None,
+    ) -> Iterator[ChunkView]:
+        """[start, end) の最初の文を文節毎に返す (split_chunks と同じ判定)
+
+        stats を指定すると件数と不正な行を記録する。不正な行を復号するのは
+        その時だけ。
+
+        Arguments:
+            start {int} -- 文の開始位置 (default: {0})
+            end {Optional[int]} -- 走査の終了位置 (default: {None} バッファの末尾)
+            stats {Optional[ParseStats]} -- 件数と不正な行の集計 (default: {None})
+        """
+        buffer = self.buffer
+        encoding = self.encoding
+        end = len(buffer) if end is None else end
+
+        header: Optional[Tuple[int, int, float]] = None
+        morphs: List[MorphView] = []
+        # 1行ずつ正規表現で判定し、何番目のグループが一致したかで分岐する
+        for match in self._pattern_line.finditer(buffer, start, end):  # type: ignore
+            kind = match.lastindex
+            if kind == 1:
+                morphs.append(
+                    MorphView(
+                        buffer, match.start(), match.end(2), match.end(1), encoding
+                    )
+                )
+            elif kind == 3:
+                break
+            elif kind == 6:
+                if header is not None:
+                    if stats is not None:
+                        stats.chunks += 1
+                        stats.tokens += len(morphs)
+                    yield ChunkView(*header, morphs)
+                pos, dst, score = match.groups()[3:]
+                header = int(pos), int(dst), float(score)
+                morphs = []
+            elif stats is not None and match.end() > match.start():
+                line = str(match.group(), encoding).rstrip("\r")
+                if line.startswith("* "):
+                    stats.add_malformed(INVALID_HEADER, line)
+                else:
+                    stats.add_malformed(UNDEFINED_LINE, line)
+
+        # 終了文字もしくは末尾で残りの文節を返す
+        if stats is not None:
+            stats.sentences += 1
+            stats.chunks += 1
+            stats.tokens += len(morphs)
+        yield ChunkView(*(header or (0, 0, 0.0)), morphs)
+
+    def tokens(self, start: int = 0, end: Optional[int] = None) -> Iterator[MorphView]:
+        """[start, end) の最初の文の単語を順に返す"""
+        for chunk in self.chunks(start, end):
+            yield from chunk.morphs
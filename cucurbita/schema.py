@@ -0,0 +1,266 @@
+import keyword
+import re
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple, Type
+
+from cucurbita.cab import MORPH_FIELDS, _Frozen
+
+Extractor = Callable[[str], Tuple[Optional[str], ...]]
+
+
+class SchemaMorph(object):
+    """Schema.morph_class が生成する単語クラスの基底
+
+    フィールドはスロットで、fields に並ぶ名前だけを持つ。
+    frozen が真のクラスは属性を変更できない (Schema.morph_class(frozen=True))。
+    """
+
+    __slots__ = ()
+    fields: Tuple[str, ...] = ()
+    frozen: bool = False
+    schema: "Schema"
+
+    @classmethod
+    def from_values(cls, values: Iterable[Optional[str]]) -> "SchemaMorph":
+        """分割済みの値 (fields の順) から行を解析せずに生成する"""
+        morph = cls.__new__(cls)
+        for field, value in zip(cls.fields, values):
+            # 変更できないクラスでも設定できるよう __setattr__ を通さない
+            object.__setattr__(morph, field, value)
+        return morph
+
+    @property
+    def values(self) -> List[Optional[str]]:
+        """各フィールドの値を fields の順に返す"""
+        return [getattr(self, field) for field in self.fields]
+
+    def __str__(self) -> str:
+        return str(self.surface)  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self.surface}>"  # type: ignore
+
+    def __reduce__(self) -> Any:
+        return _restore_morph, (self.schema, self.fields, self.values, self.frozen)
+
+
+def _restore_morph(
+    schema: "Schema",
+    fields: Tuple[str, ...],
+    values: List[Optional[str]],
+    frozen: bool = False,
+) -> SchemaMorph:
+    return schema.select(*fields).morph_class(frozen).from_values(values)
+
+
+class Schema(object):
+    """辞書の素性の並びを宣言し、行を分割する関数と単語クラスを作る
+
+    列の並びは1度だけ宣言し、必要なフィールドだけを取り出す関数
+    (extractor) とスロットを持つ単語クラス (morph_class) にする。
+    取り出すのは最後に必要な列までで、それより後ろの列は分割しない。
+    宣言より列の多い行は余分な列を無視し、少ない行は足りない列を None とする。
+
+    Arguments:
+        name {str} -- スキーマの名前
+        fields {Iterable[str]} -- 表層系の後ろに並ぶ素性の列名
+
+    Keyword Arguments:
+        min_fields {int} -- 単語行とみなす素性の最小の列数 (default: {7})
+        selected {Optional[Iterable[str]]} -- 単語クラスに持たせる列名
+            (default: {None} 全ての列, 表層系は常に含む)
+
+    Usage:
+        >>> from cucurbita.cab import Sect
+        >>> from cucurbita.schema import UNIDIC
+        >>> line = "客\\t名詞,普通名詞,一般,*,*,*,キャク,客,客,キャク,客,キャク,漢,*,*,*,*"
+        >>> UNIDIC.extractor(["lemma", "goshu"])(line)
+        ('客', '漢')
+        >>> Morph = UNIDIC.select("pos1", "lemma").morph_class()
+        >>> m = Morph(line)
+        >>> m.surface, m.pos1, m.lemma
+        ('客', '名詞', '客')
+        >>> sect = Sect(unidic_result, schema=UNIDIC.select("pos1", "lemma"))
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: Iterable[str],
+        min_fields: int = 7,
+        selected: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.name = name
+        self.fields = ("surface",) + tuple(fields)
+        self.min_fields = min_fields
+        for field in self.fields:
+            if not field.isidentifier() or keyword.iskeyword(field):
+                raise Exception(f"Undefined field: {field}")
+        if len(set(self.fields)) != len(self.fields):
+            raise Exception(f"Duplicate field in {name}")
+        self._index = {field: i for i, field in enumerate(self.fields)}
+
+        names = self.fields if selected is None else tuple(selected)
+        for field in names:
+            self.index(field)
+        self.selected = ("surface",) + tuple(f for f in names if f != "surface")
+        self._morph_class: Optional[Type[SchemaMorph]] = None
+        self._frozen_class: Optional[Type[SchemaMorph]] = None
+        self._pattern_morph: Optional[Pattern[str]] = None
+        self._selections: Dict[Tuple[str, ...], Schema] = {}
+
+    def __repr__(self) -> str:
+        return f"<Schema: {self.name} {len(self.fields) - 1} fields>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Schema) and self.__key() == other.__key()
+
+    def __hash__(self) -> int:
+        return hash(self.__key())
+
+    def __key(self) -> Tuple[Any, ...]:
+        return self.name, self.fields, self.min_fields, self.selected
+
+    def __reduce__(self) -> Any:
+        return Schema, (self.name, self.fields[1:], self.min_fields, self.selected)
+
+    def index(self, field: str) -> int:
+        """列名の位置 (表層系が 0)"""
+        try:
+            return self._index[field]
+        except KeyError:
+            raise Exception(f"Undefined field: {field}") from None
+
+    def select(self, *fields: str) -> "Schema":
+        """単語クラスに持たせる列を絞ったスキーマを返す (同じ列なら同じものを返す)"""
+        schema = self._selections.get(fields)
+        if schema is None:
+            schema = Schema(self.name, self.fields[1:], self.min_fields, fields)
+            self._selections[fields] = schema
+        return schema
+
+    def extractor(self, fields: Optional[Iterable[str]] = None) -> Extractor:
+        """行から指定した列の値をタプルで取り出す関数を返す
+
+        Keyword Arguments:
+            fields {Optional[Iterable[str]]} -- 取り出す列名 (default: {None} selected)
+        """
+        names = self.selected if fields is None else tuple(fields)
+        indices = [self.index(field) for field in names]
+        last = max(indices, default=0)
+        pick = itemgetter(*indices) if len(indices) > 1 else None
+        index = indices[0] if indices else 0
+        padding = [None] * last
+
+        def extract(line: str) -> Tuple[Optional[str], ...]:
+            surface, _, feature = line.rstrip("\r\n").partition("\t")
+            values: List[Any] = [surface]
+            if last:
+                # 最後に必要な列までだけ分割する (残りは末尾の要素にまとまる)
+                values += feature.split(",", last)
+                if len(values) <= last:
+                    values += padding[: last + 1 - len(values)]
+            if pick is None:
+                return (values[index],) if indices else ()
+            return pick(values)
+
+        return extract
+
+    def morph_class(self, frozen: bool = False) -> Type[SchemaMorph]:
+        """selected の列をスロットに持つ単語クラスを返す (スキーマ毎に1度だけ作る)
+
+        生成するクラスは行を1つ受け取り、extractor で取り出した値を
+        各スロットに設定する (namedtuple と同じくコードを生成する)。
+
+        Keyword Arguments:
+            frozen {bool} -- 属性を変更できないサブクラスを返すか。freeze した
+                文の単語に使う (default: {False})
+        """
+        if frozen:
+            return self.__frozen_class()
+        if self._morph_class is not None:
+            return self._morph_class
+        names = self.selected
+        namespace: Dict[str, Any] = {"_extract": self.extractor(names)}
+        targets = ", ".join(f"self.{name}" for name in names)
+        exec(f"def __init__(self, line):\n    {targets}, = _extract(line)\n", namespace)
+        camel = "".join(part.capitalize() for part in re.split(r"\W+", self.name))
+        self._morph_class = type(
+            f"{camel}Morph",
+            (SchemaMorph,),
+            {
+                "__slots__": names,
+                "__init__": namespace["__init__"],
+                "__module__": __name__,
+                "fields": names,
+                "schema": self,
+            },
+        )
+        return self._morph_class
+
+    def __frozen_class(self) -> Type[SchemaMorph]:
+        if self._frozen_class is None:
+            cls = self.morph_class()
+            names, extract = cls.fields, self.extractor(cls.fields)
+
+            def __init__(morph: _Frozen, line: str) -> None:
+                morph._init(**dict(zip(names, extract(line))))
+
+            self._frozen_class = type(
+                f"Frozen{cls.__name__}",
+                (cls, _Frozen),
+                {
+                    "__slots__": (),
+                    "__init__": __init__,
+                    "__module__": __name__,
+                    "frozen": True,
+                },
+            )
+        return self._frozen_class
+
+    def parse(self, line: str) -> SchemaMorph:
+        """1行を morph_class の単語にする"""
+        return self.morph_class()(line)
+
+    @property
+    def pattern_morph(self) -> Optional[Pattern[str]]:
+        """単語行の正規表現 (min_fields が既定の 7 なら None で is_morph を使う)"""
+        if self.min_fields == 7:
+            return None
+        if self._pattern_morph is None:
+            self._pattern_morph = re.compile(
+                rf"^[^\t]*\t[^,]*(?:,[^,]*){{{self.min_fields - 1},}}$"
+            )
+        return self._pattern_morph
+
+
+# ipadic (Morph と同じ列名)
+IPADIC = Schema("ipadic", MORPH_FIELDS[1:])
+
+# unidic (unidic-cwj, unidic-csj の先頭17列)。未知語は品詞と活用の6列だけになる。
+# 後ろに列の続く版 (iConType, lemma_id など) の行もそのまま扱える。
+UNIDIC = Schema(
+    "unidic",
+    (
+        "pos1",
+        "pos2",
+        "pos3",
+        "pos4",
+        "cType",
+        "cForm",
+        "lForm",
+        "lemma",
+        "orth",
+        "pron",
+        "orthBase",
+        "pronBase",
+        "goshu",
+        "iType",
+        "iForm",
+        "fType",
+        "fForm",
+    ),
+    min_fields=6,
+)
+
+SCHEMAS = {schema.name: schema for schema in (IPADIC, UNIDIC)}
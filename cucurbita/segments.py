@@ -0,0 +1,310 @@
+import json
+import os
+import threading
+from bisect import bisect_right
+from collections import Counter
+from logging import getLogger
+from typing import Counter as TypingCounter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from cucurbita.cab import Doc, Sect
+from cucurbita.corpus import Corpus
+from cucurbita.index import InvertedIndex, Posting, Term
+from cucurbita.query import Match, Query
+
+logger = getLogger(__name__)
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+class Segment(object):
+    """追記型コーパスの1つのセグメント
+
+    Attributes:
+        name {str} -- セグメント名 (ファイル名の接頭辞)
+        n_sentences {int} -- 文の数
+        corpus {Corpus} -- メモリマップで開いたコーパス
+        index {InvertedIndex} -- セグメントの転置索引
+        counts {Dict[str, Counter]} -- フィールド毎の値の出現数
+    """
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.name = name
+        prefix = os.path.join(directory, name)
+        self.corpus = Corpus.open(prefix + ".corpus")
+        self.index = InvertedIndex.open(prefix + ".index")
+        with open(prefix + ".counts.json", encoding="utf-8") as f:
+            self.counts = {field: Counter(c) for field, c in json.load(f).items()}
+        self.n_sentences = len(self.corpus)
+
+    def __repr__(self) -> str:
+        return f"<Segment: {self.name}, {self.n_sentences} sentences>"
+
+    @staticmethod
+    def write(
+        directory: str,
+        name: str,
+        corpus: Corpus,
+        index_fields: Sequence[str],
+        count_fields: Sequence[str],
+    ) -> None:
+        """コーパスと、その転置索引・出現数をセグメントとして書き込む"""
+        prefix = os.path.join(directory, name)
+        corpus.save(prefix + ".corpus")
+        InvertedIndex.build(corpus, prefix + ".index", fields=index_fields)
+        counts = {field: corpus.count_by(field) for field in count_fields}
+        counts = {
+            f: {k: n for k, n in c.items() if k is not None} for f, c in counts.items()
+        }
+        with open(prefix + ".counts.json", "w", encoding="utf-8") as f:
+            json.dump(counts, f, ensure_ascii=False)
+
+    @staticmethod
+    def remove(directory: str, name: str) -> None:
+        prefix = os.path.join(directory, name)
+        for suffix in (".corpus", ".index", ".counts.json"):
+            os.remove(prefix + suffix)
+
+
+class SegmentedCorpus(object):
+    """新しい解析結果をセグメントとして追記していくコーパス
+
+    append する度に新しい文だけから Corpus, 転置索引, 出現数を作って
+    セグメントとして保存し、全体の出現数には差分だけを足す。そのため
+    更新の手間は追加した文の量に比例する。セグメントが max_segments を
+    超えると、隣り合う小さなセグメントを merge_factor 個ずつ1つに
+    まとめる (background が真ならバックグラウンドのスレッドで行う)。
+
+    Arguments:
+        directory {str} -- セグメントを保存するディレクトリ
+
+    Keyword Arguments:
+        index_fields {Sequence[str]} -- 転置索引を作るフィールド (default: {surface, base, pos})
+        count_fields {Sequence[str]} -- 出現数を数えるフィールド (default: {base, pos})
+        max_segments {int} -- まとめずに置いておくセグメント数の上限 (default: {8})
+        merge_factor {int} -- 一度にまとめるセグメント数 (default: {4})
+        background {bool} -- セグメントの統合を別スレッドで行うか (default: {True})
+
+    Usage:
+        >>> from cucurbita.io import iter_sentences
+        >>> from cucurbita.segments import SegmentedCorpus
+        >>> corpus = SegmentedCorpus("news.cucurbita")
+        >>> corpus.append(iter_sentences("latest.cabocha.out"))
+        >>> corpus.counts["base"].most_common(10)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        index_fields: Sequence[str] = ("surface", "base", "pos"),
+        count_fields: Sequence[str] = ("base", "pos"),
+        max_segments: int = 8,
+        merge_factor: int = 4,
+        background: bool = True,
+    ) -> None:
+        self.directory = directory
+        self.max_segments = max_segments
+        self.merge_factor = max(merge_factor, 2)
+        self.background = background
+        self._lock = threading.RLock()
+        self._merging: Optional[threading.Thread] = None
+
+        os.makedirs(directory, exist_ok=True)
+        manifest = self._read_manifest()
+        if manifest is None:
+            manifest = {
+                "version": FORMAT_VERSION,
+                "next_id": 0,
+                "index_fields": list(index_fields),
+                "count_fields": list(count_fields),
+                "segments": [],
+            }
+            self._write_manifest(manifest)
+        self.index_fields: List[str] = manifest["index_fields"]
+        self.count_fields: List[str] = manifest["count_fields"]
+        self._next_id: int = manifest["next_id"]
+        self.segments = [Segment(directory, name) for name in manifest["segments"]]
+
+        self.counts: Dict[str, TypingCounter[str]] = {
+            field: Counter() for field in self.count_fields
+        }
+        for segment in self.segments:
+            self._add_counts(segment)
+
+    def __len__(self) -> int:
+        return sum(segment.n_sentences for segment in self.segments)
+
+    def __getitem__(self, i: int) -> Union[Sect, Doc]:
+        return self.sentence(i)
+
+    def __repr__(self) -> str:
+        return (
+            f"<SegmentedCorpus: {len(self.segments)} segments, {len(self)} sentences>"
+        )
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.directory, MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["version"] != FORMAT_VERSION:
+            raise Exception("Undefined format")
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        # 書きかけの manifest を読まないよう、一時ファイルから置き換える
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(path + ".tmp", path)
+
+    def _save_manifest(self) -> None:
+        self._write_manifest(
+            {
+                "version": FORMAT_VERSION,
+                "next_id": self._next_id,
+                "index_fields": self.index_fields,
+                "count_fields": self.count_fields,
+                "segments": [segment.name for segment in self.segments],
+            }
+        )
+
+    def _add_counts(self, segment: Segment) -> None:
+        for field in self.count_fields:
+            self.counts[field].update(segment.counts.get(field, {}))
+
+    def _new_name(self) -> str:
+        name = f"seg-{self._next_id:08d}"
+        self._next_id += 1
+        return name
+
+    def append(self, sentences: Iterable[str]) -> Optional[Segment]:
+        """1文毎の解析結果を新しいセグメントとして追記する
+
+        Returns:
+            Optional[Segment] -- 追加したセグメント (文がなければ None)
+        """
+        corpus = Corpus.from_sentences(sentences)
+        if not len(corpus):
+            return None
+
+        with self._lock:
+            name = self._new_name()
+            Segment.write(
+                self.directory, name, corpus, self.index_fields, self.count_fields
+            )
+            segment = Segment(self.directory, name)
+            self.segments.append(segment)
+            self._add_counts(segment)
+            self._save_manifest()
+
+        if len(self.segments) > self.max_segments:
+            self.maybe_merge()
+        return segment
+
+    def maybe_merge(self) -> None:
+        """セグメント数が上限を超えていれば統合する"""
+        if not self.background:
+            while len(self.segments) > self.max_segments and self.merge():
+                pass
+            return
+
+        with self._lock:
+            if self._merging is not None and self._merging.is_alive():
+                return
+            self._merging = threading.Thread(target=self._merge_loop, daemon=True)
+            self._merging.start()
+
+    def _merge_loop(self) -> None:
+        try:
+            while len(self.segments) > self.max_segments and self.merge():
+                pass
+        except Exception:
+            logger.exception("failed to merge segments in %s", self.directory)
+
+    def wait(self) -> None:
+        """バックグラウンドの統合が終わるまで待つ"""
+        merging = self._merging
+        if merging is not None:
+            merging.join()
+
+    def merge(self) -> bool:
+        """文の合計が最も少ない隣り合う merge_factor 個のセグメントを1つにまとめる
+
+        追記は末尾にしか行われないため、まとめる対象を選んだ後に
+        追記があっても対象のセグメントは隣り合ったまま残る。
+
+        Returns:
+            bool -- 統合を行ったか
+        """
+        with self._lock:
+            k = min(self.merge_factor, len(self.segments))
+            if k < 2:
+                return False
+            sizes = [s.n_sentences for s in self.segments]
+            start = min(range(len(sizes) - k + 1), key=lambda i: sum(sizes[i : i + k]))
+            targets = self.segments[start : start + k]
+            name = self._new_name()
+
+        merged = Corpus()
+        for segment in targets:
+            merged.merge(segment.corpus)
+        Segment.write(
+            self.directory, name, merged, self.index_fields, self.count_fields
+        )
+        segment = Segment(self.directory, name)
+
+        with self._lock:
+            start = self.segments.index(targets[0])
+            self.segments[start : start + k] = [segment]
+            self._save_manifest()
+        for target in targets:
+            # 開いているメモリマップはファイルを削除しても読み続けられる
+            Segment.remove(self.directory, target.name)
+        return True
+
+    def _bases(self) -> Tuple[List[Segment], List[int]]:
+        """セグメントと、その先頭の文番号の一覧"""
+        segments = list(self.segments)
+        bases, total = [], 0
+        for segment in segments:
+            bases.append(total)
+            total += segment.n_sentences
+        return segments, bases
+
+    def sentence(self, i: int) -> Union[Sect, Doc]:
+        """全体での文番号 i の文を取り出す"""
+        segments, bases = self._bases()
+        k = bisect_right(bases, i) - 1
+        if i < 0 or k < 0 or i - bases[k] >= segments[k].n_sentences:
+            raise IndexError("sentence index out of range")
+        return segments[k].corpus.sentence(i - bases[k])
+
+    def postings(self, field: str, value: str) -> List[Posting]:
+        """全セグメントの (フィールド, 値) の出現位置を全体での文番号で返す"""
+        postings: List[Posting] = []
+        for segment, base in zip(*self._bases()):
+            postings += [(base + s, o) for s, o in segment.index.postings(field, value)]
+        return postings
+
+    def all_of(self, *terms: Term) -> List[int]:
+        """全ての (フィールド, 値) を含む文番号 (AND検索)"""
+        result: List[int] = []
+        for segment, base in zip(*self._bases()):
+            result += [base + s for s in segment.index.all_of(*terms)]
+        return result
+
+    def phrase(self, terms: Sequence[Term]) -> List[Posting]:
+        """連続する単語の並びに一致する箇所 (全体での文番号, 先頭の単語位置)"""
+        result: List[Posting] = []
+        for segment, base in zip(*self._bases()):
+            result += [(base + s, o) for s, o in segment.index.phrase(terms)]
+        return result
+
+    def search(self, query: Query) -> Iterator[Match]:
+        """各セグメントの転置索引で絞り込みながらパターンに一致する箇所を探す"""
+        for segment, base in zip(*self._bases()):
+            for match in query.search_corpus(segment.corpus, index=segment.index):
+                yield match._replace(sentence=base + match.sentence)
@@ -0,0 +1,369 @@
+import math
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from zlib import crc32
+
+from cucurbita.cab import Cab, Chunk, Sect
+
+# 組のキーの要素を連結する区切り (解析結果の列には現れない)
+_SEPARATOR = "\x1f"
+
+Key = Union[str, Tuple[str, ...]]
+
+
+def _encode(key: Key) -> bytes:
+    if isinstance(key, tuple):
+        return _SEPARATOR.join(key).encode()
+    return key.encode()
+
+
+def _rank(item: Tuple[Key, int]) -> Tuple[int, Key]:
+    # 推定値の大きい順、同数ならキーの順 (入力の順やハッシュに依らない)
+    return -item[1], item[0]
+
+
+class CountMinSketch(object):
+    """出現数を固定のメモリで近似する Count-Min Sketch
+
+    推定値は真の数以上で、全体の数 total に対して確率 1 - delta で
+    epsilon * total 以内の過大評価に収まる (width = e / epsilon,
+    depth = ln(1 / delta))。ハッシュは zlib.crc32 でプロセスに依らないため、
+    同じ width, depth, seed のスケッチは別のプロセスで作ってもまとめられる。
+    メモリは width * depth * 8 バイト。
+
+    Keyword Arguments:
+        width {int} -- 1行のカウンタ数 (default: {65536})
+        depth {int} -- 行数 (ハッシュ関数の数) (default: {4})
+        seed {int} -- ハッシュの種 (default: {0})
+
+    Usage:
+        >>> from cucurbita.sketch import CountMinSketch
+        >>> sketch = CountMinSketch(width=1024, depth=4)
+        >>> sketch.add("客", 3)
+        3
+        >>> sketch["客"], sketch["柿"]
+        (3, 0)
+    """
+
+    def __init__(self, width: int = 65536, depth: int = 4, seed: int = 0) -> None:
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self.table = array("q", bytes(8 * width * depth))
+
+    @classmethod
+    def from_error(
+        cls, epsilon: float = 0.0001, delta: float = 0.01, seed: int = 0
+    ) -> "CountMinSketch":
+        """許容する誤差の割合 epsilon と確率 delta から大きさを決める"""
+        width = math.ceil(math.e / epsilon)
+        depth = math.ceil(math.log(1 / delta))
+        return cls(width=width, depth=depth, seed=seed)
+
+    def __repr__(self) -> str:
+        return f"<CountMinSketch: {self.width}x{self.depth}, total {self.total}>"
+
+    def __getitem__(self, key: Key) -> int:
+        return self.estimate(key)
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.itemsize * len(self.table)
+
+    def _indices(self, key: Key) -> List[int]:
+        # 2つのハッシュの線形結合で depth 個の位置を作る (Kirsch-Mitzenmacher)
+        data = _encode(key)
+        h1 = crc32(data, self.seed)
+        h2 = crc32(data, h1) | 1
+        width = self.width
+        return [(h1 + i * h2) % width + i * width for i in range(self.depth)]
+
+    def add(self, key: Key, count: int = 1) -> int:
+        """key の数を count 増やし、増やした後の推定値を返す"""
+        table = self.table
+        estimate = None
+        for i in self._indices(key):
+            value = table[i] + count
+            table[i] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        self.total += count
+        return estimate or 0
+
+    def update(self, keys: Iterable[Key]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def estimate(self, key: Key) -> int:
+        table = self.table
+        return min(table[i] for i in self._indices(key))
+
+    def _check(self, other: "CountMinSketch") -> None:
+        if (self.width, self.depth, self.seed) != (
+            other.width,
+            other.depth,
+            other.seed,
+        ):
+            raise Exception("Incompatible sketch")
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """同じ大きさと種のスケッチの数を加える"""
+        self._check(other)
+        table = self.table
+        for i, value in enumerate(other.table):
+            if value:
+                table[i] += value
+        self.total += other.total
+
+
+class TopK(object):
+    """出現数の多い k 個のキーを固定のメモリで求める (heavy hitters)
+
+    全てのキーを CountMinSketch で数え、推定値の大きい k 個だけを
+    候補として保持する。候補より推定値の大きいキーが現れたら、推定値の
+    最も小さい候補と入れ替える。
+
+    Keyword Arguments:
+        k {int} -- 保持するキーの数 (default: {100})
+        width {int} -- CountMinSketch の幅 (default: {65536})
+        depth {int} -- CountMinSketch の行数 (default: {4})
+        seed {int} -- ハッシュの種 (default: {0})
+
+    Usage:
+        >>> from cucurbita.sketch import TopK
+        >>> top = TopK(k=2)
+        >>> top.update(["客", "柿", "客", "庭", "客", "柿"])
+        >>> top.most_common()
+        [('客', 3), ('柿', 2)]
+    """
+
+    def __init__(
+        self, k: int = 100, width: int = 65536, depth: int = 4, seed: int = 0
+    ) -> None:
+        self.k = k
+        self.sketch = CountMinSketch(width=width, depth=depth, seed=seed)
+        self.counts: Dict[Key, int] = {}
+        # 候補の推定値の最小値の下限 (候補の推定値は増える一方なので下限のまま使える)
+        self._floor = 0
+
+    def __repr__(self) -> str:
+        return f"<TopK: {len(self.counts)}/{self.k} keys, total {self.total}>"
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self.counts
+
+    def __getitem__(self, key: Key) -> int:
+        return self.sketch.estimate(key)
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total
+
+    def add(self, key: Key, count: int = 1) -> None:
+        estimate = self.sketch.add(key, count)
+        counts = self.counts
+        if key in counts or len(counts) < self.k:
+            counts[key] = estimate
+        elif estimate > self._floor:
+            victim, smallest = max(counts.items(), key=_rank)
+            if estimate > smallest:
+                del counts[victim]
+                counts[key] = estimate
+            self._floor = min(counts.values())
+
+    def update(self, keys: Iterable[Key]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Key, int]]:
+        """推定値の大きい順 (同数ならキーの順) に (キー, 推定値) を返す"""
+        items = sorted(self.counts.items(), key=_rank)
+        return items if n is None else items[:n]
+
+    def merge(self, other: "TopK") -> None:
+        """スケッチを加え、両方の候補を加えた後の推定値で選び直す"""
+        self.sketch.merge(other.sketch)
+        keys = set(self.counts) | set(other.counts)
+        estimates = sorted(
+            ((key, self.sketch.estimate(key)) for key in keys), key=_rank
+        )
+        self.counts = dict(estimates[: self.k])
+        self._floor = min(self.counts.values(), default=0)
+
+
+class Cooccurrence(object):
+    """係り受けの組 (係り元の文節, 係り先の文節) の出現数を固定のメモリで数える
+
+    組は TopK で数え、出現数の多い k 組だけを保持する。係り元, 係り先
+    それぞれの出現数も CountMinSketch で数え、pmi を求められる。
+
+    Keyword Arguments:
+        k {int} -- 保持する組の数 (default: {1000})
+        width {int} -- CountMinSketch の幅 (default: {65536})
+        depth {int} -- CountMinSketch の行数 (default: {4})
+        seed {int} -- ハッシュの種 (default: {0})
+
+    Usage:
+        >>> from cucurbita.cab import Sect
+        >>> from cucurbita.dataset import DOC_CABOCHA
+        >>> from cucurbita.sketch import Cooccurrence
+        >>> pairs = Cooccurrence(k=10)
+        >>> pairs.update(Sect(DOC_CABOCHA))
+        >>> pairs.most_common(1)
+        [(('よく', '食う'), 1)]
+    """
+
+    def __init__(
+        self, k: int = 1000, width: int = 65536, depth: int = 4, seed: int = 0
+    ) -> None:
+        self.pairs = TopK(k=k, width=width, depth=depth, seed=seed)
+        self.dependents = CountMinSketch(width=width, depth=depth, seed=seed)
+        self.heads = CountMinSketch(width=width, depth=depth, seed=seed)
+
+    def __repr__(self) -> str:
+        return f"<Cooccurrence: {len(self.pairs)} pairs, total {self.total}>"
+
+    def __getitem__(self, pair: Tuple[str, str]) -> int:
+        return self.pairs[pair]
+
+    @property
+    def total(self) -> int:
+        return self.pairs.total
+
+    def add(self, dependent: str, head: str, count: int = 1) -> None:
+        self.pairs.add((dependent, head), count)
+        self.dependents.add(dependent, count)
+        self.heads.add(head, count)
+
+    def update(self, sect: Sect, key: Callable[[Chunk], Optional[str]] = str) -> None:
+        """文の係り受けを数える
+
+        Arguments:
+            sect {Sect} -- 文
+
+        Keyword Arguments:
+            key {Callable[[Chunk], Optional[str]]} -- 文節を数える文字列にする
+                (default: {str} 文節の表層系, None を返した文節は数えない)
+        """
+        chunks = sect.chunks
+        keys = [key(chunk) for chunk in chunks]
+        for chunk, dependent in zip(chunks, keys):
+            # ヘッダーのない解析結果の文節 (dst が自身) と係り先なし (-1) は数えない
+            if chunk.pos < chunk.dst < len(chunks) and dependent is not None:
+                head = keys[chunk.dst]
+                if head is not None:
+                    self.add(dependent, head)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Key, int]]:
+        return self.pairs.most_common(n)
+
+    def pmi(self, dependent: str, head: str) -> float:
+        """係り元と係り先の自己相互情報量 (推定値から求める)"""
+        pair = self.pairs[(dependent, head)]
+        if not pair:
+            return float("-inf")
+        return math.log(
+            pair * self.total / (self.dependents[dependent] * self.heads[head])
+        )
+
+    def merge(self, other: "Cooccurrence") -> None:
+        self.pairs.merge(other.pairs)
+        self.dependents.merge(other.dependents)
+        self.heads.merge(other.heads)
+
+
+class StreamStats(object):
+    """文を1つずつ受け取り、単語の頻出語と係り受けの組を固定のメモリで数える
+
+    Sect, Doc もしくは1文の解析結果の文字列を受け取る。文字列は
+    Sect(lazy=True) としてパースし、ヘッダーがなければ係り受けは数えない。
+    メモリは width * depth * 8 バイトのスケッチ4つと、k 個ずつの候補で決まる。
+    シャード毎に作って merge でまとめられる (同じ引数で作ったもの同士)。
+
+    Keyword Arguments:
+        field {str} -- 数える単語のフィールド (default: {"base"})
+        k {int} -- 保持する単語と組の数 (default: {1000})
+        width {int} -- CountMinSketch の幅 (default: {262144})
+        depth {int} -- CountMinSketch の行数 (default: {4})
+        seed {int} -- ハッシュの種 (default: {0})
+        key {Callable[[Chunk], Optional[str]]} -- 係り受けの組で文節を表す文字列
+            (default: {str} 文節の表層系, プロセス間で受け渡すには
+            lambda ではなくモジュールの関数にする)
+
+    Usage:
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> from cucurbita.io import iter_sentences
+        >>> from cucurbita.sketch import StreamStats
+        >>> def count(path):
+        ...     stats = StreamStats(field="base")
+        ...     stats.update(iter_sentences(path))
+        ...     return stats
+        >>> with ProcessPoolExecutor() as pool:
+        ...     shards = list(pool.map(count, paths))
+        >>> total = shards[0]
+        >>> for shard in shards[1:]:
+        ...     total.merge(shard)
+        >>> total.words.most_common(20)
+    """
+
+    def __init__(
+        self,
+        field: str = "base",
+        k: int = 1000,
+        width: int = 262144,
+        depth: int = 4,
+        seed: int = 0,
+        key: Callable[[Chunk], Optional[str]] = str,
+    ) -> None:
+        self.field = field
+        self.key = key
+        self.sentences = 0
+        self.words = TopK(k=k, width=width, depth=depth, seed=seed)
+        self.pairs = Cooccurrence(k=k, width=width, depth=depth, seed=seed)
+
+    def __repr__(self) -> str:
+        return (
+            f"<StreamStats: {self.sentences} sentences,"
+            f" {self.words.total} words, {self.pairs.total} pairs>"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """スケッチの大きさ (候補の辞書は含まない)"""
+        pairs = self.pairs
+        return sum(
+            sketch.nbytes
+            for sketch in (
+                self.words.sketch,
+                pairs.pairs.sketch,
+                pairs.dependents,
+                pairs.heads,
+            )
+        )
+
+    def add(self, sentence: Union[str, Cab]) -> None:
+        cab = Sect(sentence, lazy=True) if isinstance(sentence, str) else sentence
+        field = self.field
+        words = self.words
+        for morph in cab.tokenize():
+            value = getattr(morph, field)
+            if value is not None:
+                words.add(value)
+        if isinstance(cab, Sect):
+            self.pairs.update(cab, key=self.key)
+        self.sentences += 1
+
+    def update(self, sentences: Iterable[Union[str, Cab]]) -> None:
+        for sentence in sentences:
+            self.add(sentence)
+
+    def merge(self, other: "StreamStats") -> None:
+        if (self.field, self.key) != (other.field, other.key):
+            raise Exception("Incompatible sketch")
+        self.words.merge(other.words)
+        self.pairs.merge(other.pairs)
+        self.sentences += other.sentences
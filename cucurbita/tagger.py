@@ -0,0 +1,158 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+)
+
+from cucurbita.cab import Cab, Doc, Sect, Sentences
+
+TaggerFactory = Callable[[], Any]
+
+# プロセスプールの各ワーカーが保持する解析器 (factory 毎に最初の呼び出しで作る)
+# ProcessPoolExecutor の initializer は Python 3.7 からのため使わない
+_process_taggers: Dict[TaggerFactory, Any] = {}
+
+
+def _parse_in_process(
+    factory: TaggerFactory, method: str, texts: List[str]
+) -> List[str]:
+    tagger = _process_taggers.get(factory)
+    if tagger is None:
+        tagger = _process_taggers[factory] = factory()
+    parse = getattr(tagger, method)
+    return [parse(text) for text in texts]
+
+
+def _batches(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for text in texts:
+        batch.append(text)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class TaggerPool(object):
+    """MeCab.Tagger などの解析器をワーカー毎に1つずつ持ち、まとめて解析する
+
+    解析器は各ワーカーで最初に使われる時に factory から1度だけ作られる
+    (辞書の読み込みはワーカー毎に1回で済む)。スレッドの場合はスレッド毎に、
+    プロセスの場合はプロセス毎に解析器を持つ。テキストは batch_size 件ずつ
+    ワーカーに渡し、結果は入力の順に返す。
+
+    解析器は ``parse(str) -> str`` を持つものなら何でもよい。
+    CaboCha.Parser のように文字列を返すメソッドの名前が異なる場合は method で指定する。
+
+    Arguments:
+        factory {TaggerFactory} -- 解析器を作る引数なしの関数 (プロセスの場合は pickle できること)
+
+    Keyword Arguments:
+        workers {Optional[int]} -- ワーカー数 (default: {None} CPU数)
+        processes {bool} -- スレッドの代わりにプロセスを使うか (default: {False})
+        batch_size {int} -- 1度にワーカーへ渡すテキストの数 (default: {64})
+        method {str} -- 解析器の解析結果の文字列を返すメソッド名 (default: {"parse"})
+        cls {Optional[Type[Cab]]} -- 文のクラス (default: {None} ヘッダーの有無で選ぶ)
+
+    Usage:
+        >>> import MeCab
+        >>> from cucurbita.tagger import TaggerPool
+        >>> with TaggerPool(MeCab.Tagger, workers=4, processes=True) as pool:
+        ...     docs = pool.parse(["隣の客はよく柿食う客だ。", "庭には鶏が二羽いました。"])
+        >>> docs[1]
+        <Doc: 庭には鶏が二羽いました。>
+    """
+
+    def __init__(
+        self,
+        factory: TaggerFactory,
+        workers: Optional[int] = None,
+        processes: bool = False,
+        batch_size: int = 64,
+        method: str = "parse",
+        cls: Optional[Type[Cab]] = None,
+    ) -> None:
+        self.factory = factory
+        self.workers = workers or os.cpu_count() or 1
+        self.processes = processes
+        self.batch_size = max(batch_size, 1)
+        self.method = method
+        self.cls = cls
+        self._local = threading.local()
+
+        self.executor: Executor
+        if processes:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def __repr__(self) -> str:
+        kind = "processes" if self.processes else "threads"
+        return f"<TaggerPool: {self.workers} {kind}>"
+
+    def __enter__(self) -> "TaggerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:  # type: ignore
+        self.close()
+
+    def close(self) -> None:
+        """ワーカーを終了する"""
+        self.executor.shutdown()
+
+    def _parse_in_thread(self, texts: List[str]) -> List[str]:
+        tagger = getattr(self._local, "tagger", None)
+        if tagger is None:
+            tagger = self._local.tagger = self.factory()
+        parse = getattr(tagger, self.method)
+        return [parse(text) for text in texts]
+
+    def imap_raw(self, texts: Iterable[str]) -> Iterator[str]:
+        """テキストを解析し、解析結果の文字列を入力の順に返す"""
+        function: Callable[[List[str]], List[str]]
+        if self.processes:
+            function = partial(_parse_in_process, self.factory, self.method)
+        else:
+            function = self._parse_in_thread
+        # Executor.map は入力を全て先に投入するため、投入済みの数を抑えて順に待つ
+        pending: Deque[Future] = deque()
+        for batch in _batches(texts, self.batch_size):
+            pending.append(self.executor.submit(function, batch))
+            if len(pending) > 2 * self.workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def imap(self, texts: Iterable[str]) -> Iterator[Cab]:
+        """テキストを解析し、Sect/Doc を入力の順に返す"""
+        for result in self.imap_raw(texts):
+            cls = self.cls or (Sect if result.startswith("* ") else Doc)
+            yield cls(result)
+
+    def parse(self, texts: Iterable[str]) -> Sentences:
+        """テキストをまとめて解析する
+
+        解析器の呼び出しはワーカーで行い、Sect/Doc へのパースは
+        Sentences からアクセスされた時に行う。
+
+        Returns:
+            Sentences -- 入力の順の解析結果
+        """
+        return Sentences(list(self.imap_raw(texts)), cls=self.cls)
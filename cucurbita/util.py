@@ -1,6 +1,8 @@
 import re
-from logging import getLogger
-from typing import Iterator, List, Match, Pattern, Tuple, Union
+from logging import DEBUG, getLogger
+from typing import Iterator, List, Optional, Pattern, Tuple, Union
+
+from cucurbita.diagnostics import INVALID_HEADER, UNDEFINED_LINE, ParseStats
 
 logger = getLogger(__name__)
 
@@ -29,22 +31,43 @@ def split_sentences(text: str, eos: str = "EOS\n") -> Iterator[str]:
             yield sentence + eos
 
 
+# ヘッダー行, 単語行の正規表現 (呼び出し毎にコンパイルしないようモジュールで保持する)
+PATTERN_HEADER = re.compile(r"^\*\ \d+\ (?:-1|\d+)D\ \d+\/\d+\ -?\d+\.\d+$")
+PATTERN_MORPH = re.compile(r"^[^\t]*\t[^,]*(?:,[^,]*){6,}$")
+
+
+def is_morph(line: str) -> bool:
+    """単語行かどうかを正規表現を使わずに判定する (PATTERN_MORPH と同等)"""
+    tab = line.find("\t")
+    return tab >= 0 and line.count(",", tab) >= 6
+
+
+def is_header(line: str) -> bool:
+    """ヘッダー行かどうかを判定する (PATTERN_HEADER と同等)"""
+    return line.startswith("* ") and PATTERN_HEADER.match(line) is not None
+
+
 # splitlinesを用いるのでここでのeosには改行がない
 def split_chunks(
     parsed_text: str,
     eos: str = "EOS",
-    pattern_header: Pattern[str] = re.compile(""),
-    pattern_morph: Pattern[str] = re.compile(""),
+    pattern_header: Optional[Pattern[str]] = None,
+    pattern_morph: Optional[Pattern[str]] = None,
+    stats: Optional[ParseStats] = None,
 ) -> Iterator[Tuple[str, List[str]]]:
     """CaboChaでパースした文章を文節毎に分割する
 
+    正規表現が指定されない場合は、単語行を正規表現を使わずに判定する。
+    stats を指定すると、不正な行は警告せずに stats に記録する。
+
     Arguments:
         parsed_text {str} -- 解析結果で一つのヘッダーと単語形態素結果のまとまり
 
     Keyword Arguments:
         eos {str} -- 区切り文字 (default: {"EOS"})
-        pattern_header {Pattern[str]} -- ヘッダー行の正規表現 (default: {re.compile("")})
-        pattern_morph {Pattern[str]} -- 単語行の正規表現 (default: {re.compile("")})
+        pattern_header {Optional[Pattern[str]]} -- ヘッダー行の正規表現 (default: {None})
+        pattern_morph {Optional[Pattern[str]]} -- 単語行の正規表現 (default: {None})
+        stats {Optional[ParseStats]} -- 件数と不正な行の集計 (default: {None})
 
     Yields:
         Iterator[Tuple[str, List[str]]] -- 文節毎のヘッダーと単語のリスト
@@ -56,37 +79,63 @@ def split_chunks(
         >>> chunks[0]
         ('* 0 -1D 1/1 0.000000', ['\u3000\t記号,空白,*,*,*,*,\u3000,\u3000,\u3000', '吾輩は猫である\t名詞,固有名
     """
-    if pattern_header == re.compile(""):
-        pattern_header = re.compile(r"^\*\ \d+\ (?:-1|\d+)D\ \d+\/\d+\ -?\d+\.\d+$")
-
-    if pattern_morph == re.compile(""):
-        pattern_morph = re.compile(r"^[^\t]*\t[^,]*(?:,[^,]*){6,}$")
+    match_header = pattern_header.match if pattern_header else is_header
+    match_morph = pattern_morph.match if pattern_morph else is_morph
+    debug = logger.isEnabledFor(DEBUG)
 
     header = ""
     morphs: List[str] = []
 
     # parsed_textにeosがない場合に挙動が変わらないようにする
-    parsed_text += eos
+    parsed_text += "\n" + eos
 
     for line in parsed_text.splitlines():
-        if line == eos:
+        # 出現頻度の高い単語行を先に判定する
+        if match_morph(line):
+            if debug:
+                logger.debug("morph: %r", line)
+            morphs.append(line)
+
+        elif line == eos:
+            if stats is not None:
+                stats.sentences += 1
+                stats.chunks += 1
+                stats.tokens += len(morphs)
             yield header, morphs
             break
 
-        elif pattern_header.match(line):
-            logger.debug(f"header: {repr(line)}")
+        elif match_header(line):
+            if debug:
+                logger.debug("header: %r", line)
             if header:
+                if stats is not None:
+                    stats.chunks += 1
+                    stats.tokens += len(morphs)
                 yield header, morphs
             header = line
             morphs = []
 
-        elif pattern_morph.match(line):
-            logger.debug(f"morph: {repr(line)}")
-            morphs.append(line)
-
-        else:
+        elif line:
             # header でも morphでもないパターンはログに残しスキップ
-            logger.warn(f"undefined pattern: {repr(line)}")
+            if stats is None:
+                logger.warning("undefined pattern: %r", line)
+            elif line.startswith("* "):
+                stats.add_malformed(INVALID_HEADER, line)
+            else:
+                stats.add_malformed(UNDEFINED_LINE, line)
+
+
+def split_header(line: str) -> Tuple[int, int, float]:
+    """ヘッダー行から文節番号, かかり先の文節番号, 係り度合いを取り出す
+
+    Raises:
+        Exception -- ヘッダ行のフォーマットがおかしい場合
+    """
+    _, pos, dst, _, score, *_ = line.split()
+    if not dst.endswith("D"):
+        raise Exception("Undefined format")
+    dst = dst.rstrip("D")
+    return int(pos), int(dst), float(score)
 
 
 def split_words(parsed_line: str) -> List[Union[str, None]]:
@@ -0,0 +1,17 @@
+"""dataset の解析結果を再生する、テスト用の MeCab/CaboCha の代わり
+
+Usage:
+    $ python fake_analyzer.py cabocha < input.txt
+"""
+
+import sys
+
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB, DOC_PLAIN
+from cucurbita.util import split_sentences
+
+if __name__ == "__main__":
+    doc = DOC_CABOCHA if sys.argv[1:] == ["cabocha"] else DOC_MECAB
+    results = dict(zip(DOC_PLAIN.splitlines(), split_sentences(doc)))
+    for line in sys.stdin:
+        sys.stdout.write(results.get(line.rstrip("\n"), "EOS\n"))
+        sys.stdout.flush()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+from cucurbita.aio import AnalyzerPool, aiter_cabs, aiter_sentences
+from cucurbita.cab import Doc, Sect
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB, DOC_PLAIN
+from cucurbita.util import split_sentences
+
+FAKE_ANALYZER = os.path.join(os.path.dirname(__file__), "fake_analyzer.py")
+TEXTS = DOC_PLAIN.splitlines()
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def command(kind):
+    return [sys.executable, FAKE_ANALYZER, kind]
+
+
+async def collect(aiterator):
+    return [item async for item in aiterator]
+
+
+@pytest.fixture(autouse=True)
+def pythonpath(monkeypatch):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    monkeypatch.setenv("PYTHONPATH", root)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_analyze_keeps_order(processes):
+    async def main():
+        async with AnalyzerPool(
+            command("cabocha"), processes=processes, max_pending=2
+        ) as pool:
+            return await collect(pool.analyze(TEXTS * 5))
+
+    sects = run(main())
+    assert all(isinstance(sect, Sect) for sect in sects)
+    assert [s.result for s in sects] == list(split_sentences(DOC_CABOCHA)) * 5
+
+
+def test_analyze_async_input():
+    async def texts():
+        for text in TEXTS:
+            await asyncio.sleep(0)
+            yield text
+
+    async def main():
+        async with AnalyzerPool(command("mecab"), processes=2) as pool:
+            docs = await collect(pool.analyze(texts()))
+            # 同じプロセスを続けて使える
+            docs += await collect(pool.analyze(TEXTS[:1]))
+            return docs
+
+    docs = run(main())
+    assert all(isinstance(doc, Doc) for doc in docs)
+    assert [str(doc) for doc in docs] == TEXTS + TEXTS[:1]
+
+
+def test_analyze_stopped_early():
+    async def main():
+        async with AnalyzerPool(command("cabocha"), max_pending=4) as pool:
+            sects = pool.analyze(TEXTS * 10)
+            async for sect in sects:
+                break
+            await sects.aclose()
+            # 読み残した出力は次の解析に混ざらない
+            return sect, await collect(pool.analyze_raw(TEXTS[1:2]))
+
+    first, rest = run(main())
+    assert str(first) == TEXTS[0]
+    assert rest == list(split_sentences(DOC_CABOCHA))[1:2]
+
+
+def test_aiter_from_stream():
+    async def main():
+        stream = asyncio.StreamReader()
+        stream.feed_data(DOC_MECAB.encode())
+        stream.feed_data("隣\t名詞,一般,*,*,*,*,隣,トナリ,トナリ\n".encode())
+        stream.feed_eof()
+        return await collect(aiter_sentences(stream))
+
+    results = run(main())
+    assert results[:-1] == list(split_sentences(DOC_MECAB))
+    assert results[-1].startswith("隣"), "終了文字のない末尾も1文として扱う"
+
+    async def cabs():
+        stream = asyncio.StreamReader()
+        stream.feed_data(DOC_CABOCHA.encode())
+        stream.feed_eof()
+        return await collect(aiter_cabs(stream))
+
+    assert [str(sect) for sect in run(cabs())] == TEXTS
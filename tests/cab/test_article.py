@@ -0,0 +1,35 @@
+import types
+
+from cucurbita.cab import Article, Doc, Sect
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+
+
+def test_article_sentences_are_lazy():
+    article = Article(DOC_CABOCHA)
+    assert len(article) == 3
+    assert not any(article.sentences.is_parsed(i) for i in range(3))
+
+    sect = article.sentences[1]
+    assert isinstance(sect, Sect)
+    assert str(sect) == "庭には鶏が二羽いました。"
+    assert article.sentences[1] is sect, "パース結果は保持される"
+    assert [article.sentences.is_parsed(i) for i in range(3)] == [False, True, False]
+
+
+def test_article_detects_sentence_class():
+    assert all(isinstance(s, Doc) for s in Article(DOC_MECAB))
+    assert all(isinstance(s, Sect) for s in Article(DOC_CABOCHA))
+    assert all(isinstance(s, Doc) for s in Article(DOC_CABOCHA, cls=Doc))
+
+
+def test_article_tokenize_covers_all_sentences():
+    article = Article(DOC_MECAB)
+    tokens = article.tokenize()
+    assert isinstance(tokens, types.GeneratorType)
+    surfaces = [m.surface for m in tokens]
+    assert len(surfaces) == 32
+    assert surfaces[-1] == "。"
+    assert not any(
+        article.sentences.is_parsed(i) for i in range(3)
+    ), "tokenize は保持しない"
+    assert str(article) == "".join(str(Doc(s)) for s in article.sentences.results)
@@ -0,0 +1,95 @@
+import pickle
+
+import pytest
+
+from cucurbita.cab import (
+    MORPH_FIELDS,
+    Chunk,
+    Doc,
+    LazyChunk,
+    LazyMorph,
+    Morph,
+    MorphTable,
+    Sect,
+    freeze,
+)
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.util import split_sentences
+
+LINE = "客\t名詞,一般,*,*,*,*,客,キャク,キャク"
+
+
+def test_lazy_morph_decodes_on_access():
+    morph = LazyMorph(LINE)
+    assert morph._line == LINE
+    assert morph.surface == "客"
+    assert morph._line == LINE, "surface だけなら分割しない"
+    assert morph.pos == "名詞"
+    assert morph._line == LINE, "pos だけなら行全体は分割しない"
+    assert morph.pos1 == "一般"
+    assert morph._line is None
+    assert morph.values == Morph(LINE).values
+    assert morph.pos is Morph(LINE).pos, "品詞は共有の文字列を使う"
+    with pytest.raises(AttributeError):
+        morph.undefined
+
+
+def test_lazy_morph_invalid_line():
+    for line in ("客\t" + ",".join("a" * 12), "abc", "客\t名詞\t一般"):
+        morph = LazyMorph(line)
+        assert morph.values == Morph(line).values == [None] * len(MORPH_FIELDS)
+        assert morph.pos is None, "pos も Morph と同じく None"
+    # 表層系の "," は素性の数に含めない
+    comma = "a,b\t名詞,一般,*,*,*,*,a,エー,エー"
+    assert LazyMorph(comma).surface == "a,b"
+    assert LazyMorph(comma).values == Morph(comma).values
+    assert LazyMorph("客\t名詞").values == Morph("客\t名詞").values
+
+    lines = [LINE, "abc", comma]
+    assert LazyChunk(lines).surfaces() == Chunk(lines).surfaces() == ["客", "", "a,b"]
+
+
+def test_lazy_morph_pickle():
+    restored = pickle.loads(pickle.dumps(LazyMorph(LINE)))
+    assert restored.values == Morph(LINE).values
+
+
+@pytest.mark.parametrize(
+    "cls, doc",
+    [(Sect, DOC_CABOCHA), (Doc, DOC_MECAB)],
+)
+def test_lazy_matches_eager(cls, doc):
+    for result in split_sentences(doc):
+        eager, lazy = cls(result), cls(result, lazy=True)
+        assert lazy.text == eager.text
+        assert list(lazy.token_ends) == list(eager.token_ends)
+        assert all(chunk._lines is not None for chunk in lazy._chunks), "単語は作らない"
+        assert [m.values for m in lazy.tokenize()] == [
+            m.values for m in eager.tokenize()
+        ]
+        assert [str(c) for c in lazy._chunks] == [str(c) for c in eager._chunks]
+
+
+def test_lazy_chunks():
+    sect = Sect(next(split_sentences(DOC_CABOCHA)), lazy=True)
+    chunk = sect.chunks[1]
+    assert isinstance(chunk, LazyChunk)
+    assert (chunk.pos, chunk.dst) == (1, 5)
+    assert sect.graph.children(5) == [1, 4]
+    assert chunk.morphs is chunk.morphs
+    assert all(isinstance(m, LazyMorph) for m in chunk.morphs)
+
+    chunk.morphs = chunk.morphs[:1]
+    assert str(chunk) == "客"
+    assert [m.values for m in freeze(sect).chunks[0].morphs] == [
+        m.values for m in Sect(sect.result).chunks[0].morphs
+    ]
+
+
+def test_lazy_with_table():
+    table = MorphTable()
+    a = Doc(DOC_MECAB, lazy=True, table=table)
+    assert len(table) == 0
+    b = Doc(DOC_MECAB, table=table)
+    assert a.tokenize()[0] is b.tokenize()[0]
+    assert set(MORPH_FIELDS) == set(Morph.__slots__)
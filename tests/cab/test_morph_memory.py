@@ -0,0 +1,38 @@
+import tracemalloc
+
+from cucurbita.cab import Morph
+from cucurbita.dataset import DOC_MECAB
+from cucurbita.util import is_morph
+
+LINES = [line for line in DOC_MECAB.splitlines() if is_morph(line)]
+
+
+def bytes_per_token(n_tokens: int = 20000) -> float:
+    # 各行を別オブジェクトにして解析結果を読み込んだ状態に近づける
+    lines = [(LINES[i % len(LINES)] + " ")[:-1] for i in range(n_tokens)]
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        morphs = [Morph(line) for line in lines]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(morphs) == n_tokens
+    return (after - before) / n_tokens
+
+
+def test_morph_has_no_dict():
+    m = Morph(LINES[0])
+    assert not hasattr(m, "__dict__")
+    assert m.values[:2] == ["隣", "名詞"]
+
+
+def test_morph_features_are_shared():
+    a, b = Morph(LINES[0]), Morph((LINES[2] + " ")[:-1])
+    assert a.pos is b.pos
+    assert a.pos1 is b.pos1
+
+
+def test_morph_bytes_per_token():
+    # 表層系・基本形・読み・発音の4文字列とオブジェクト本体分に収まる
+    assert bytes_per_token() < 600
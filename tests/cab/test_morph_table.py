@@ -0,0 +1,37 @@
+import pytest
+
+from cucurbita.cab import Doc, FrozenMorph, MorphTable, Sect, freeze
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.util import split_sentences
+
+
+def test_table_shares_morphs():
+    table = MorphTable()
+    a, b = Doc(DOC_MECAB, table=table), Doc(DOC_MECAB, table=table)
+    assert all(x is y for x, y in zip(a.tokenize(), b.tokenize()))
+    assert [m.values for m in a.tokenize()] == [
+        m.values for m in Doc(DOC_MECAB).tokenize()
+    ]
+    assert isinstance(a.tokenize()[0], FrozenMorph)
+    with pytest.raises(AttributeError):
+        a.tokenize()[0].surface = "x"
+
+
+def test_table_across_sentences():
+    table = MorphTable()
+    sects = [Sect(s, table=table) for s in split_sentences(DOC_CABOCHA)]
+    wa = [m for sect in sects for m in sect.tokenize() if m.surface == "は"]
+    assert len(wa) == 2 and wa[0] is wa[1]
+    assert [str(s) for s in sects] == [
+        str(Sect(s)) for s in split_sentences(DOC_CABOCHA)
+    ]
+    frozen = freeze(sects[0])
+    assert frozen.tokenize()[0] is sects[0].tokenize()[0], "共有の Morph は使い回す"
+
+
+def test_table_is_bounded():
+    table = MorphTable(maxsize=4)
+    Doc(DOC_MECAB, table=table)
+    assert 0 < len(table) <= 4
+    table.clear()
+    assert len(table) == 0
@@ -1 +1,11 @@
 from cucurbita.cab import Sect
+from cucurbita.dataset import DOC_CABOCHA
+from cucurbita.util import split_sentences
+
+
+def test_sect_tokenize_reuses_chunks():
+    sect = Sect(next(split_sentences(DOC_CABOCHA)))
+    tokens = sect.tokenize()
+    assert [str(t) for t in tokens] == "隣 の 客 は よく 柿 食う 客 だ 。".split()
+    assert tokens[0] is sect.chunks[0].morphs[0], "tokenize は解析済みの Morph を返す"
+    assert tokens == sect.tokenize()
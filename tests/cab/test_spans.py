@@ -0,0 +1,54 @@
+import pytest
+
+from cucurbita.cab import Doc, Sect, freeze
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.util import split_sentences
+
+
+@pytest.mark.parametrize(
+    "cab",
+    [Sect(s) for s in split_sentences(DOC_CABOCHA)]
+    + [Doc(s) for s in split_sentences(DOC_MECAB)],
+)
+def test_spans_cover_text(cab):
+    tokens = cab.tokenize()
+    assert cab.text == "".join(m.surface for m in tokens)
+    assert [cab.text[s:e] for s, e in zip(cab.token_starts, cab.token_ends)] == [
+        m.surface for m in tokens
+    ]
+    assert [cab.text[slice(*cab.chunk_span(i))] for i in range(len(cab._chunks))] == [
+        str(chunk) for chunk in cab._chunks
+    ]
+    assert cab.token_starts[0] == 0 and cab.token_ends[-1] == len(cab.text)
+
+
+def test_spans_with_original_text():
+    result = next(split_sentences(DOC_CABOCHA))
+    sect = Sect(result, text="隣の 客は、よく柿食う客だ。")
+    assert sect.token_span(2) == (3, 4)
+    assert sect.chunk_span(1) == (3, 5)
+    assert sect.chunk_span(2) == (6, 8)
+
+    # 本文に見つからない単語は -1
+    sect = Sect(result, text="隣の客はよく梨食う客だ。")
+    assert sect.token_span(5) == (-1, -1)
+    assert sect.chunk_span(3) == (-1, -1)
+    assert sect.token_span(6) == (7, 9)
+
+    # 後ろに同じ表層系があっても、離れた位置へは進まない
+    sect = Sect(result, text="隣の人はよく柿食う客だ。")
+    assert sect.token_span(2) == (-1, -1)
+    assert sect.token_span(3) == (3, 4)
+    assert sect.token_span(7) == (9, 10)
+    assert sect.chunk_span(1) == (3, 4)
+
+
+def test_spans_of_frozen():
+    sect = Sect(next(split_sentences(DOC_CABOCHA)))
+    frozen = freeze(sect)
+    assert list(frozen.chunk_ends) == list(sect.chunk_ends) == [2, 4, 6, 7, 9, 12]
+    assert freeze(sect).chunk_starts is sect.chunk_starts, "作成済みの位置は共有する"
+
+
+def test_text_is_first_sentence_only():
+    assert Doc(DOC_MECAB).text == "隣の客はよく柿食う客だ。"
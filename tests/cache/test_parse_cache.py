@@ -0,0 +1,86 @@
+import pickle
+
+import pytest
+
+from cucurbita.cab import Doc, FrozenDoc, FrozenSect, Sect, freeze
+from cucurbita.cache import ParseCache
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.util import split_sentences
+
+CABOCHA = list(split_sentences(DOC_CABOCHA))
+MECAB = list(split_sentences(DOC_MECAB))
+
+
+def test_cache_hit_returns_shared_object():
+    cache = ParseCache()
+    first = Sect.from_result(CABOCHA[0], cache=cache)
+    # 別の文字列オブジェクトでも内容が同じならキャッシュから返す
+    second = Sect.from_result("".join(list(CABOCHA[0])), cache=cache)
+    assert first is second
+    assert isinstance(first, FrozenSect)
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+    assert Sect.from_result(CABOCHA[0]) is not first, "cache なしでは毎回パースする"
+
+
+def test_lru_eviction():
+    cache = ParseCache(maxsize=2)
+    a = cache.sect(CABOCHA[0])
+    cache.sect(CABOCHA[1])
+    assert cache.sect(CABOCHA[0]) is a
+    cache.sect(CABOCHA[2])  # 最も古い CABOCHA[1] を捨てる
+    assert len(cache) == 2 and cache.stats.evictions == 1
+    assert cache.sect(CABOCHA[0]) is a
+    cache.sect(CABOCHA[1])
+    assert cache.stats == (2, 4, 2, 2, 2)
+
+    cache.clear()
+    assert cache.stats == (0, 0, 0, 0, 2)
+
+
+def test_cache_by_class():
+    cache = ParseCache()
+    doc = Doc.from_result(MECAB[1], cache=cache)
+    assert isinstance(doc, FrozenDoc)
+    assert cache.sect(MECAB[1]) is not doc
+    assert cache.doc(MECAB[1]) is doc
+    assert ParseCache(maxsize=0).doc(MECAB[1]).text == doc.text
+
+
+@pytest.mark.parametrize("result", CABOCHA)
+def test_frozen_sect_matches_sect(result):
+    sect, frozen = Sect(result), freeze(Sect(result))
+    assert freeze(frozen) is frozen
+    assert str(frozen) == str(sect) and frozen.text == sect.text
+    assert [(c.pos, c.dst, c.score) for c in frozen.chunks] == [
+        (c.pos, c.dst, c.score) for c in sect.chunks
+    ]
+    assert [m.values for m in frozen.tokenize()] == [m.values for m in sect.tokenize()]
+    assert frozen.graph.children(frozen.graph.roots[0]) == sect.graph.children(
+        sect.graph.roots[0]
+    )
+
+
+def test_frozen_objects_are_immutable():
+    sect = FrozenSect(CABOCHA[0])
+    chunk = sect.chunks[0]
+    morph = chunk.morphs[0]
+    for obj, name in [(sect, "text"), (chunk, "dst"), (morph, "surface")]:
+        with pytest.raises(AttributeError):
+            setattr(obj, name, None)
+        with pytest.raises(AttributeError):
+            delattr(obj, name)
+    with pytest.raises(AttributeError):
+        sect.chunks.append(chunk)
+    with pytest.raises(AttributeError):
+        chunk.morphs.append(morph)
+    assert isinstance(sect.tokenize(), list)
+
+
+def test_frozen_sect_pickle():
+    sect = FrozenSect(CABOCHA[1])
+    restored = pickle.loads(pickle.dumps(sect))
+    assert isinstance(restored, FrozenSect)
+    assert [m.values for m in restored.tokenize()] == [
+        m.values for m in sect.tokenize()
+    ]
@@ -0,0 +1,83 @@
+from cucurbita import cab
+from cucurbita.cab import MORPH_FIELDS, Doc, Sect
+from cucurbita.corpus import Corpus, Vocab
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.util import split_sentences
+
+
+def test_vocab():
+    vocab = Vocab(["名詞", "助詞"])
+    assert vocab.add("名詞") == 1
+    assert vocab.add("動詞") == 3
+    assert vocab[0] is None
+    assert vocab.get("形容詞") == -1
+    assert len(vocab) == 4
+
+
+def test_corpus_offsets():
+    corpus = Corpus.from_text(DOC_CABOCHA)
+    assert len(corpus) == 3
+    assert list(corpus.sent_offsets) == [0, 6, 10, 16]
+    assert list(corpus.chunk_range(1)) == [6, 7, 8, 9]
+    assert list(corpus.dst[6:10]) == [3, 3, 3, -1]
+    assert corpus.score[6] == -1.113239
+    assert list(corpus.token_range(0)) == list(range(10))
+
+
+def test_corpus_sentence_views():
+    sentences = list(split_sentences(DOC_CABOCHA))
+    corpus = Corpus.from_sentences(sentences)
+    for sect, sentence in zip(corpus, sentences):
+        expect = Sect(sentence)
+        assert isinstance(sect, Sect)
+        assert str(sect) == str(expect)
+        assert [(c.pos, c.dst, c.score) for c in sect.chunks] == [
+            (c.pos, c.dst, c.score) for c in expect.chunks
+        ]
+        assert [m.values for m in sect.tokenize()] == [
+            m.values for m in expect.tokenize()
+        ]
+    assert str(corpus[-1]) == str(Sect(sentences[-1]))
+
+
+def test_corpus_sentence_without_parsing(monkeypatch):
+    corpus = Corpus.from_text(DOC_CABOCHA + DOC_MECAB)
+    results = [corpus.result(i) for i in range(len(corpus))]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("解析結果をパースしない")
+
+    monkeypatch.setattr(cab, "split_chunks", fail)
+    for i, result in enumerate(results):
+        sentence = corpus[i]
+        assert sentence.result == result, "result は参照された時に文節から作る"
+        assert sentence.token_span(0)[0] == 0
+    assert corpus[0].graph.children(5) == [1, 4]
+
+
+def test_corpus_mecab():
+    corpus = Corpus.from_text(DOC_MECAB)
+    assert corpus.n_chunks == 3
+    assert isinstance(corpus[0], Doc)
+    assert (
+        str(corpus[2])
+        == "かえるぴょこぴょこ三ぴょこぴょこ、あわせてぴょこぴょこ六ぴょこぴょこ。"
+    )
+
+
+def test_corpus_morph():
+    corpus = Corpus.from_text(DOC_CABOCHA)
+    morph = corpus.morph(6)
+    assert morph.values == [
+        "食う",
+        "動詞",
+        "自立",
+        "*",
+        "*",
+        "五段・ワ行促音便",
+        "基本形",
+        "食う",
+        "クウ",
+        "クウ",
+    ]
+    assert len(corpus.columns) == len(MORPH_FIELDS)
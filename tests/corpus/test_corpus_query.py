@@ -0,0 +1,48 @@
+from collections import Counter
+
+from cucurbita.cab import Sect
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA
+from cucurbita.util import split_sentences
+
+SECTS = [Sect(s) for s in split_sentences(DOC_CABOCHA)]
+TOKENS = [m for sect in SECTS for m in sect.tokenize()]
+
+
+def test_filter():
+    corpus = Corpus.from_text(DOC_CABOCHA)
+    expect = [i for i, m in enumerate(TOKENS) if m.pos == "名詞"]
+    assert list(corpus.filter(pos="名詞")) == expect
+
+    expect = [i for i, m in enumerate(TOKENS) if m.pos in ["動詞", "副詞"]]
+    assert list(corpus.filter(pos=["動詞", "副詞"])) == expect
+
+    expect = [i for i, m in enumerate(TOKENS) if m.pos == "助詞" and m.pos1 == "格助詞"]
+    assert list(corpus.filter(pos="助詞", pos1="格助詞")) == expect
+
+    assert list(corpus.filter(pos="未知語")) == []
+    assert len(corpus.filter()) == len(TOKENS)
+
+
+def test_count_by():
+    corpus = Corpus.from_text(DOC_CABOCHA)
+    assert corpus.count_by("pos") == Counter(m.pos for m in TOKENS)
+    assert corpus.count_by("surface", where={"pos": "副詞"}) == Counter(
+        m.surface for m in TOKENS if m.pos == "副詞"
+    )
+
+
+def test_ngrams():
+    corpus = Corpus.from_text(DOC_CABOCHA)
+    expect: Counter = Counter()
+    for sect in SECTS:
+        surfaces = [m.surface for m in sect.tokenize()]
+        expect.update(zip(surfaces, surfaces[1:], surfaces[2:]))
+    assert corpus.ngrams(3) == expect
+    assert corpus.ngrams(1) == Counter((m.surface,) for m in TOKENS)
+
+
+def test_ngrams_short_sentences():
+    corpus = Corpus.from_sentences(["a\tb,c,d,e,f,g,h\nEOS\n"] * 3)
+    assert corpus.ngrams(2) == Counter()
+    assert corpus.ngrams(1) == Counter({("a",): 3})
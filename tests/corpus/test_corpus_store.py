@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from cucurbita import corpus as corpus_module
+from cucurbita.binfile import FormatError
+from cucurbita.corpus import Corpus, StaleCacheError, file_digest, load_corpus
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+
+
+@pytest.fixture
+def corpus():
+    return Corpus.from_text(DOC_CABOCHA + DOC_MECAB)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_open(tmp_path, corpus, mmap):
+    path = str(tmp_path / "corpus.bin")
+    corpus.save(path)
+    loaded = Corpus.open(path, mmap=mmap)
+
+    assert len(loaded) == len(corpus)
+    assert list(loaded.vocab.strings) == corpus.vocab.strings
+    assert [s.result for s in loaded] == [s.result for s in corpus]
+    assert list(loaded.score) == list(corpus.score)
+    assert list(loaded.filter(pos="名詞")) == list(corpus.filter(pos="名詞"))
+    assert loaded.count_by("base") == corpus.count_by("base")
+    assert loaded.ngrams(2) == corpus.ngrams(2)
+
+
+def test_open_mmap_is_read_only(tmp_path, corpus):
+    path = str(tmp_path / "corpus.bin")
+    corpus.save(path)
+    loaded = Corpus.open(path)
+    with pytest.raises(TypeError):
+        loaded.vocab.add("未知語")
+
+    merged = Corpus()
+    merged.merge(loaded)
+    assert [s.result for s in merged] == [s.result for s in corpus]
+
+
+def test_open_invalid(tmp_path):
+    path = tmp_path / "corpus.bin"
+    path.write_bytes(b"not a corpus" * 4)
+    with pytest.raises(Exception):
+        Corpus.open(str(path))
+
+
+def test_load_corpus_detects_stale_cache(tmp_path):
+    source = tmp_path / "cabocha.out"
+    cache = str(tmp_path / "cabocha.out.cucurbita")
+    source.write_text(DOC_CABOCHA, encoding="utf-8")
+
+    assert len(load_corpus(str(source), cache)) == 3
+    assert Corpus.open(cache, source=str(source)) is not None
+
+    source.write_text(DOC_CABOCHA + DOC_CABOCHA, encoding="utf-8")
+    with pytest.raises(StaleCacheError):
+        Corpus.open(cache, source=str(source))
+    assert len(load_corpus(str(source), cache)) == 6
+    assert file_digest(str(source)) != ""
+
+
+def test_load_corpus_rebuilds_broken_cache(tmp_path, monkeypatch):
+    source = tmp_path / "cabocha.out"
+    cache = tmp_path / "cabocha.out.cucurbita"
+    source.write_text(DOC_CABOCHA, encoding="utf-8")
+    load_corpus(str(source), str(cache))
+    data = cache.read_bytes()
+
+    # 書き込み途中で終わったファイル (先頭は最後に書く), 切れたファイル, 空のファイル
+    broken = [bytes(24) + data[24:], data[:-10], data[: len(data) // 2], b""]
+    for content in broken:
+        cache.write_bytes(content)
+        for mmap in (True, False):
+            with pytest.raises(FormatError):
+                Corpus.open(str(cache), mmap=mmap)
+        assert len(load_corpus(str(source), str(cache))) == 3
+        assert cache.read_bytes() == data
+
+    # 古い版で保存したもの
+    monkeypatch.setattr(corpus_module, "FORMAT_VERSION", 0)
+    Corpus.from_file(str(source)).save(str(cache))
+    monkeypatch.undo()
+    with pytest.raises(FormatError):
+        Corpus.open(str(cache))
+    assert len(load_corpus(str(source), str(cache))) == 3
+    assert Corpus.open(str(cache), source=str(source)) is not None
+
+
+def test_rebuild_keeps_mapped_corpus_readable(tmp_path):
+    source = tmp_path / "cabocha.out"
+    cache = str(tmp_path / "cabocha.out.cucurbita")
+    source.write_text(DOC_CABOCHA * 200, encoding="utf-8")
+    old = load_corpus(str(source), cache)
+    expected = old.result(500)
+
+    # 作り直しても、古いファイルをマップしている old はそのまま読める
+    source.write_text(DOC_CABOCHA, encoding="utf-8")
+    assert len(load_corpus(str(source), cache)) == 3
+    assert old.result(500) == expected
+    assert not (tmp_path / "cabocha.out.cucurbita.tmp").exists()
+
+
+def test_load_corpus_digest_only_when_asked(tmp_path, monkeypatch):
+    source = tmp_path / "cabocha.out"
+    cache = str(tmp_path / "cabocha.out.cucurbita")
+    source.write_text(DOC_CABOCHA, encoding="utf-8")
+    digests = []
+    monkeypatch.setattr(
+        corpus_module,
+        "file_digest",
+        lambda path: digests.append(path) or file_digest(path),
+    )
+    load_corpus(str(source), cache)
+    assert len(load_corpus(str(source), cache)) == 3
+    assert digests == [], "既定では元ファイルを読まない"
+
+    # 大きさと更新時刻が同じまま内容が変わった場合は digest でだけ分かる
+    stat = os.stat(str(source))
+    source.write_text(DOC_CABOCHA.replace("隣", "庭"), encoding="utf-8")
+    os.utime(str(source), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_corpus(str(source), cache).count_by("surface")["庭"] == 1
+    corpus = load_corpus(str(source), cache, digest=True)
+    assert corpus.count_by("surface")["庭"] == 2
+    assert len(digests) == 1, "ハッシュ値は1度だけ求める"
+    load_corpus(str(source), cache, digest=True)
+    assert len(digests) == 2
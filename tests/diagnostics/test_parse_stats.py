@@ -0,0 +1,120 @@
+import logging
+
+import pytest
+
+from cucurbita.cab import Doc, Morph, MorphTable, Sect
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA
+from cucurbita.diagnostics import (
+    INVALID_HEADER,
+    INVALID_MORPH,
+    UNDEFINED_LINE,
+    ParseStats,
+)
+from cucurbita.util import split_chunks, split_sentences
+
+BAD_MORPH = "壊れ\t名詞,一般,*,*,*,*,壊れ,コワレ,コワレ,余分,余分"
+NOISY = (
+    "* 0 1D 0/1 1.000000\n"
+    "隣\t名詞,一般,*,*,*,*,隣,トナリ,トナリ\n"
+    "garbage\n"
+    "* x 1D 0/1 score\n"
+    "* 1 -1D 0/0 0.000000\n"
+    f"{BAD_MORPH}\n"
+    "。\t記号,句点,*,*,*,*,。,。,。\n"
+    "EOS\n"
+)
+
+
+def test_split_chunks_counts():
+    stats = ParseStats()
+    sentences = list(split_sentences(DOC_CABOCHA))
+    expected = [list(split_chunks(s)) for s in sentences]
+    assert [list(split_chunks(s, stats=stats)) for s in sentences] == expected
+    assert stats.sentences == len(sentences)
+    assert stats.chunks == sum(map(len, expected))
+    assert stats.tokens == sum(len(m) for chunks in expected for _, m in chunks)
+    assert not stats.malformed
+
+
+def test_malformed_lines_are_counted_not_logged(caplog):
+    stats = ParseStats()
+    with caplog.at_level(logging.WARNING):
+        sect = Sect(NOISY, stats=stats)
+    assert caplog.records == [], "stats を渡した場合は1行ずつ警告しない"
+    assert stats.malformed == {UNDEFINED_LINE: 1, INVALID_HEADER: 1, INVALID_MORPH: 1}
+    assert stats.samples[INVALID_MORPH] == [BAD_MORPH]
+    assert (stats.sentences, stats.chunks, stats.tokens) == (1, 2, 3)
+    assert set(stats.times) == {"split", "chunks", "text"}
+    assert sect.text == "隣。"
+
+
+def test_without_stats_warns(caplog):
+    with caplog.at_level(logging.WARNING):
+        Sect(NOISY)
+    assert len(caplog.records) == 3
+
+
+def test_invalid_morph_is_fully_initialized():
+    morph = Morph(BAD_MORPH, ParseStats())
+    assert morph.values == [None] * 10
+    assert repr(morph) == "<Morph: None>"
+
+
+def test_table_counts_every_occurrence():
+    stats = ParseStats()
+    table = MorphTable()
+    for _ in range(3):
+        Sect(NOISY, table=table, stats=stats)
+    assert stats.malformed[INVALID_MORPH] == 3
+    assert stats.malformed[UNDEFINED_LINE] == 3
+
+
+def test_corpus_add():
+    stats = ParseStats()
+    corpus = Corpus.from_sentences([NOISY, NOISY], stats=stats)
+    assert corpus.n_tokens == 4
+    assert stats.malformed[INVALID_MORPH] == 2
+    assert stats.sentences == 2
+    assert set(stats.times) == {"split", "encode"}
+
+
+def test_samples_are_bounded():
+    stats = ParseStats(max_samples=2)
+    for i in range(5):
+        Doc(f"line{i}\nEOS\n", stats=stats)
+    assert stats.malformed[UNDEFINED_LINE] == 5
+    assert stats.samples[UNDEFINED_LINE] == ["line0", "line1"]
+
+
+def test_on_malformed():
+    seen = []
+    stats = ParseStats(on_malformed=lambda category, line: seen.append(category))
+    Sect(NOISY, stats=stats)
+    assert sorted(seen) == sorted([UNDEFINED_LINE, INVALID_HEADER, INVALID_MORPH])
+
+
+def test_merge():
+    a, b = ParseStats(max_samples=1), ParseStats()
+    Sect(NOISY, stats=a)
+    Sect(NOISY, stats=b)
+    Sect(DOC_CABOCHA, stats=b)
+    a.merge(b)
+    assert a.sentences == 3
+    assert a.malformed[INVALID_MORPH] == 2
+    assert a.samples[INVALID_MORPH] == [BAD_MORPH]
+    assert a.as_dict()["malformed"][UNDEFINED_LINE] == 2
+    assert "malformed: invalid_header=2" in a.summary()
+    a.clear()
+    assert (a.sentences, a.tokens, a.malformed, a.times) == (0, 0, {}, {})
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_same_result(lazy):
+    stats = ParseStats()
+    sect = Sect(DOC_CABOCHA, lazy=lazy, stats=stats)
+    expected = Sect(DOC_CABOCHA, lazy=lazy)
+    assert [m.values for m in sect.tokenize()] == [
+        m.values for m in expected.tokenize()
+    ]
+    assert stats.tokens == len(expected.tokenize())
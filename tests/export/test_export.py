@@ -0,0 +1,97 @@
+import pytest
+
+from cucurbita.binfile import StringTable
+from cucurbita.cab import MORPH_FIELDS
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.export import COLUMNS, export, iter_row_groups, load_npy, read_npy
+from cucurbita.util import split_sentences
+
+SENTENCES = list(split_sentences(DOC_CABOCHA)) * 3 + list(split_sentences(DOC_MECAB))
+
+
+def expected_rows():
+    rows = []
+    for i, result in enumerate(SENTENCES):
+        corpus = Corpus.from_sentences([result])
+        headed = corpus.headed[0]
+        for chunk in range(corpus.n_chunks):
+            for token in range(
+                corpus.chunk_offsets[chunk], corpus.chunk_offsets[chunk + 1]
+            ):
+                dst = corpus.dst[chunk] if headed else -1
+                rows.append(
+                    (i, chunk, dst, corpus.score[chunk]) + tuple(corpus.values(token))
+                )
+    return rows
+
+
+def rows_of(columns):
+    return list(zip(*(columns[name] for name in COLUMNS)))
+
+
+@pytest.mark.parametrize("row_group_size", [1, 10, 65536])
+@pytest.mark.parametrize("from_corpus", [True, False])
+def test_row_groups(row_group_size, from_corpus):
+    source = Corpus.from_sentences(SENTENCES) if from_corpus else iter(SENTENCES)
+    rows = []
+    for group, vocab in iter_row_groups(source, row_group_size=row_group_size):
+        assert len(group["sentence"]) <= max(row_group_size, 12), "文はまたがない"
+        columns = dict(group)
+        for field in MORPH_FIELDS:
+            columns[field] = [vocab.strings[code] for code in group[field]]
+        rows += rows_of(columns)
+    assert rows == expected_rows()
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_export_npy(tmp_path, mmap):
+    path = str(tmp_path / "corpus.bin")
+    Corpus.from_sentences(SENTENCES).save(path)
+    out = str(tmp_path / "tokens")
+    n_rows = export(Corpus.open(path, mmap=mmap), out, format="npy", row_group_size=8)
+    assert n_rows == len(expected_rows())
+    assert rows_of(load_npy(out)) == expected_rows()
+    assert read_npy(str(tmp_path / "tokens" / "sentence.npy")).typecode == "q"
+
+
+def test_export_corpus_decodes_vocab_once(tmp_path, monkeypatch):
+    path = str(tmp_path / "corpus.bin")
+    Corpus.from_sentences(SENTENCES).save(path)
+    corpus = Corpus.open(path)
+    decoded = []
+    getitem = StringTable.__getitem__
+    monkeypatch.setattr(
+        StringTable,
+        "__getitem__",
+        lambda self, id: decoded.append(id) or getitem(self, id),
+    )
+    export(corpus, str(tmp_path / "tokens"), format="npy", row_group_size=1)
+    assert len(decoded) == len(corpus.vocab.strings), "行グループ毎に復号しない"
+
+
+def test_npy_readable_by_numpy(tmp_path):
+    np = pytest.importorskip("numpy")
+    export(iter(SENTENCES), str(tmp_path), format="npy")
+    assert np.load(str(tmp_path / "dst.npy")).tolist() == [
+        r[2] for r in expected_rows()
+    ]
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_arrow(tmp_path, format):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"tokens.{format}")
+    export(iter(SENTENCES), path, format=format, row_group_size=10)
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(path).read_all()
+    assert rows_of(table.to_pydict()) == expected_rows()
+
+
+def test_export_unknown_format(tmp_path):
+    with pytest.raises(Exception):
+        export(iter(SENTENCES), str(tmp_path), format="csv")
@@ -0,0 +1,54 @@
+import pytest
+
+from cucurbita.cab import FrozenSect, Sect
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.graph import DepGraph
+from cucurbita.util import split_sentences
+
+
+def test_dep_graph_cabocha():
+    # かえる / ぴょこぴょこ / 三ぴょこぴょこ、 / あわせて / ぴょこぴょこ / 六ぴょこぴょこ。
+    graph = DepGraph([2, 2, 5, 5, 5, -1])
+    assert list(graph.roots) == [5]
+    assert [graph.children(i) for i in range(6)] == [[], [], [0, 1], [], [], [2, 3, 4]]
+    assert list(graph.depth) == [2, 2, 1, 1, 1, 0]
+    assert graph.path(0) == [0, 2, 5]
+    assert graph.root(1) == 5
+    assert [graph.span(i) for i in (0, 2, 5)] == [(0, 0), (0, 2), (0, 5)]
+    assert sorted(graph.descendants(2)) == [0, 1, 2]
+    assert list(graph.edges()) == [(0, 2), (1, 2), (2, 5), (3, 5), (4, 5)]
+
+
+def test_dep_graph_forest_and_invalid_dst():
+    graph = DepGraph([-1, 0, 5, -1])
+    assert list(graph.roots) == [0, 2, 3]
+    assert graph.path(1) == [1, 0]
+    assert list(graph.depth) == [0, 1, 0, 0]
+
+
+def test_dep_graph_cycle():
+    with pytest.raises(Exception):
+        DepGraph([1, 0])
+
+
+def test_sect_graph_is_cached():
+    sentences = list(split_sentences(DOC_CABOCHA))
+    sect = Sect(sentences[0])
+    assert sect.graph is sect.graph
+    assert sect.graph.children(5) == [1, 4]
+
+    corpus = Corpus.from_sentences(sentences)
+    assert list(corpus.graph(2).dst) == [c.dst for c in Sect(sentences[2]).chunks]
+
+
+def test_graph_without_headers():
+    # ヘッダーのない文の文節は dst が 0 (自身) のため根として扱う
+    sentences = list(split_sentences(DOC_MECAB))
+    assert list(DepGraph([0]).roots) == [0]
+    for sect in (Sect(sentences[0]), FrozenSect(sentences[0])):
+        assert list(sect.graph.roots) == [0]
+        assert list(sect.graph.edges()) == []
+    corpus = Corpus.from_sentences(sentences)
+    for i in range(len(sentences)):
+        assert list(corpus.graph(i).roots) == [0]
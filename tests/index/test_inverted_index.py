@@ -0,0 +1,74 @@
+import pytest
+
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.index import (
+    InvertedIndex,
+    decode_postings,
+    decode_varint,
+    encode_postings,
+    encode_varint,
+)
+from cucurbita.query import ChunkPattern, MorphPattern, Query
+
+CORPUS = Corpus.from_text(DOC_CABOCHA + DOC_MECAB)
+
+
+@pytest.fixture(params=[True, False])
+def index(tmp_path, request):
+    path = str(tmp_path / "corpus.idx")
+    InvertedIndex.build(CORPUS, path)
+    return InvertedIndex.open(path, mmap=request.param)
+
+
+def expected_postings(field, value):
+    postings = []
+    for sentence in range(len(CORPUS)):
+        for offset, token in enumerate(CORPUS.token_range(sentence)):
+            if getattr(CORPUS.morph(token), field) == value:
+                postings.append((sentence, offset))
+    return postings
+
+
+def test_varint_roundtrip():
+    out = bytearray()
+    values = [0, 1, 127, 128, 300, 2**40]
+    encode_varint(values, out)
+    assert decode_varint(out) == values
+
+    postings = [0, 3, 0, 5, 2, 1, 9, 0, 9, 4]
+    assert decode_postings(encode_postings(postings)) == [
+        (0, 3),
+        (0, 5),
+        (2, 1),
+        (9, 0),
+        (9, 4),
+    ]
+
+
+@pytest.mark.parametrize(
+    "field, value", [("base", "客"), ("pos", "名詞"), ("surface", "ぴょこぴょこ")]
+)
+def test_postings(index, field, value):
+    assert index.postings(field, value) == expected_postings(field, value)
+
+
+def test_boolean_and_phrase(index):
+    assert index.postings("base", "未知語") == []
+    assert index.sentences("surface", "鶏") == [1, 4]
+    assert index.all_of(("surface", "鶏"), ("pos", "助動詞")) == [1, 4]
+    assert index.all_of(("surface", "鶏"), ("surface", "柿")) == []
+    assert index.any_of(("surface", "鶏"), ("surface", "柿")) == [0, 1, 3, 4]
+    assert index.phrase([("surface", "柿"), ("pos", "動詞")]) == [(0, 5), (3, 5)]
+    assert index.phrase([("surface", "柿"), ("pos", "名詞")]) == []
+
+
+def test_query_prefilter(index):
+    query = Query(
+        ChunkPattern(MorphPattern(pos="名詞"), MorphPattern(surface="が")),
+        dst=ChunkPattern(MorphPattern(pos="動詞")),
+    )
+    assert index.candidates(query.terms) == [1, 4]
+    assert list(query.search_corpus(CORPUS, index=index)) == list(
+        query.search_corpus(CORPUS)
+    )
@@ -0,0 +1,46 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.io import iter_docs, iter_sects, iter_sentences
+from cucurbita.util import split_sentences
+
+
+@pytest.mark.parametrize(
+    "compress",
+    [lambda b: b, gzip.compress, bz2.compress, lzma.compress],
+)
+def test_iter_sentences_compressed_file(tmp_path, compress):
+    path = tmp_path / "cabocha.out"
+    path.write_bytes(compress(DOC_CABOCHA.encode("utf-8")))
+    assert list(iter_sentences(str(path))) == list(split_sentences(DOC_CABOCHA))
+
+
+def test_iter_sentences_fileobj():
+    text = io.StringIO(DOC_MECAB)
+    binary = io.BytesIO(gzip.compress(DOC_MECAB.encode("utf-8")))
+    expect = list(split_sentences(DOC_MECAB))
+    assert list(iter_sentences(text)) == expect
+    assert list(iter_sentences(binary)) == expect
+    assert not text.closed, "渡されたストリームは閉じない"
+
+
+def test_iter_sentences_without_eos():
+    assert list(iter_sentences(io.StringIO("a\tb,c\n"))) == ["a\tb,c\n"]
+    assert list(iter_sentences(io.StringIO("EOS\n\n"))) == ["EOS\n"]
+
+
+def test_iter_sects():
+    sects = list(iter_sects(io.StringIO(DOC_CABOCHA)))
+    assert len(sects) == 3
+    assert str(sects[0]) == "隣の客はよく柿食う客だ。"
+    assert [c.dst for c in sects[1].chunks] == [3, 3, 3, -1]
+
+
+def test_iter_docs():
+    docs = list(iter_docs(io.StringIO(DOC_MECAB)))
+    assert [str(doc) for doc in docs][1] == "庭には鶏が二羽いました。"
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.io import SentenceIndex
+from cucurbita.util import split_sentences
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "cabocha.out"
+    path.write_text(DOC_CABOCHA * 3, encoding="utf-8")
+    return str(path)
+
+
+def test_sentence_index_read(dump):
+    sentences = list(split_sentences(DOC_CABOCHA * 3))
+    with SentenceIndex(dump) as index:
+        assert len(index) == 9
+        assert index[4] == sentences[4]
+        assert index[-1] == sentences[-1]
+        assert str(index.sect(7)) == "庭には鶏が二羽いました。"
+        assert [str(s) for s in index.sects([2, 0])] == [
+            str(index.sect(2)),
+            str(index.sect(0)),
+        ]
+        with pytest.raises(IndexError):
+            index.read(9)
+    assert os.path.exists(dump + ".idx")
+
+
+def test_sentence_index_reuses_sidecar(dump):
+    SentenceIndex(dump).close()
+    with SentenceIndex(dump) as index:
+        assert isinstance(
+            index.offsets, memoryview
+        ), "保存済みの索引はメモリマップで開く"
+        assert len(index) == 9
+
+
+def test_sentence_index_rebuilds_stale_sidecar(dump):
+    SentenceIndex(dump).close()
+    with open(dump, "a", encoding="utf-8") as f:
+        f.write(DOC_MECAB)
+    with SentenceIndex(dump) as index:
+        assert len(index) == 12
+        assert (
+            str(index.doc(11))
+            == "かえるぴょこぴょこ三ぴょこぴょこ、あわせてぴょこぴょこ六ぴょこぴょこ。"
+        )
+
+
+def test_sentence_index_without_trailing_eos(tmp_path):
+    path = tmp_path / "mecab.out"
+    path.write_text(
+        "隣\t名詞,一般,*,*,*,*,隣,トナリ,トナリ\nEOS\n客\t名詞,一般,*,*,*,*,客,キャク,キャク\n"
+    )
+    with SentenceIndex(str(path)) as index:
+        assert len(index) == 2
+        assert str(index.doc(1)) == "客"
+
+
+@pytest.mark.parametrize("cut", [None, 3, 8])
+def test_sentence_index_rebuilds_broken_sidecar(dump, cut):
+    SentenceIndex(dump).close()
+    sidecar = dump + ".idx"
+    data = open(sidecar, "rb").read()
+    with open(sidecar, "wb") as f:
+        f.write(b"" if cut is None else data[:-cut])
+    with SentenceIndex(dump) as index:
+        assert len(index) == 9
+        assert str(index.sect(7)) == "庭には鶏が二羽いました。"
+    assert open(sidecar, "rb").read() == data
+
+
+def test_sentence_index_rebuilds_for_other_eos(tmp_path):
+    path = tmp_path / "mecab.out"
+    path.write_text(DOC_MECAB, encoding="utf-8")
+    with SentenceIndex(str(path)) as index:
+        assert len(index) == 3
+    with SentenceIndex(str(path), eos="END") as index:
+        assert len(index) == 1, "終了文字の異なる索引は使わない"
+    with SentenceIndex(str(path), eos="END") as index:
+        assert isinstance(index.offsets, memoryview)
+        assert len(index) == 1
@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.parallel import parse_corpus, split_ranges
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "cabocha.out"
+    path.write_text((DOC_CABOCHA + DOC_MECAB) * 5, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("n_ranges", [1, 2, 7, 100])
+def test_split_ranges(dump, n_ranges):
+    ranges = split_ranges(dump, n_ranges)
+    assert ranges[0][0] == 0
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    with open(dump, "rb") as f:
+        data = f.read()
+    assert ranges[-1][1] == len(data)
+    for _, end in ranges:
+        assert data[:end].endswith(b"EOS\n"), "範囲は文の終わりで区切られる"
+
+
+def test_corpus_pickle_is_compact():
+    corpus = Corpus.from_text(DOC_CABOCHA)
+    restored = pickle.loads(pickle.dumps(corpus))
+    assert restored.vocab.ids == corpus.vocab.ids
+    assert [str(s) for s in restored] == [str(s) for s in corpus]
+
+
+def test_corpus_merge():
+    corpus = Corpus.from_text(DOC_MECAB)
+    corpus.merge(Corpus.from_text(DOC_CABOCHA))
+    expect = Corpus.from_text(DOC_MECAB + DOC_CABOCHA)
+    assert [s.result for s in corpus] == [s.result for s in expect]
+    assert corpus.count_by("base") == expect.count_by("base")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_corpus(dump, workers):
+    corpus = parse_corpus(dump, workers=workers, ranges_per_worker=3)
+    expect = Corpus.from_file(dump)
+    assert len(corpus) == len(expect) == 30
+    assert [s.result for s in corpus] == [s.result for s in expect]
+    assert list(corpus.dst) == list(expect.dst)
@@ -0,0 +1,61 @@
+import pytest
+
+from cucurbita.cab import Sect
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA
+from cucurbita.query import ChunkPattern, Match, MorphPattern, Query, TermIndex
+from cucurbita.util import split_sentences
+
+SENTENCES = list(split_sentences(DOC_CABOCHA))
+
+GA_VERB = Query(
+    ChunkPattern(MorphPattern(pos="名詞"), MorphPattern(surface="が")),
+    dst=ChunkPattern(MorphPattern(pos="動詞")),
+)
+NOUN_ADVERB = Query(
+    ChunkPattern(MorphPattern(pos="名詞")), dst=ChunkPattern(MorphPattern(pos="副詞"))
+)
+NUMBER = Query(ChunkPattern(MorphPattern(pos1="数")))
+
+
+def hand_written(query):
+    matches = []
+    for sentence, result in enumerate(SENTENCES):
+        matches += query.match(Sect(result), sentence)
+    return matches
+
+
+@pytest.mark.parametrize("query", [GA_VERB, NOUN_ADVERB, NUMBER])
+def test_search_paths_agree(query):
+    corpus = Corpus.from_sentences(SENTENCES)
+    expect = hand_written(query)
+    assert list(query.search(SENTENCES)) == expect
+    assert list(query.search_corpus(corpus)) == expect
+    assert list(query.search_corpus(corpus, index=TermIndex(corpus))) == expect
+
+
+def test_search_results():
+    assert hand_written(GA_VERB) == [Match(1, 1, 3)]
+    assert hand_written(NUMBER) == [Match(1, 2, -1), Match(2, 2, -1), Match(2, 5, -1)]
+    assert hand_written(NOUN_ADVERB) == [Match(2, 2, 5)]
+
+
+def test_prefilter_skips_sentences():
+    assert [GA_VERB.may_match(s) for s in SENTENCES] == [False, True, False]
+
+    corpus = Corpus.from_sentences(SENTENCES)
+    index = TermIndex(corpus)
+    assert index.candidates(GA_VERB.terms) == [1]
+    assert index.candidates(NUMBER.terms) == [
+        0,
+        1,
+        2,
+    ], "索引のないフィールドは絞り込まない"
+
+    unknown = Query(ChunkPattern(MorphPattern(base="未知語")))
+    assert list(unknown.search_corpus(corpus)) == []
+
+
+def test_morph_pattern_undefined_field():
+    with pytest.raises(Exception):
+        MorphPattern(color="red")
@@ -0,0 +1,119 @@
+import pytest
+
+from cucurbita.cab import MORPH_FIELDS, Doc, Sect
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.diagnostics import INVALID_HEADER, INVALID_MORPH, ParseStats
+from cucurbita.scan import MorphView, Scanner
+from cucurbita.util import split_sentences
+
+LINE = "客\t名詞,一般,*,*,*,*,客,キャク,キャク"
+
+
+def chunk_values(chunks):
+    return [(c.pos, c.dst, c.score, [m.values for m in c.morphs]) for c in chunks]
+
+
+@pytest.mark.parametrize("doc, cls", [(DOC_CABOCHA, Sect), (DOC_MECAB, Doc)])
+def test_same_as_cab(doc, cls):
+    scanner = Scanner(doc.encode())
+    spans = list(scanner.sentences())
+    sentences = list(split_sentences(doc))
+    assert [scanner.text(start, end) for start, end in spans] == sentences
+    for (start, end), sentence in zip(spans, sentences):
+        assert chunk_values(scanner.chunks(start, end)) == chunk_values(
+            cls(sentence)._chunks
+        )
+        assert [m.pos for m in scanner.tokens(start, end)] == [
+            m.pos for m in cls(sentence).tokenize()
+        ]
+
+
+def test_headers():
+    scanner = Scanner(DOC_CABOCHA.encode())
+    sects = [Sect(s) for s in split_sentences(DOC_CABOCHA)]
+    chunks = [c for sect in sects for c in sect.chunks]
+    assert list(scanner.headers()) == [(c.pos, c.dst, c.score) for c in chunks]
+    assert scanner.count_chunks() == len(chunks)
+    assert list(scanner.dependency_lengths()) == [
+        c.dst - c.pos for c in chunks if c.dst >= 0
+    ]
+    assert scanner.count_chunks(*next(scanner.sentences())) == len(sects[0].chunks)
+
+
+def test_mmap_and_memoryview(tmp_path):
+    path = tmp_path / "cabocha.out"
+    path.write_bytes(DOC_CABOCHA.encode())
+    with Scanner.open(str(path)) as scanner:
+        expected = list(scanner.dependency_lengths())
+        assert scanner.count_sentences() == 3
+    data = DOC_CABOCHA.encode()
+    assert Scanner(memoryview(data)).buffer is data, "全体を指す場合はコピーしない"
+    assert list(Scanner(memoryview(data)).dependency_lengths()) == expected
+    # 一部分を指す memoryview はコピーして走査する
+    start, end = next(Scanner(data).sentences())
+    part = Scanner(memoryview(data)[start:end])
+    assert part.count_sentences() == 1
+
+
+def test_crlf_and_missing_eos():
+    data = DOC_CABOCHA.replace("\n", "\r\n").encode()
+    scanner = Scanner(data)
+    assert list(scanner.headers()) == list(Scanner(DOC_CABOCHA.encode()).headers())
+    start, end = next(scanner.sentences())
+    assert [m.surface for m in scanner.tokens(start, end)][:2] == ["隣", "の"]
+    assert all("\r" not in (m.pron or "") for m in scanner.tokens(start, end))
+
+    scanner = Scanner((LINE + "\n").encode())
+    assert list(scanner.sentences()) == [(0, len(scanner.buffer))]
+    assert [m.surface for m in scanner.tokens()] == ["客"]
+
+
+def test_morph_view():
+    data = LINE.encode()
+    morph = MorphView(data, 0, data.find(b"\t"), len(data))
+    assert [getattr(morph, field) for field in MORPH_FIELDS] == morph.values
+    assert morph.encoded(1) == "名詞".encode()
+    assert morph.to_morph().values == morph.values
+    assert morph.span(3) == (
+        len("客\t名詞,一般,".encode()),
+        len("客\t名詞,一般,*".encode()),
+    )
+
+    short = b"a\tb,c,d,e,f,g,h"
+    morph = MorphView(short, 0, 1, len(short))
+    assert (morph.conj, morph.base, morph.yomi) == ("g", "h", None)
+
+    invalid = (LINE + ",x,y").encode()
+    morph = MorphView(invalid, 0, invalid.find(b"\t"), len(invalid))
+    assert morph.values == [None] * len(MORPH_FIELDS), "Morph と同じく全て None"
+    assert [getattr(morph, field) for field in MORPH_FIELDS] == morph.values
+    assert morph.span(1) is None and morph.encoded(0) is None
+
+    tabs = "客\t名詞\t一般".encode()
+    morph = MorphView(tabs, 0, tabs.find(b"\t"), len(tabs))
+    assert morph.surface is None and morph.pos is None
+    assert morph.to_morph().values == [None] * len(MORPH_FIELDS)
+
+
+def test_stats():
+    noisy = (
+        "* 0 -1D 0/0 0.000000\n"
+        f"{LINE}\n"
+        f"{LINE},x,y\n"
+        "* x 1D 0/1 score\n"
+        "garbage\n"
+        "EOS\n"
+    )
+    stats, expected = ParseStats(), ParseStats()
+    chunks = list(Scanner(noisy.encode()).chunks(stats=stats))
+    Sect(noisy, stats=expected)
+    assert len(chunks) == 1 and len(chunks[0].morphs) == 2
+    assert stats.malformed[INVALID_HEADER] == 1
+    assert stats.samples[INVALID_HEADER] == ["* x 1D 0/1 score"]
+    # 単語の分割は参照されるまで行わないため invalid_morph は数えない
+    assert INVALID_MORPH not in stats.malformed
+    assert (stats.sentences, stats.chunks, stats.tokens) == (
+        expected.sentences,
+        expected.chunks,
+        expected.tokens,
+    )
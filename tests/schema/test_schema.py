@@ -0,0 +1,123 @@
+import pickle
+
+import pytest
+
+from cucurbita.cab import MORPH_FIELDS, Doc, Morph, MorphTable, Sect, freeze
+from cucurbita.dataset import DOC_CABOCHA
+from cucurbita.schema import IPADIC, SCHEMAS, UNIDIC, Schema, SchemaMorph
+from cucurbita.util import split_sentences
+
+IPADIC_LINE = "客\t名詞,一般,*,*,*,*,客,キャク,キャク"
+# unidic-cwj 3.1 の出力 (17列の後ろにも列が続く)
+UNIDIC_LINE = (
+    "客\t名詞,普通名詞,一般,*,*,*,キャク,客,客,キャク,客,キャク,漢,*,*,*,*,"
+    "*,*,体,キャク,キャク,キャク,キャク,0,C3,*,2460326689382912,8951"
+)
+UNIDIC_UNKNOWN = "ほげ\t名詞,普通名詞,一般,*,*,*"
+UNIDIC_RESULT = (
+    "* 0 1D 0/0 0.000000\n"
+    f"{UNIDIC_LINE}\n"
+    "は\t助詞,係助詞,*,*,*,*,ハ,は,は,ワ,は,ワ,和,*,*,*,*\n"
+    "* 1 -1D 0/0 0.000000\n"
+    f"{UNIDIC_UNKNOWN}\n"
+    "EOS\n"
+)
+
+
+def test_ipadic_same_as_morph():
+    for sentence in split_sentences(DOC_CABOCHA):
+        expected = Sect(sentence).tokenize()
+        morphs = Sect(sentence, schema=IPADIC).tokenize()
+        assert [m.values for m in morphs] == [m.values for m in expected]
+    assert IPADIC.fields == MORPH_FIELDS
+
+
+def test_extractor():
+    extract = UNIDIC.extractor(["lemma", "surface", "goshu"])
+    assert extract(UNIDIC_LINE) == ("客", "客", "漢")
+    assert extract(UNIDIC_UNKNOWN) == (None, "ほげ", None), "足りない列は None"
+    assert UNIDIC.extractor(["pos1"])(UNIDIC_LINE + "\n") == ("名詞",)
+    assert UNIDIC.extractor(["fForm"])(UNIDIC_LINE) == (
+        "*",
+    ), "最後の列の後ろは含めない"
+    assert IPADIC.extractor()(IPADIC_LINE) == tuple(Morph(IPADIC_LINE).values)
+    with pytest.raises(Exception):
+        UNIDIC.extractor(["undefined"])
+
+
+def test_morph_class():
+    cls = UNIDIC.select("pos1", "lemma").morph_class()
+    assert cls is UNIDIC.select("pos1", "lemma").morph_class(), "1度だけ作る"
+    assert issubclass(cls, SchemaMorph)
+    assert cls.fields == ("surface", "pos1", "lemma"), "表層系は常に含む"
+    morph = cls(UNIDIC_LINE)
+    assert morph.values == ["客", "名詞", "客"]
+    assert repr(morph) == "<UnidicMorph: 客>"
+    assert not hasattr(morph, "__dict__"), "スロットだけを持つ"
+    with pytest.raises(AttributeError):
+        morph.goshu
+
+    full = UNIDIC.parse(UNIDIC_LINE)
+    assert len(full.values) == 18
+    assert (full.lemma, full.goshu, full.fForm) == ("客", "漢", "*")
+
+
+def test_sect_with_unidic():
+    sect = Sect(UNIDIC_RESULT, schema=UNIDIC.select("pos1", "lemma"))
+    assert [[m.lemma for m in chunk.morphs] for chunk in sect.chunks] == [
+        ["客", "は"],
+        [None],
+    ], "6列しかない未知語も単語行とみなす"
+    assert sect.text == "客はほげ"
+    assert sect.graph is not None
+    lazy = Sect(UNIDIC_RESULT, schema=UNIDIC, lazy=True)
+    assert [m.goshu for m in lazy.tokenize()] == ["漢", "和", None]
+    doc = Doc(UNIDIC_RESULT, schema=UNIDIC)
+    assert [m.pos1 for m in doc.tokenize()] == ["名詞", "助詞", "名詞"]
+    with pytest.raises(Exception):
+        Sect(UNIDIC_RESULT, schema=UNIDIC, table=MorphTable())
+
+
+def test_custom_schema():
+    schema = Schema("my dic", ["pos", "reading"], min_fields=2)
+    morph = schema.parse("柿\t名詞,カキ")
+    assert (morph.surface, morph.pos, morph.reading) == ("柿", "名詞", "カキ")
+    assert type(morph).__name__ == "MyDicMorph"
+    assert Doc("柿\t名詞,カキ\nEOS\n", schema=schema).text == "柿"
+    with pytest.raises(Exception):
+        Schema("bad", ["class"])
+    with pytest.raises(Exception):
+        Schema("bad", ["surface"])
+
+
+def test_pickle():
+    morph = UNIDIC.select("lemma").parse(UNIDIC_LINE)
+    restored = pickle.loads(pickle.dumps([morph, morph]))
+    assert restored[0].values == morph.values
+    assert type(restored[0]) is type(restored[1])
+    assert pickle.loads(pickle.dumps(UNIDIC)) == UNIDIC
+    assert SCHEMAS["unidic"] is UNIDIC
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_freeze(lazy):
+    for schema in (UNIDIC.select("pos1", "lemma"), UNIDIC):
+        sect = Sect(UNIDIC_RESULT, schema=schema, lazy=lazy)
+        frozen = freeze(sect)
+        morphs = frozen.tokenize()
+        assert all(isinstance(m, schema.morph_class()) for m in morphs)
+        assert [m.pos1 for m in morphs] == ["名詞", "助詞", "名詞"]
+        assert [m.values for m in morphs] == [m.values for m in sect.tokenize()]
+        with pytest.raises(AttributeError):
+            morphs[0].lemma = "変更"
+        assert morphs[0].lemma == "客" and sect.tokenize()[0].lemma == "客"
+        assert freeze(frozen) is frozen
+        restored = pickle.loads(pickle.dumps(frozen))
+        assert [m.lemma for m in restored.tokenize()] == ["客", "は", None]
+        with pytest.raises(AttributeError):
+            restored.tokenize()[0].lemma = "変更"
+        assert isinstance(schema.parse(UNIDIC_LINE), schema.morph_class(frozen=False))
+        frozen_morph = schema.morph_class(frozen=True)(UNIDIC_LINE)
+        assert frozen_morph.values == schema.parse(UNIDIC_LINE).values
+    doc = freeze(Doc(UNIDIC_RESULT, schema=UNIDIC))
+    assert [m.goshu for m in doc.tokenize()] == ["漢", "和", None]
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from cucurbita.corpus import Corpus
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.query import ChunkPattern, MorphPattern, Query
+from cucurbita.segments import SegmentedCorpus
+from cucurbita.util import split_sentences
+
+BATCHES = [list(split_sentences(doc)) for doc in [DOC_CABOCHA, DOC_MECAB] * 4]
+ALL = [sentence for batch in BATCHES for sentence in batch]
+
+
+def counts_of(field):
+    counts = Corpus.from_sentences(ALL).count_by(field)
+    del counts[None]
+    return counts
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_append_and_merge(tmp_path, background):
+    directory = str(tmp_path / "corpus")
+    corpus = SegmentedCorpus(
+        directory, max_segments=3, merge_factor=2, background=background
+    )
+    for batch in BATCHES:
+        corpus.append(batch)
+    corpus.wait()
+
+    assert len(corpus.segments) <= 3
+    assert len(corpus) == len(ALL)
+    assert [corpus[i].result for i in range(len(ALL))] == [
+        s.result for s in Corpus.from_sentences(ALL)
+    ]
+    assert corpus.counts["base"] == counts_of("base")
+    names = {segment.name for segment in corpus.segments}
+    files = {f.split(".")[0] for f in os.listdir(directory) if f.startswith("seg-")}
+    assert files == names, "統合済みのセグメントは削除される"
+
+
+def test_reopen_keeps_state(tmp_path):
+    directory = str(tmp_path / "corpus")
+    corpus = SegmentedCorpus(directory, background=False)
+    corpus.append(BATCHES[0])
+    corpus.append(BATCHES[1])
+    assert corpus.append([]) is None
+
+    reopened = SegmentedCorpus(directory)
+    assert len(reopened) == 6
+    assert reopened.counts == corpus.counts
+    reopened.append(BATCHES[2])
+    added = Corpus.from_sentences(BATCHES[2]).count_by("pos")["名詞"]
+    assert reopened.counts["pos"]["名詞"] == corpus.counts["pos"]["名詞"] + added
+
+
+def test_search_across_segments(tmp_path):
+    corpus = SegmentedCorpus(str(tmp_path / "corpus"), background=False)
+    for batch in BATCHES[:4]:
+        corpus.append(batch)
+
+    whole = Corpus.from_sentences(ALL[:12])
+    query = Query(
+        ChunkPattern(MorphPattern(pos="名詞"), MorphPattern(surface="が")),
+        dst=ChunkPattern(MorphPattern(pos="動詞")),
+    )
+    assert list(corpus.search(query)) == list(query.search_corpus(whole))
+    assert [s for s, _ in corpus.postings("surface", "鶏")] == [1, 4, 7, 10]
+    assert corpus.all_of(("surface", "鶏"), ("surface", "が")) == [1, 4, 7, 10]
+    assert corpus.phrase([("surface", "柿"), ("pos", "動詞")]) == [
+        (0, 5),
+        (3, 5),
+        (6, 5),
+        (9, 5),
+    ]
+    with pytest.raises(IndexError):
+        corpus.sentence(12)
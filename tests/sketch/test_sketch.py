@@ -0,0 +1,140 @@
+import pickle
+from collections import Counter
+
+import pytest
+
+from cucurbita.cab import Sect
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB
+from cucurbita.sketch import CountMinSketch, Cooccurrence, StreamStats, TopK
+from cucurbita.util import split_sentences
+
+
+def head_base(chunk):
+    return chunk.morphs[0].base
+
+
+WORDS = [f"w{i}" for i in range(200) for _ in range(200 // (i + 1))]
+
+
+def test_count_min_sketch():
+    sketch = CountMinSketch(width=64, depth=4)
+    sketch.update(WORDS)
+    counts = Counter(WORDS)
+    assert all(sketch[key] >= count for key, count in counts.items()), "過小評価しない"
+    assert sketch.total == len(WORDS)
+    assert sketch.nbytes == 64 * 4 * 8
+
+    exact = CountMinSketch(width=4096)
+    exact.update(WORDS)
+    assert exact["w0"] == counts["w0"]
+    assert exact["unseen"] == 0
+    assert exact[("a", "b")] == 0, "組もキーにできる"
+
+    sized = CountMinSketch.from_error(epsilon=0.01, delta=0.01)
+    assert (sized.width, sized.depth) == (272, 5)
+
+
+def test_count_min_sketch_merge():
+    left, right, whole = (CountMinSketch(width=128) for _ in range(3))
+    left.update(WORDS[::2])
+    right.update(WORDS[1::2])
+    whole.update(WORDS)
+    left.merge(right)
+    assert left.table == whole.table and left.total == whole.total
+    with pytest.raises(Exception):
+        left.merge(CountMinSketch(width=128, seed=1))
+
+
+def test_top_k():
+    top = TopK(k=10, width=4096)
+    top.update(WORDS)
+    assert len(top) == 10
+    assert top.most_common() == Counter(WORDS).most_common(10)
+    assert top.most_common(1) == [("w0", 200)]
+    assert "w0" in top and "w199" not in top
+
+    ties = TopK(k=3)
+    ties.update(["c", "b", "a", "d", "d"])
+    assert ties.most_common() == [("d", 2), ("a", 1), ("b", 1)], "同数はキーの順"
+
+    shards = [TopK(k=10, width=4096) for _ in range(2)]
+    shards[0].update(WORDS[::2])
+    shards[1].update(WORDS[1::2])
+    shards[0].merge(shards[1])
+    assert shards[0].most_common() == top.most_common()
+
+
+def test_cooccurrence():
+    pairs = Cooccurrence(k=100)
+    for sentence in split_sentences(DOC_CABOCHA):
+        pairs.update(Sect(sentence))
+    sect = Sect(DOC_CABOCHA)
+    expected = Counter(
+        (str(c), str(sect.chunks[c.dst])) for c in sect.chunks if c.dst >= 0
+    )
+    assert pairs[("隣の", "客は")] == expected[("隣の", "客は")] == 1
+    assert pairs.total == 13
+    assert pairs.pmi("隣の", "客は") > 0
+    assert pairs.pmi("客は", "隣の") == float("-inf")
+
+    heads = Cooccurrence()
+    heads.update(sect, key=lambda chunk: chunk.morphs[0].base)
+    assert heads[("隣", "客")] == 1
+
+    # ヘッダーのない解析結果は係り受けを数えない
+    mecab = Cooccurrence()
+    mecab.update(Sect(next(iter(split_sentences(DOC_MECAB)))))
+    assert mecab.total == 0
+
+
+def test_stream_stats():
+    sentences = list(split_sentences(DOC_CABOCHA))
+    stats = StreamStats(k=5, width=1024)
+    stats.update(sentences)
+    expected = Counter(m.base for s in sentences for m in Sect(s).tokenize())
+    assert stats.sentences == 3
+    assert stats.words.most_common(2) == expected.most_common(2)
+    assert stats.pairs.total == 13
+    assert stats.nbytes == 4 * 1024 * 4 * 8
+
+    sects = StreamStats(k=5, width=1024)
+    sects.update(Sect(s) for s in sentences)
+    assert sects.words.most_common() == stats.words.most_common()
+
+
+def test_stream_stats_shards():
+    sentences = list(split_sentences(DOC_CABOCHA)) * 4
+    whole = StreamStats(k=5, width=1024)
+    whole.update(sentences)
+    shards = [StreamStats(k=5, width=1024) for _ in range(2)]
+    shards[0].update(sentences[::2])
+    shards[1].update(sentences[1::2])
+    # 別のプロセスから受け取る場合と同じく pickle を通す
+    merged = pickle.loads(pickle.dumps(shards[0]))
+    merged.merge(pickle.loads(pickle.dumps(shards[1])))
+    assert merged.sentences == whole.sentences
+    assert merged.words.most_common(4) == whole.words.most_common(4)
+    assert [c for _, c in merged.words.most_common()] == [
+        c for _, c in whole.words.most_common()
+    ]
+    # 逆の順にまとめても同じ (同数のキーはキーの順で選ぶ)
+    reverse = pickle.loads(pickle.dumps(shards[1]))
+    reverse.merge(shards[0])
+    assert reverse.words.most_common() == merged.words.most_common()
+    assert reverse.pairs.most_common() == merged.pairs.most_common()
+    pairs = whole.pairs.most_common()
+    assert all(merged.pairs[pair] == count for pair, count in pairs)
+    with pytest.raises(Exception):
+        merged.merge(StreamStats(field="surface", k=5, width=1024))
+
+
+def test_stream_stats_key():
+    stats = StreamStats(k=5, width=1024, key=head_base)
+    stats.update(split_sentences(DOC_CABOCHA))
+    restored = pickle.loads(pickle.dumps(stats))
+    assert restored.key is head_base, "key はそのまま受け渡す"
+    assert restored.pairs[("隣", "客")] == 1
+    with pytest.raises(Exception):
+        restored.merge(StreamStats(k=5, width=1024))
+    with pytest.raises(Exception):
+        pickle.dumps(StreamStats(key=lambda chunk: str(chunk)))
@@ -0,0 +1,85 @@
+import os
+import threading
+
+import pytest
+
+from cucurbita.cab import Doc, Sect
+from cucurbita.dataset import DOC_CABOCHA, DOC_MECAB, DOC_PLAIN
+from cucurbita.tagger import TaggerPool
+from cucurbita.util import split_sentences
+
+TEXTS = DOC_PLAIN.splitlines()
+
+
+class StubTagger(object):
+    """dataset の解析結果を返す MeCab.Tagger の代わり"""
+
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self, doc=DOC_MECAB):
+        with StubTagger.lock:
+            StubTagger.created += 1
+        self.results = dict(zip(TEXTS, split_sentences(doc)))
+
+    def parse(self, text):
+        return self.results.get(text, "EOS\n")
+
+
+class StubParser(StubTagger):
+    """CaboCha.Parser のように parseToString で文字列を返す"""
+
+    def __init__(self):
+        super().__init__(DOC_CABOCHA)
+
+    def parse(self, text):
+        raise NotImplementedError
+
+    def parseToString(self, text):
+        return super().parse(text)
+
+
+class PidTagger(object):
+    """解析したプロセスと解析器を返す"""
+
+    def parse(self, text):
+        return f"{os.getpid()}:{id(self)}"
+
+
+@pytest.fixture(autouse=True)
+def reset_count():
+    StubTagger.created = 0
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_parse_in_order(workers):
+    with TaggerPool(StubTagger, workers=workers, batch_size=2) as pool:
+        docs = pool.parse(TEXTS * 20)
+    assert len(docs) == 60
+    assert all(isinstance(doc, Doc) for doc in docs)
+    assert [str(doc) for doc in docs] == TEXTS * 20
+    assert StubTagger.created <= workers, "解析器はワーカー毎に1度だけ作る"
+
+
+def test_imap_with_method():
+    with TaggerPool(
+        StubParser, workers=2, batch_size=1, method="parseToString"
+    ) as pool:
+        sects = list(pool.imap(iter(TEXTS * 3)))
+        assert list(pool.imap([])) == []
+    assert all(isinstance(sect, Sect) for sect in sects)
+    assert [sect.result for sect in sects] == list(split_sentences(DOC_CABOCHA)) * 3
+
+
+def test_parse_in_processes():
+    with TaggerPool(StubTagger, workers=2, processes=True, batch_size=4) as pool:
+        results = list(pool.imap_raw(TEXTS * 10))
+    assert results == list(split_sentences(DOC_MECAB)) * 10
+    assert StubTagger.created == 0, "解析器はワーカーのプロセスで作る"
+
+
+def test_one_tagger_per_process():
+    with TaggerPool(PidTagger, workers=2, processes=True, batch_size=1) as pool:
+        results = set(pool.imap_raw(TEXTS * 20))
+    pids = {result.split(":")[0] for result in results}
+    assert len(results) == len(pids), "解析器はプロセス毎に1度だけ作る"
@@ -1,4 +1,14 @@
-from cucurbita.util import split_chunks
+import re
+
+import pytest
+
+from cucurbita.util import (
+    PATTERN_HEADER,
+    PATTERN_MORPH,
+    is_header,
+    is_morph,
+    split_chunks,
+)
 
 
 def test_sc_cabocha_default():
@@ -37,3 +47,28 @@ def test_sc_blank():
     sentence = ""
     chunks = [e for e in split_chunks(sentence)]
     assert chunks == [("", [])], "Invalid output data"
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "* 0 1D 0/1 2.206035",
+        "* 5 -1D 0/1 0.000000",
+        "隣\t名詞,一般,*,*,*,*,隣,トナリ,トナリ",
+        "*\t記号,一般,*,*,*,*,*,*,*",
+        "surface\tpos,pos1,pos2,pos3,conj_form,conj,base",
+        "surface\tpos,pos1,pos2",
+        "EOS",
+        "",
+    ],
+)
+def test_sc_classifier(line):
+    assert is_header(line) == bool(PATTERN_HEADER.match(line))
+    assert is_morph(line) == bool(PATTERN_MORPH.match(line))
+
+
+def test_sc_custom_pattern():
+    sentence = "* 0 -1D 0/1 0.000000\n隣\t名詞,一般\nEOS\n"
+    assert list(split_chunks(sentence)) == [("* 0 -1D 0/1 0.000000", [])]
+    chunks = split_chunks(sentence, pattern_morph=re.compile(r"^[^\t]+\t"))
+    assert list(chunks) == [("* 0 -1D 0/1 0.000000", ["隣\t名詞,一般"])]